@@ -0,0 +1,8 @@
+# @title:    __init__.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+from .gridworld import Gridworld
+from .helper import Info, Obstacle, Teleporter
+from .tile import Tile
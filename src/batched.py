@@ -0,0 +1,404 @@
+# @title:    batched.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import numpy as np
+from numpy import uint8
+from .gridworld import Gridworld
+from .codec import DIRECTION_SHIFT, VISION_BIT
+from .framestack import FrameStack
+from .kernel import get_step_kernel
+from .registry import get_config, get_reward_table
+from .solver import DIRECTION_X, DIRECTION_Y, TURN_LEFT, TURN_RIGHT, level_arrays
+
+# Code
+
+#   Info fields returned as arrays by the batched gridworlds, with their dtypes
+INFO_FIELDS = {
+    "num_steps": np.int64,
+    "reward_penalty": np.float64,
+    "reward": np.float64,
+    "success": np.bool_,
+    "helper_found": np.bool_,
+    "obstacles_hit": np.int64,
+    "lava_hit": np.bool_,
+    "wall_hit": np.int64,
+    "teleport": np.bool_,
+}
+
+#   code of padded observation cells, real observation cells always carry the vision bit
+PAD_CODE = 0
+
+
+class GridworldGroup:
+    """
+    Vectorized engine stepping gridworlds of one config as arrays
+    Levels are still generated by one Gridworld object per environment, so every environment produces the
+    same levels, rewards and observations as a Gridworld with the same seed.
+    """
+
+    def __init__(self, envs: list, backend: str = "auto"):
+        """
+        Initializes a group
+        @params:
+            envs => list of Gridworld objects with the same config, used as level generators
+            backend => step engine, see kernel.BACKENDS
+        """
+        config = envs[0].get_config()
+        assert all(
+            env.get_config() == config for env in envs
+        ), "Error: all gridworlds of a group need the same config"
+        self.envs = envs
+        self.config = config
+        self.size = len(envs)
+        self.world_size = envs[0].world_size
+        self.observation_size = envs[0].observation_size
+        self.max_steps = envs[0].max_steps
+        tables = envs[0].tables
+        self.offset_x, self.offset_y = tables.offset_x, tables.offset_y
+        self.kernel = get_step_kernel(backend)
+        self.reward_table = get_reward_table(self.max_steps)
+        n = self.size
+        self.rows = np.arange(n)
+        self.grid = np.zeros(shape=(n, self.world_size, self.world_size), dtype=uint8)
+        self.teleporters = np.zeros(shape=(n, 4), dtype=np.int64)
+        self.player_x = np.zeros(n, dtype=np.int64)
+        self.player_y = np.zeros(n, dtype=np.int64)
+        self.player_direction = np.zeros(n, dtype=np.int64)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=np.bool_)
+        self.rewards = np.zeros(n)
+        self.info = {
+            name: np.zeros(n, dtype=dtype) for name, dtype in INFO_FIELDS.items()
+        }
+        self.load(self.rows)
+
+    def load(self, indices):
+        """
+        Copies the current levels of the generators into the arrays and resets the episode state
+        @params:
+            indices => indices of the environments to load
+        """
+        grids, teleporters, _, _, players = level_arrays(
+            [self.envs[i] for i in indices]
+        )
+        self.grid[indices] = grids
+        self.teleporters[indices] = teleporters
+        self.player_x[indices] = players[:, 0]
+        self.player_y[indices] = players[:, 1]
+        self.player_direction[indices] = players[:, 2]
+        self.steps[indices] = 0
+        self.done[indices] = False
+        for column in self.info.values():
+            column[indices] = 0
+
+    def reset(self, indices=None):
+        """
+        Creates new levels
+        @params:
+            indices => indices of the environments to reset, all if None
+        Returns the observation codes of all environments
+        """
+        indices = self.rows if indices is None else np.asarray(indices, dtype=np.int64)
+        for i in indices:
+            self.envs[i].generate_level()
+        if len(indices):
+            self.load(indices)
+        return self.get_observations()
+
+    def step(self, actions):
+        """
+        Performs one step in every environment
+        @params:
+            actions => (n,) actions, 0 = forward, 1 = turn left, 2 = turn right
+        Returns:
+            observations => (n, observation_size ** 2) observation codes
+            rewards => (n,) rewards
+            dones => (n,) True if the state is terminal
+            info => dict of (n,) Info field arrays
+        """
+        actions = np.asarray(actions)
+        assert actions.shape == (self.size,), "Error: one action per environment"
+        info = self.info
+        if self.kernel is not None:
+            self.kernel(
+                actions,
+                self.grid,
+                self.player_x,
+                self.player_y,
+                self.player_direction,
+                self.teleporters,
+                self.steps,
+                self.done,
+                self.rewards,
+                self.reward_table,
+                self.max_steps,
+                *info.values(),
+            )
+            return self.get_observations(), self.rewards.copy(), self.done.copy(), info
+        self.steps += 1
+        info["num_steps"] += 1
+        rewards = np.zeros(self.size)
+
+        over = self.steps > self.max_steps
+        if over.any():
+            self.done[over] = True
+            info["success"][over] = False
+            info["reward"][over] = 0
+        active = ~over
+
+        forward = np.flatnonzero(active & (actions == 0))
+        if len(forward):
+            self.move(forward)
+        turning = np.flatnonzero(active & (actions != 0))
+        if len(turning):
+            x, y = self.player_x[turning], self.player_y[turning]
+            direction = self.player_direction[turning]
+            direction = np.where(
+                actions[turning] == 1, TURN_LEFT[direction], TURN_RIGHT[direction]
+            )
+            self.grid[turning, x, y] = direction + 1
+            self.player_direction[turning] = direction
+
+        active = np.flatnonzero(active)
+        reward = self.reward_table[self.steps[active]] - info["reward_penalty"][active]
+        negative = reward < 0
+        self.done[active[negative]] = True
+        reward[negative] = 0
+        finished = self.done[active]
+        rewards[active[finished]] = reward[finished]
+        info["reward"][active[finished]] += reward[finished]
+        return self.get_observations(), rewards, self.done.copy(), info
+
+    def move(self, indices):
+        """
+        Performs the forward action of several environments
+        @params:
+            indices => indices of the moving environments
+        """
+        info = self.info
+        penalty = info["reward_penalty"]
+        x, y = self.player_x[indices], self.player_y[indices]
+        direction = self.player_direction[indices]
+        target_x, target_y = x + DIRECTION_X[direction], y + DIRECTION_Y[direction]
+        target = self.grid[indices, target_x, target_y]
+
+        #   5 = wall
+        wall = indices[target == 5]
+        info["wall_hit"][wall] += 1
+        penalty[wall] += 0.05
+
+        #   7 = lava
+        lava = indices[target == 7]
+        info["lava_hit"][lava] = True
+        info["success"][lava] = False
+        penalty[lava] += 10
+        self.done[lava] = True
+
+        #   8, 9, 10, 11 = obstacle
+        obstacle = (target >= 8) & (target <= 11)
+        info["obstacles_hit"][indices[obstacle]] += 1
+        penalty[indices[obstacle]] += 0.2
+
+        #   12 = destination
+        goal = indices[target == 12]
+        self.done[goal] = True
+        info["success"][goal] = True
+
+        #   13 = helper
+        helper = indices[target == 13]
+        info["helper_found"][helper] = True
+        penalty[helper] -= 0.1
+
+        #   6 = teleport, the player leaves the other teleporter tile and both tiles are removed
+        teleport = target == 6
+        info["teleport"][indices[teleport]] = True
+        tp = self.teleporters[indices]
+        first = (target_x == tp[:, 0]) & (target_y == tp[:, 1])
+        next_x = np.where(teleport, np.where(first, tp[:, 2], tp[:, 0]), target_x)
+        next_y = np.where(teleport, np.where(first, tp[:, 3], tp[:, 1]), target_y)
+
+        moving = (target == 0) | obstacle | teleport | (target == 12) | (target == 13)
+        rows = indices[moving]
+        self.grid[rows, x[moving], y[moving]] = 0
+        self.grid[rows, next_x[moving], next_y[moving]] = direction[moving] + 1
+        self.grid[indices[teleport], target_x[teleport], target_y[teleport]] = 0
+        self.player_x[rows] = next_x[moving]
+        self.player_y[rows] = next_y[moving]
+
+    def get_observations(self):
+        """
+        Encodes the current observations, identical to codec.encode_observation of every Gridworld
+        Returns a (n, observation_size ** 2) uint8 array of tile codes
+        """
+        direction = self.player_direction
+        x = self.player_x[:, None] + self.offset_x[direction]
+        y = self.player_y[:, None] + self.offset_y[direction]
+        codes = self.grid[self.rows[:, None], x, y]
+        flags = ((direction << DIRECTION_SHIFT) | (1 << VISION_BIT)).astype(uint8)
+        codes |= flags[:, None]
+        return codes
+
+
+class BatchedGridworld:
+    """
+    Container of gridworlds with different configs
+    Environments are grouped by config and every group is stepped by one vectorized GridworldGroup.
+    Observations are returned as tile codes, padded to the largest observation size so that the player
+    cell of every observation is at the same position.
+    """
+
+    def __init__(self, envs: list, frame_stack: int = 1, backend: str = "auto"):
+        """
+        Initializes a batched gridworld
+        @params:
+            envs => list of Gridworld objects in any mix of configs, used as level generators
+            frame_stack => number of stacked observations returned by step and reset, 1 for single observations
+            backend => step engine of the groups, see kernel.BACKENDS
+        """
+        self.num_envs = len(envs)
+        self.configs = []
+        members = []
+        self.config_ids = np.zeros(self.num_envs, dtype=np.int64)
+        for env_id, env in enumerate(envs):
+            config = env.get_config()
+            if config not in self.configs:
+                self.configs.append(config)
+                members.append([])
+            self.config_ids[env_id] = self.configs.index(config)
+            members[self.config_ids[env_id]].append(env_id)
+        self.env_ids = [np.array(ids, dtype=np.int64) for ids in members]
+        self.groups = [
+            GridworldGroup([envs[i] for i in ids], backend) for ids in members
+        ]
+        self.observation_size = max(group.observation_size for group in self.groups)
+        size = self.observation_size
+        self.observations = np.full((self.num_envs, size, size), PAD_CODE, dtype=uint8)
+        self.rewards = np.zeros(self.num_envs)
+        self.dones = np.zeros(self.num_envs, dtype=np.bool_)
+        self.info = {
+            name: np.zeros(self.num_envs, dtype=dtype)
+            for name, dtype in INFO_FIELDS.items()
+        }
+        for group, env_ids in zip(self.groups, self.env_ids):
+            self.write(group, env_ids, group.get_observations())
+        self.frame_stack = frame_stack
+        self.frames = None
+        if frame_stack > 1:
+            self.frames = FrameStack(frame_stack, (size, size), (self.num_envs,))
+            self.frames.reset(self.observations)
+
+    @staticmethod
+    def make(
+        environments,
+        seed=None,
+        level_filter=None,
+        frame_stack: int = 1,
+        backend: str = "auto",
+    ):
+        """
+        Makes a batched gridworld
+        @params:
+            environments => list of environment ids, EnvConfig objects or Gridworld constructor argument dicts
+            seed => random seed, environment i uses seed + i, None default
+            level_filter => optional LevelFilter applied to every environment, None default
+            frame_stack => number of stacked observations, 1 default
+            backend => step engine, see kernel.BACKENDS, "auto" default
+        Returns a BatchedGridworld object
+        """
+        envs = []
+        for i, environment in enumerate(environments):
+            env_seed = None if seed is None else seed + i
+            env = Gridworld.make(
+                get_config(environment), seed=env_seed, level_filter=level_filter
+            )
+            envs.append(env)
+        return BatchedGridworld(envs, frame_stack, backend)
+
+    def write(self, group, env_ids, codes):
+        """
+        Writes the observation codes of a group into the padded observation array
+        """
+        size = group.observation_size
+        start = (self.observation_size - size) // 2
+        self.observations[
+            env_ids, self.observation_size - size :, start : start + size
+        ] = codes.reshape(-1, size, size)
+
+    def step(self, actions):
+        """
+        Performs one step in every environment
+        @params:
+            actions => (num_envs,) actions
+        Returns:
+            observations => (num_envs, size, size) padded observation codes, size is the largest observation size,
+                            a read-only (num_envs, frame_stack, size, size) view with frame stacking
+            rewards => (num_envs,) rewards
+            dones => (num_envs,) True if the state is terminal
+            info => dict of (num_envs,) Info field arrays
+        """
+        actions = np.asarray(actions)
+        for group, env_ids in zip(self.groups, self.env_ids):
+            codes, rewards, dones, info = group.step(actions[env_ids])
+            self.write(group, env_ids, codes)
+            self.rewards[env_ids] = rewards
+            self.dones[env_ids] = dones
+            for name, column in info.items():
+                self.info[name][env_ids] = column
+        if self.frames is not None:
+            observations = self.frames.push(self.observations)
+        else:
+            observations = self.observations.copy()
+        return (
+            observations,
+            self.rewards.copy(),
+            self.dones.copy(),
+            {name: column.copy() for name, column in self.info.items()},
+        )
+
+    def reset(self, env_ids=None):
+        """
+        Creates new levels
+        @params:
+            env_ids => ids of the environments to reset, all if None
+        Returns the padded observation codes of all environments, stacked with frame stacking
+        """
+        reset = np.ones(self.num_envs, dtype=np.bool_)
+        if env_ids is not None:
+            reset[:] = False
+            reset[env_ids] = True
+        for group, group_env_ids in zip(self.groups, self.env_ids):
+            indices = np.flatnonzero(reset[group_env_ids])
+            if len(indices):
+                codes = group.reset(indices)
+                self.write(group, group_env_ids, codes)
+                self.dones[group_env_ids[indices]] = False
+                for name, column in group.info.items():
+                    self.info[name][group_env_ids] = column
+        if self.frames is not None:
+            if env_ids is None:
+                return self.frames.reset(self.observations)
+            env_ids = np.flatnonzero(reset)
+            return self.frames.reset(self.observations[env_ids], env_ids)
+        return self.observations.copy()
+
+    def get_frames(self, copy: bool = False):
+        """
+        Returns the stacked observations of all environments, None without frame stacking
+        @params:
+            copy => if True a contiguous copy, else a read-only view
+        """
+        if self.frames is None:
+            return None
+        return self.frames.get(copy)
+
+    def get_group_observations(self):
+        """
+        Returns a list of (env_ids, codes) tuples with the unpadded (n, observation_size ** 2)
+        observation codes of every group
+        """
+        return [
+            (env_ids, group.get_observations())
+            for group, env_ids in zip(self.groups, self.env_ids)
+        ]
@@ -0,0 +1,447 @@
+# @title:    benchmark.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from random import Random
+from time import perf_counter
+import numpy as np
+from .gridworld import Gridworld
+from .batched import BatchedGridworld
+from .kernel import NUMBA_AVAILABLE
+from .layout import generate_level
+from .mosaic import mosaic_shape, render_mosaic
+from .registry import get_tables
+
+# Code
+
+ENVIRONMENT_IDS = ("empty-10x10", "empty-10x10-random", "hardcore-10x10-random")
+
+#   default configuration of the scaling benchmarks, one parameter is varied at a time
+SCALING_BASE = {
+    "grid_size": 10,
+    "observation_size": 5,
+    "random": True,
+    "obstacles": True,
+    "max_steps": 200,
+    "num_obstacles": 3,
+}
+SCALING = {
+    "grid_size": (10, 20, 40),
+    "observation_size": (3, 5, 7, 9),
+    "num_obstacles": (0, 3, 10, 30),
+}
+
+#   layouts and map sizes of the level generation benchmarks
+LAYOUT_BENCHMARKS = ("maze", "rooms")
+LAYOUT_SIZES = (64, 256, 1024)
+
+#   environments of the combined view and minimap benchmarks
+MINIMAP_BENCHMARKS = ("hardcore-10x10-random", "hardcore-64x64-random-maze")
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+
+#   measures the package import and the first step in a fresh interpreter
+STARTUP_SCRIPT = """
+from time import perf_counter
+start = perf_counter()
+from src.gridworld import Gridworld
+imported = perf_counter()
+env = Gridworld.make("hardcore-10x10-random", seed=0)
+env.step(0)
+print(imported - start, perf_counter() - imported)
+"""
+
+
+def best_of(repeats: int, function):
+    """
+    Runs a benchmark function several times
+    @params:
+        repeats => number of runs
+        function => function returning a measured time in seconds
+    Returns the shortest measured time
+    """
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        gc.disable()
+        try:
+            times.append(function())
+        finally:
+            gc.enable()
+    return min(times)
+
+
+def bench_steps(make, steps: int, repeats: int):
+    """
+    Measures the step throughput with random actions, resets are not timed
+    @params:
+        make => function creating the gridworld
+        steps => number of steps per run
+        repeats => number of runs
+    Returns steps per second
+    """
+
+    def run():
+        env = make()
+        rng = Random(0)
+        elapsed = 0.0
+        for _ in range(steps):
+            action = rng.randint(0, 2)
+            start = perf_counter()
+            _, _, done, _ = env.step(action)
+            elapsed += perf_counter() - start
+            if done:
+                env.reset()
+        return elapsed
+
+    return steps / best_of(repeats, run)
+
+
+def bench_resets(make, resets: int, repeats: int):
+    """
+    Measures the reset throughput
+    Returns resets per second
+    """
+
+    def run():
+        env = make()
+        start = perf_counter()
+        for _ in range(resets):
+            env.reset()
+        return perf_counter() - start
+
+    return resets / best_of(repeats, run)
+
+
+def bench_observation(make, n: int, repeats: int):
+    """
+    Measures building an observation without the observation cache, as after every moving step
+    Returns seconds per observation
+    """
+
+    def run():
+        env = make()
+        start = perf_counter()
+        for _ in range(n):
+            env.build_observation()
+        return perf_counter() - start
+
+    return best_of(repeats, run) / n
+
+
+def bench_combined(make, n: int, repeats: int):
+    """
+    Measures building the view and the minimap of a gridworld with a minimap in one pass
+    Returns seconds per combined observation
+    """
+
+    def run():
+        env = make()
+        start = perf_counter()
+        for _ in range(n):
+            env.observe()
+        return perf_counter() - start
+
+    return best_of(repeats, run) / n
+
+
+def bench_render(make, n: int, repeats: int):
+    """
+    Measures rendering the full map after the vision was updated
+    Returns seconds per render
+    """
+
+    def run():
+        env = make()
+        elapsed = 0.0
+        for _ in range(n):
+            env.set_vision()
+            env.set_vision()
+            start = perf_counter()
+            env.render()
+            elapsed += perf_counter() - start
+        return elapsed
+
+    return best_of(repeats, run) / n
+
+
+def bench_batched(environment_ids, steps: int, repeats: int, backend: str = "numpy"):
+    """
+    Measures stepping a mixed batch of gridworlds with random actions, resetting finished environments
+    Returns environment steps per second
+    """
+
+    def run():
+        batch = BatchedGridworld.make(environment_ids, seed=0, backend=backend)
+        batch.step(np.zeros(batch.num_envs))
+        actions = np.random.default_rng(0).integers(0, 3, size=(steps, batch.num_envs))
+        start = perf_counter()
+        for step_actions in actions:
+            _, _, dones, _ = batch.step(step_actions)
+            if dones.any():
+                batch.reset(np.flatnonzero(dones))
+        return perf_counter() - start
+
+    return steps * len(environment_ids) / best_of(repeats, run)
+
+
+def bench_layout(layout: str, grid_size: int, levels: int, repeats: int):
+    """
+    Measures the array level generation of a layout with lava and obstacles, without creating a Gridworld
+    Returns levels per second
+    """
+    tables = get_tables(grid_size, 5)
+    num_obstacles = grid_size * grid_size // 100
+
+    def run():
+        rng = np.random.default_rng(0)
+        start = perf_counter()
+        for _ in range(levels):
+            generate_level(rng, tables, layout, True, num_obstacles)
+        return perf_counter() - start
+
+    return levels / best_of(repeats, run)
+
+
+def bench_mosaic(num_envs: int, view: bool, repeats: int, tile_size: int = 4):
+    """
+    Measures rendering the maps or views of a batch of hardcore gridworlds into a preallocated mosaic
+    Returns seconds per mosaic
+    """
+    batch = BatchedGridworld.make(["hardcore-10x10-random"] * num_envs, seed=0)
+    batch.step(np.zeros(num_envs))
+    size = batch.observation_size if view else batch.groups[0].world_size
+    out = np.empty(mosaic_shape(num_envs, size, tile_size=tile_size), dtype=np.uint8)
+
+    def run():
+        start = perf_counter()
+        render_mosaic(batch, view, tile_size=tile_size, out=out)
+        return perf_counter() - start
+
+    return best_of(repeats * 5, run)
+
+
+def bench_memory(make, n: int):
+    """
+    Measures the memory allocated by gridworlds after a step
+    Returns bytes per gridworld
+    """
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    envs = [make() for _ in range(n)]
+    for env in envs:
+        env.step(0)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (end - start) / n
+
+
+def bench_startup(repeats: int):
+    """
+    Measures the startup of a worker process in fresh interpreters
+    @params:
+        repeats => number of started interpreters
+    Returns the shortest import time and the shortest time from the import to the end of the first step
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    imports, first_steps = [], []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        import_time, first_step = map(float, output.split())
+        imports.append(import_time)
+        first_steps.append(first_step)
+    return min(imports), min(first_steps)
+
+
+def result(value, unit: str, higher_is_better: bool):
+    """
+    Returns a benchmark result entry
+    """
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def run_benchmarks(quick: bool = False):
+    """
+    Runs all benchmarks
+    @params:
+        quick => True for fewer iterations
+    Returns a dict mapping benchmark names to result entries
+    """
+    steps, resets, renders, repeats = (200, 20, 20, 1) if quick else (2000, 200, 200, 3)
+    results = {}
+    import_time, first_step = bench_startup(3 if quick else 10)
+    results["startup/import_time"] = result(import_time, "s", False)
+    results["startup/first_step_latency"] = result(first_step, "s", False)
+    for environment_id in ENVIRONMENT_IDS:
+
+        def make():
+            return Gridworld.make(environment_id, seed=0)
+
+        prefix = f"make/{environment_id}/"
+        results[prefix + "steps_per_second"] = result(
+            bench_steps(make, steps, repeats), "1/s", True
+        )
+        results[prefix + "resets_per_second"] = result(
+            bench_resets(make, resets, repeats), "1/s", True
+        )
+        results[prefix + "observation_latency"] = result(
+            bench_observation(make, renders, repeats), "s", False
+        )
+        results[prefix + "render_latency"] = result(
+            bench_render(make, renders, repeats), "s", False
+        )
+        results[prefix + "memory_per_env"] = result(
+            bench_memory(make, 10 if quick else 100), "B", False
+        )
+
+    def make_lazy():
+        return Gridworld.make("hardcore-10x10-random", seed=0, lazy_observations=True)
+
+    results["lazy/hardcore-10x10-random/steps_per_second"] = result(
+        bench_steps(make_lazy, steps, repeats), "1/s", True
+    )
+
+    for environment_id in MINIMAP_BENCHMARKS:
+
+        def make_minimap():
+            return Gridworld.make(
+                environment_id, seed=0, minimap="pixels", fog_of_war="seen"
+            )
+
+        results[f"minimap/{environment_id}/observation_latency"] = result(
+            bench_combined(make_minimap, renders, repeats), "s", False
+        )
+
+    results["batched/mixed-192/steps_per_second"] = result(
+        bench_batched(ENVIRONMENT_IDS * 64, steps // 10, repeats), "1/s", True
+    )
+    if NUMBA_AVAILABLE:
+        results["batched/mixed-192-numba/steps_per_second"] = result(
+            bench_batched(ENVIRONMENT_IDS * 64, steps // 10, repeats, "numba"),
+            "1/s",
+            True,
+        )
+
+    for view, name in ((False, "maps"), (True, "views")):
+        results[f"mosaic/{name}-1024/render_latency"] = result(
+            bench_mosaic(1024, view, repeats), "s", False
+        )
+
+    for layout in LAYOUT_BENCHMARKS:
+        for grid_size in LAYOUT_SIZES:
+            levels = max(1, (4 if quick else 40) * 64 // grid_size)
+            results[f"layout/{layout}-{grid_size}/levels_per_second"] = result(
+                bench_layout(layout, grid_size, levels, repeats), "1/s", True
+            )
+
+    for parameter, values in SCALING.items():
+        for value in values:
+
+            def make():
+                return Gridworld(**dict(SCALING_BASE, **{parameter: value}), seed=0)
+
+            prefix = f"scaling/{parameter}={value}/"
+            results[prefix + "steps_per_second"] = result(
+                bench_steps(make, steps, repeats), "1/s", True
+            )
+            results[prefix + "resets_per_second"] = result(
+                bench_resets(make, resets, repeats), "1/s", True
+            )
+    return results
+
+
+def compare(results, baseline, tolerance: float):
+    """
+    Compares benchmark results against a baseline
+    @params:
+        results => dict of result entries
+        baseline => dict of baseline result entries
+        tolerance => allowed relative slowdown, 0.2 allows 20%
+    Returns a list of regression descriptions
+    """
+    regressions = []
+    for name, reference in baseline.items():
+        if name not in results:
+            continue
+        value, expected = results[name]["value"], reference["value"]
+        if reference["higher_is_better"]:
+            regressed = value < expected * (1 - tolerance)
+        else:
+            regressed = value > expected * (1 + tolerance)
+        if regressed:
+            regressions.append(
+                f"{name}: {value:.6g} {reference['unit']} (baseline {expected:.6g})"
+            )
+    return regressions
+
+
+def main(argv=None):
+    """
+    Runs the benchmarks, writes the results as json and checks them against the baseline
+    Returns 1 if a benchmark regressed, 0 else
+    """
+    parser = argparse.ArgumentParser(description="Gridworld benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="run fewer iterations")
+    parser.add_argument("--output", help="path of the json results, stdout if not set")
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE, help="path of the baseline json"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed relative regression"
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="store the results as baseline"
+    )
+    args = parser.parse_args(argv)
+
+    report = {
+        "quick": args.quick,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": run_benchmarks(args.quick),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            file.write(text)
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if baseline.get("quick", False) != args.quick:
+        print(
+            "Baseline was recorded with a different --quick setting, skipping comparison",
+            file=sys.stderr,
+        )
+        return 0
+    regressions = compare(report["results"], baseline["results"], args.tolerance)
+    for regression in regressions:
+        print("Regression: " + regression, file=sys.stderr)
+    return int(bool(regressions))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
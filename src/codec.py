@@ -0,0 +1,112 @@
+# @title:    codec.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import math
+from functools import lru_cache
+import numpy as np
+from numpy import uint8
+from .tile import SPRITES
+
+# Code
+
+#   bit layout of an encoded tile: object id in bits 0 - 3, vision in bit 4, player direction in bits 5 - 6
+VISION_BIT = 4
+DIRECTION_SHIFT = 5
+NUM_CODES = 128
+
+#   number of np.rot90 calls of Gridworld.get_observation per player direction
+ROTATIONS = (0, 3, 1, 2)
+
+
+def build_atlas():
+    """
+    Rotates the tile sprites for every vision flag and player direction
+    Returns a (NUM_CODES, 8, 8, 3) uint8 array of tile images indexed by the tile code
+    """
+    atlas = np.zeros(shape=(NUM_CODES, 8, 8, 3), dtype=uint8)
+    object_ids = np.arange(SPRITES.shape[1])
+    for vision in (0, 1):
+        for direction, rotations in enumerate(ROTATIONS):
+            codes = object_ids | (vision << VISION_BIT) | (direction << DIRECTION_SHIFT)
+            atlas[codes] = np.rot90(SPRITES[vision], rotations, axes=(1, 2))
+    return atlas
+
+
+ATLAS = build_atlas()
+ATLAS.setflags(write=False)
+
+
+@lru_cache(maxsize=None)
+def get_atlas(tile_size: int = 8):
+    """
+    Returns the read-only atlas of a tile size, created once per size
+    Divisors of 8 average the sprite pixels of each block, other sizes sample the nearest sprite pixel.
+    @params:
+        tile_size => side length of a tile in pixels
+    """
+    if tile_size == 8:
+        return ATLAS
+    if 8 % tile_size == 0:
+        block = 8 // tile_size
+        atlas = ATLAS.reshape(NUM_CODES, tile_size, block, tile_size, block, 3)
+        atlas = atlas.mean(axis=(2, 4)).round().astype(uint8)
+    else:
+        pixels = np.arange(tile_size) * 8 // tile_size
+        atlas = ATLAS[:, pixels[:, None], pixels[None, :]]
+    atlas.setflags(write=False)
+    return atlas
+
+
+def encode_observation(env):
+    """
+    Encodes the current observation of a gridworld
+    @params:
+        env => the Gridworld object
+    Returns a (observation_size ** 2,) uint8 array of tile codes in observation order
+    """
+    size = env.observation_size
+    codes = np.empty(shape=(size, size), dtype=uint8)
+    direction = env.player_direction << DIRECTION_SHIFT
+    for i in range(size):
+        row = env.world[env.top_left_x + i]
+        for j in range(size):
+            tile = row[env.top_left_y + j]
+            codes[i, j] = tile.object_id | (tile.vision << VISION_BIT) | direction
+    return np.rot90(codes, ROTATIONS[env.player_direction]).reshape(-1)
+
+
+def encode_observations(envs):
+    """
+    Encodes the current observations of several gridworlds
+    @params:
+        envs => list of Gridworld objects with the same observation size
+    Returns a (B, observation_size ** 2) uint8 array of tile codes
+    """
+    return np.stack([encode_observation(env) for env in envs])
+
+
+def decode_observations(codes, out=None, tile_size: int = 8):
+    """
+    Reconstructs RGB observations from tile codes
+    @params:
+        codes => (..., observation_size ** 2) uint8 array of tile codes
+        out => optional preallocated (..., observation_size * tile_size, observation_size * tile_size, 3) uint8 array
+        tile_size => side length of a tile in pixels, 8 default
+    Returns the RGB observations, identical to Gridworld.get_observation with the default tile size
+    """
+    codes = np.asarray(codes)
+    size = math.isqrt(codes.shape[-1])
+    assert (
+        size * size == codes.shape[-1]
+    ), "Error: codes do not form a square observation"
+    batch = codes.shape[:-1]
+    tiles = get_atlas(tile_size)[codes.reshape(batch + (size, size))]
+    pixels = size * tile_size
+    if out is None:
+        out = np.empty(shape=batch + (pixels, pixels, 3), dtype=uint8)
+    out.reshape(batch + (size, tile_size, size, tile_size, 3))[...] = np.moveaxis(
+        tiles, -4, -3
+    )
+    return out
@@ -0,0 +1,283 @@
+# @title:    differential.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import argparse
+import dataclasses
+import hashlib
+import json
+import os
+from random import Random
+import numpy as np
+from .gridworld import Gridworld
+from .tile import Tile
+
+# Code
+
+GOLDEN_TRACES = os.path.join(os.path.dirname(__file__), "tests", "golden_traces.json")
+
+#   levels and action streams of the golden traces
+GOLDEN_ENVIRONMENT_IDS = ("empty-10x10", "empty-10x10-random", "hardcore-10x10-random")
+GOLDEN_SEEDS = (0, 1)
+GOLDEN_STEPS = 100
+
+#   scalar state attributes compared in a state diff, if an engine provides them
+STATE_ATTRIBUTES = (
+    "player_x",
+    "player_y",
+    "player_direction",
+    "top_left_x",
+    "top_left_y",
+    "current_steps",
+    "current_reward_penalties",
+    "done",
+)
+
+
+class DivergenceError(AssertionError):
+    """
+    Raised at the first step where two engines or an engine and a golden trace differ
+    """
+
+    def __init__(self, seed, step: int, fields: list, state_diff: dict = None):
+        """
+        @params:
+            seed => seed of the diverging level sequence
+            step => number of the first diverging step, 0 for the state after creation
+            fields => names of the differing step results
+            state_diff => dict of differing state attributes as (reference, candidate) tuples
+        """
+        self.seed = seed
+        self.step = step
+        self.fields = fields
+        self.state_diff = state_diff or {}
+        message = f"seed {seed}: step {step} differs in {', '.join(fields)}"
+        for name, (reference, candidate) in self.state_diff.items():
+            message += f"\n    {name}: reference {reference}, candidate {candidate}"
+        super().__init__(message)
+
+
+def observation_hash(observation):
+    """
+    Returns a short hex digest of an observation
+    """
+    return hashlib.sha1(np.ascontiguousarray(observation).tobytes()).hexdigest()[:16]
+
+
+def info_dict(info):
+    """
+    Returns the fields of an Info object as dict
+    """
+    return dataclasses.asdict(info)
+
+
+def get_state(env):
+    """
+    Collects the comparable state of an engine
+    @params:
+        env => Gridworld or any engine with the same attributes
+    Returns a dict of state values
+    """
+    state = {
+        name: getattr(env, name) for name in STATE_ATTRIBUTES if hasattr(env, name)
+    }
+    if hasattr(env, "get_object_grid"):
+        state["object_grid"] = env.get_object_grid()
+    return state
+
+
+def diff_states(reference, candidate):
+    """
+    Compares the states of two engines
+    @params:
+        reference => the reference engine
+        candidate => the candidate engine
+    Returns a dict of differing values as (reference, candidate) tuples,
+    differing object grid cells are reported as (x, y) coordinates
+    """
+    reference, candidate = get_state(reference), get_state(candidate)
+    diff = {}
+    for name in reference.keys() & candidate.keys():
+        if name == "object_grid":
+            a, b = reference[name], candidate[name]
+            if a.shape != b.shape:
+                diff[name] = (a.shape, b.shape)
+                continue
+            for x, y in zip(*np.nonzero(a != b)):
+                diff[f"object_grid[{x}][{y}]"] = (int(a[x, y]), int(b[x, y]))
+        elif reference[name] != candidate[name]:
+            diff[name] = (reference[name], candidate[name])
+    return diff
+
+
+def compare_results(reference, candidate):
+    """
+    Compares two step results
+    @params:
+        reference => (observation, reward, done, info) of the reference engine
+        candidate => (observation, reward, done, info) of the candidate engine
+    Returns a list of the names of differing fields
+    """
+    fields = []
+    if not np.array_equal(np.asarray(reference[0]), np.asarray(candidate[0])):
+        fields.append("observation")
+    if reference[1] != candidate[1]:
+        fields.append("reward")
+    if reference[2] != candidate[2]:
+        fields.append("done")
+    reference_info, candidate_info = info_dict(reference[3]), info_dict(candidate[3])
+    for name, value in reference_info.items():
+        if candidate_info.get(name) != value:
+            fields.append("info." + name)
+    return fields
+
+
+def run_differential(make_reference, make_candidate, seeds, steps: int = 200):
+    """
+    Steps a reference and a candidate engine side by side with the same random actions
+    Both engines are reset whenever the reference episode is done.
+    @params:
+        make_reference => function creating the reference engine from a seed
+        make_candidate => function creating the candidate engine from a seed
+        seeds => iterable of seeds, every seed also seeds the action stream
+        steps => number of steps per seed
+    Returns the number of compared steps
+    Raises a DivergenceError at the first differing step
+    """
+    compared = 0
+    for seed in seeds:
+        reference, candidate = make_reference(seed), make_candidate(seed)
+        if not np.array_equal(
+            np.asarray(reference.get_observation()),
+            np.asarray(candidate.get_observation()),
+        ):
+            raise DivergenceError(
+                seed, 0, ["observation"], diff_states(reference, candidate)
+            )
+        rng = Random(seed)
+        for step in range(1, steps + 1):
+            action = rng.randint(0, 2)
+            expected = reference.step(action)
+            result = candidate.step(action)
+            fields = compare_results(expected, result)
+            if fields:
+                raise DivergenceError(
+                    seed, step, fields, diff_states(reference, candidate)
+                )
+            compared += 1
+            if expected[2]:
+                expected = reference.reset()
+                result = candidate.reset()
+                if not np.array_equal(np.asarray(expected), np.asarray(result)):
+                    raise DivergenceError(
+                        seed,
+                        step,
+                        ["reset observation"],
+                        diff_states(reference, candidate),
+                    )
+    return compared
+
+
+def record_trace(env, seed, steps: int = GOLDEN_STEPS):
+    """
+    Records a golden trace of an engine with the random action stream of a seed
+    @params:
+        env => the engine at the start of the trace
+        seed => seed of the action stream
+        steps => number of steps
+    Returns the trace as json compatible dict
+    """
+    rng = Random(seed)
+    trace = {
+        "render": observation_hash(env.render()),
+        "observation": observation_hash(env.get_observation()),
+        "steps": [],
+    }
+    for _ in range(steps):
+        action = rng.randint(0, 2)
+        observation, reward, done, info = env.step(action)
+        trace["steps"].append(
+            [
+                action,
+                observation_hash(observation),
+                reward,
+                done,
+                list(info_dict(info).values()),
+            ]
+        )
+        if done:
+            env.reset()
+    return trace
+
+
+def check_trace(env, seed, trace):
+    """
+    Replays a golden trace on an engine
+    @params:
+        env => the engine at the start of the trace
+        seed => seed of the action stream
+        trace => the recorded trace
+    Raises a DivergenceError at the first differing step
+    """
+    if observation_hash(env.render()) != trace["render"]:
+        raise DivergenceError(seed, 0, ["render"])
+    if observation_hash(env.get_observation()) != trace["observation"]:
+        raise DivergenceError(seed, 0, ["observation"])
+    for step, (action, digest, reward, done, info) in enumerate(trace["steps"], 1):
+        result = env.step(action)
+        fields = []
+        if observation_hash(result[0]) != digest:
+            fields.append("observation")
+        if result[1] != reward:
+            fields.append("reward")
+        if result[2] != done:
+            fields.append("done")
+        for (name, value), expected in zip(info_dict(result[3]).items(), info):
+            if value != expected:
+                fields.append("info." + name)
+        if fields:
+            raise DivergenceError(seed, step, fields)
+        if done:
+            env.reset()
+
+
+def record_golden_traces(path: str = GOLDEN_TRACES):
+    """
+    Records the golden traces of the reference Gridworld
+    @params:
+        path => path of the json file
+    """
+    tiles = []
+    tile = Tile()
+    for object_id in range(15):
+        tile.set_object(object_id)
+        tiles.append(observation_hash(tile.render()))
+        tile.set_vision()
+        tiles.append(observation_hash(tile.render()))
+        tile.set_vision()
+    traces = {}
+    for environment_id in GOLDEN_ENVIRONMENT_IDS:
+        for seed in GOLDEN_SEEDS:
+            env = Gridworld.make(environment_id, seed=seed)
+            traces[f"{environment_id}/{seed}"] = record_trace(env, seed)
+    with open(path, "w") as file:
+        json.dump({"tiles": tiles, "traces": traces}, file, separators=(",", ":"))
+
+
+def load_golden_traces(path: str = GOLDEN_TRACES):
+    """
+    Loads the golden traces
+    Returns a dict with the hashes of all tile renderings, ordered by object id and vision,
+    and a dict mapping "environment_id/seed" to traces
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Records the golden traces of the reference Gridworld"
+    )
+    parser.add_argument("--output", default=GOLDEN_TRACES, help="path of the json file")
+    record_golden_traces(parser.parse_args().output)
@@ -0,0 +1,192 @@
+# @title:    episode_stats.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import json
+import os
+import time
+import numpy as np
+
+# Code
+
+#   Info fields collected at the end of every episode, in column order
+FIELDS = (
+    "success",
+    "helper_found",
+    "obstacles_hit",
+    "lava_hit",
+    "wall_hit",
+    "teleport",
+    "reward",
+    "num_steps",
+)
+
+#   default histogram bins per field
+HISTOGRAM_BINS = {
+    "obstacles_hit": np.arange(0, 11),
+    "wall_hit": np.arange(0, 51, 5),
+    "reward": np.linspace(0, 1, 11),
+    "num_steps": np.arange(0, 201, 20),
+}
+
+
+class EpisodeStatistics:
+    """
+    Ring buffer of the final Info values of the last episodes of every environment
+    All buffers are allocated up front, recording an episode only writes into them.
+    """
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        window: int = 100,
+        path: str = None,
+        flush_interval: float = 60.0,
+    ):
+        """
+        Initializes the statistics
+        @params:
+            num_envs => number of environments, env ids are 0 to num_envs - 1
+            window => number of episodes per environment the rolling statistics are computed over
+            path => optional json file the statistics are flushed to
+            flush_interval => seconds between two automatic flushes
+        """
+        self.num_envs = num_envs
+        self.window = window
+        self.path = path
+        self.flush_interval = flush_interval
+        self.values = np.zeros(shape=(num_envs, window, len(FIELDS)), dtype=np.float64)
+        self.episodes = np.zeros(num_envs, dtype=np.int64)
+        #   buffers of record_info, steps without finished episodes return no_env_ids
+        self.scratch = np.zeros(shape=(num_envs, len(FIELDS)), dtype=np.float64)
+        self.no_env_ids = np.zeros(0, dtype=np.intp)
+        self.next_flush = time.monotonic() + flush_interval
+
+    def record(self, env_id: int, info):
+        """
+        Records the final Info object of an episode
+        @params:
+            env_id => id of the environment
+            info => the Info object at the end of the episode
+        """
+        row = self.values[env_id, self.episodes[env_id] % self.window]
+        row[0] = info.success
+        row[1] = info.helper_found
+        row[2] = info.obstacles_hit
+        row[3] = info.lava_hit
+        row[4] = info.wall_hit
+        row[5] = info.teleport
+        row[6] = info.reward
+        row[7] = info.num_steps
+        self.episodes[env_id] += 1
+        if self.path is not None and time.monotonic() >= self.next_flush:
+            self.flush()
+
+    def record_batch(self, env_ids, values):
+        """
+        Records the final values of several episodes at once, for batched environments
+        @params:
+            env_ids => (n,) distinct environment ids
+            values => (n, len(FIELDS)) final values in FIELDS order
+        """
+        rows = self.episodes[env_ids] % self.window
+        self.values[env_ids, rows] = values
+        self.episodes[env_ids] += 1
+        if self.path is not None and time.monotonic() >= self.next_flush:
+            self.flush()
+
+    def record_info(self, dones, info):
+        """
+        Records the finished episodes of a BatchedGridworld step
+        Every environment has to be reset after it is done, else its episode is recorded again. Steps without a
+        finished episode allocate nothing, the field values are gathered in a preallocated buffer.
+        @params:
+            dones => (num_envs,) dones returned by BatchedGridworld.step
+            info => dict of (num_envs,) Info field arrays returned by BatchedGridworld.step
+        Returns the ids of the recorded environments, a shared empty array if none is done
+        """
+        if not dones.any():
+            return self.no_env_ids
+        env_ids = np.flatnonzero(dones)
+        for i, field in enumerate(FIELDS):
+            self.scratch[:, i] = info[field]
+        self.record_batch(env_ids, self.scratch[env_ids])
+        return env_ids
+
+    def filled(self):
+        """
+        Returns a (num_envs, window) bool mask of the ring buffer entries holding an episode
+        """
+        return (
+            np.arange(self.window)[None]
+            < np.minimum(self.episodes, self.window)[:, None]
+        )
+
+    def get_means(self):
+        """
+        Returns a dict mapping every field to a (num_envs,) array of rolling means, nan without episodes
+        """
+        filled = self.filled()
+        counts = filled.sum(axis=1)
+        sums = np.where(filled[..., None], self.values, 0).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts[:, None]
+        return {field: means[:, i] for i, field in enumerate(FIELDS)}
+
+    def get_histograms(self, field: str, bins=None):
+        """
+        Computes a histogram of a field for every environment
+        @params:
+            field => name of the field
+            bins => bin edges, the default bins of the field if None
+        Returns the bin edges and a (num_envs, len(bins) - 1) array of counts
+        """
+        if bins is None:
+            bins = HISTOGRAM_BINS.get(field, np.array([0, 0.5, 1]))
+        bins = np.asarray(bins)
+        filled = self.filled()
+        column = self.values[..., FIELDS.index(field)]
+        index = np.clip(
+            np.searchsorted(bins, column, side="right") - 1, 0, len(bins) - 2
+        )
+        counts = np.zeros(shape=(self.num_envs, len(bins) - 1), dtype=np.int64)
+        env_ids = np.broadcast_to(np.arange(self.num_envs)[:, None], filled.shape)
+        np.add.at(counts, (env_ids[filled], index[filled]), 1)
+        return bins, counts
+
+    def summary(self):
+        """
+        Returns a json compatible dict with episode counts, rolling means and histograms
+        """
+        means = self.get_means()
+        histograms = {}
+        for field in HISTOGRAM_BINS:
+            bins, counts = self.get_histograms(field)
+            histograms[field] = {"bins": bins.tolist(), "counts": counts.tolist()}
+        return {
+            "time": time.time(),
+            "window": self.window,
+            "episodes": self.episodes.tolist(),
+            "means": {
+                field: [None if np.isnan(value) else float(value) for value in values]
+                for field, values in means.items()
+            },
+            "histograms": histograms,
+        }
+
+    def flush(self, path: str = None):
+        """
+        Writes the summary to a json file, replacing it atomically
+        @params:
+            path => path of the file, the path of the statistics if None
+        Raises a ValueError if neither path is set
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("no path to flush the statistics to")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.summary(), file)
+        os.replace(tmp_path, path)
+        self.next_flush = time.monotonic() + self.flush_interval
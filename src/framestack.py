@@ -0,0 +1,100 @@
+# @title:    framestack.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import numpy as np
+from numpy import uint8
+
+# Code
+
+
+class FrameStack:
+    """
+    Preallocated history of the last observations of one or several environments
+    Frames are written once into a buffer of capacity frames, the stacked history is a read-only view of the
+    last num_frames slots. When the buffer is full, the last num_frames - 1 frames are moved to its start,
+    so a returned view stays unchanged for at least capacity - 2 * num_frames + 1 further pushes. A reset
+    writes the new history into fresh slots as well, the view returned before a reset is never changed by it.
+    """
+
+    def __init__(
+        self,
+        num_frames: int,
+        frame_shape: tuple,
+        batch_shape: tuple = (),
+        dtype=uint8,
+        capacity: int = None,
+    ):
+        """
+        Initializes a frame stack
+        @params:
+            num_frames => number of stacked frames
+            frame_shape => shape of one observation
+            batch_shape => shape of the environment batch, () for a single environment
+            dtype => dtype of the observations
+            capacity => number of frames in the buffer, at least 3 * num_frames - 1, 16 * num_frames if None
+        """
+        capacity = capacity or 16 * num_frames
+        assert num_frames > 0, "Error: at least one frame is needed"
+        assert capacity >= 3 * num_frames - 1, "Error: capacity is too small"
+        self.num_frames = num_frames
+        self.capacity = capacity
+        self.batch_ndim = len(batch_shape)
+        self.buffer = np.zeros(
+            shape=(capacity,) + tuple(batch_shape) + tuple(frame_shape), dtype=dtype
+        )
+        self.position = num_frames - 1
+
+    def get(self, copy: bool = False):
+        """
+        Returns the stacked history with shape batch_shape + (num_frames,) + frame_shape, the oldest frame first
+        @params:
+            copy => if True a contiguous copy, else a read-only view into the buffer
+        """
+        frames = self.buffer[self.position - self.num_frames + 1 : self.position + 1]
+        frames = np.moveaxis(frames, 0, self.batch_ndim)
+        if copy:
+            return np.ascontiguousarray(frames)
+        frames.setflags(write=False)
+        return frames
+
+    def push(self, frame):
+        """
+        Appends the newest observation of every environment
+        @params:
+            frame => observation with shape batch_shape + frame_shape
+        Returns the stacked history view
+        """
+        if self.position + 1 == self.capacity:
+            keep = self.num_frames - 1
+            self.buffer[:keep] = self.buffer[self.capacity - keep :]
+            self.position = keep
+        else:
+            self.position += 1
+        self.buffer[self.position] = frame
+        return self.get()
+
+    def reset(self, frame, index=None):
+        """
+        Clears the history, the stack holds zero frames and the given first observation afterwards
+        @params:
+            frame => first observation, with shape batch_shape + frame_shape if index is None,
+                     else with the shape of the indexed environments
+            index => indices of the environments to clear within a one dimensional batch, all if None
+        Returns the stacked history view
+        """
+        history = self.buffer[self.position - self.num_frames + 1 : self.position + 1]
+        if self.position + self.num_frames < self.capacity:
+            self.position += self.num_frames
+        else:
+            self.position = self.num_frames - 1
+        fresh = self.buffer[self.position - self.num_frames + 1 : self.position + 1]
+        if index is None:
+            fresh[:-1] = 0
+            fresh[-1] = frame
+        else:
+            fresh[...] = history
+            fresh[:, index] = 0
+            fresh[-1, index] = frame
+        return self.get()
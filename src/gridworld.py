@@ -3,14 +3,19 @@
 # @date:     19.06.2021
 
 # Imports
-import random
 import numpy as np
-import matplotlib.pyplot as plt
-import time
+from random import Random, getrandbits
 from numpy import uint8
-from helper import Teleporter, Info, Obstacle
-from tile import Tile
-
+from .helper import Teleporter, Info, Obstacle
+from .tile import Tile
+from .solver import distance_fields
+from .profiling import WRAPPED_METHODS, StepProfiler
+from .zobrist import get_keys
+from .framestack import FrameStack
+from .registry import get_config, get_tables
+from .layout import generate_level
+from .lazy import LazyObservation
+from .minimap import FOG_MODES, MINIMAP_MODES, combined_observation, update_fog
 
 # Code
 
@@ -56,6 +61,12 @@ class Gridworld:
         obstacles: bool = False,
         max_steps: int = 0,
         num_obstacles: int = 6,
+        level_filter=None,
+        frame_stack: int = 1,
+        layout: str = None,
+        lazy_observations: bool = False,
+        minimap: str = None,
+        fog_of_war: str = None,
     ):
         """
         Initializes a gridworld
@@ -63,10 +74,19 @@ class Gridworld:
             grid_size: int the size of the playable grid (square)
             observation_size: int = the size of the observation, only odd observation sizes allowed
             random: bool if True all objects are placed random
-            seed: Any sets the seed for the gridworld, if None: int(time.time()) will be the seed
+            seed: Any sets the seed for the gridworld, if None: a seed is drawn from the random module
             obstacles: bool if True lava and obstacles will be placed random
             max_steps: int  number of allowed steps before run fails
             num_obstacles: int number of moving obstacles
+            level_filter: LevelFilter optional filter re-rolling unsolvable or too easy levels
+            frame_stack: int number of stacked observations returned by step and reset, 1 for single observations
+            layout: str walls inside the grid, one of layout.LAYOUTS, None for the original border only world,
+                    objects are placed randomly in reachable cells, needs random
+            lazy_observations: bool if True step and reset return LazyObservation handles rendered on access,
+                               not available with frame stacking
+            minimap: str if set step and reset return a dict of the view and a minimap of the whole map built in one
+                     pass, one of minimap.MINIMAP_MODES, not available with frame stacking or lazy observations
+            fog_of_war: str hides the minimap cells outside the explored cells, one of minimap.FOG_MODES, needs minimap
 
         directions:
             0 = up
@@ -84,92 +104,182 @@ class Gridworld:
         self.n_actions = 3
         self.random = random
         if seed is None:
-            self.seed = int(time.time())
+            self.seed = getrandbits(32)
         else:
             self.seed = seed
+        self.rng = Random(self.seed)
         self.obstacles = obstacles
         self.max_steps = max_steps
         self.num_obstacles = num_obstacles
-
-        self.world, self.world_size = self.make_word()
-
-        (
-            self.player_x,
-            self.player_y,
-            self.player_direction,
-            self.top_left_x,
-            self.top_left_y,
-        ) = self.init_player()
-
-        self.goal_x, self.goal_y = self.init_goal()
-
-        self.teleport = self.init_tp()
-
-        self.helper_x, self.helper_y = self.init_helper()
-
-        self.obstacle_list = self.init_obstacles()
-
-        self.lava_x, self.helper_y = self.init_lava()
+        assert layout is None or random, "Error: layouts need random placement"
+        self.layout = layout
+        self.tables = get_tables(grid_size, observation_size)
+        self.world_size = self.tables.world_size
+
+        self.level_filter = level_filter
+        self.profiler = None
+        self.view_version = 0
+        self.vision_parity = 0
+        self.observation_key = None
+        self.observation_cache = None
+        self.frame_stack = frame_stack
+        assert not (
+            lazy_observations and frame_stack > 1
+        ), "Error: frame stacking needs rendered observations"
+        self.lazy_observations = lazy_observations
+        assert (
+            minimap is None or minimap in MINIMAP_MODES
+        ), f"Error: unknown minimap {minimap}"
+        assert minimap is None or not (
+            lazy_observations or frame_stack > 1
+        ), "Error: minimaps need single rendered observations"
+        assert fog_of_war is None or (
+            minimap is not None and fog_of_war in FOG_MODES
+        ), f"Error: fog of war {fog_of_war} needs a minimap"
+        self.minimap = minimap
+        self.fog_of_war = fog_of_war
+        self.explored = None
+        self.frames = None
+        if frame_stack > 1:
+            self.frames = FrameStack(frame_stack, (self.obs_size, self.obs_size, 3))
+
+        self.generate_level()
 
         self.set_vision()
         self.info = Info()
         self.done = False
+        if self.frames is not None:
+            self.frames.reset(self.get_observation())
 
     @staticmethod
-    def make(environment_id: str, seed=None):
+    def make(
+        environment_id,
+        seed=None,
+        level_filter=None,
+        frame_stack: int = 1,
+        lazy_observations: bool = False,
+        minimap: str = None,
+        fog_of_war: str = None,
+    ):
         """
         Makes a gridworld and returns a Gridworld object
         @params:
-            environment_id => id of the environment to create
+            environment_id => id of the environment to create, or an EnvConfig object
             seed => random seed, None default
-        current environment ids:
+            level_filter => optional LevelFilter, None default
+            frame_stack => number of stacked observations, 1 default
+            lazy_observations => if True step and reset return LazyObservation handles, False default
+            minimap => if set step and reset return dicts of the view and a minimap, "ids" or "pixels", None default
+            fog_of_war => minimap cells shown, "seen" or "visited", None default
+        registered environment ids, more can be added with registry.register:
             empty-10x10 => an empty 10x10 test world
             empty-10x10-random => an empty 10x10 test world with all objects random placed
             hardcore-10x10-random => a 10x10 world with all objects placed
+        parametric environment ids, see registry.ID_PATTERN:
+            {empty|hardcore}-{N}x{N}[-random[-{maze|rooms}]][-obs{K}][-o{M}][-s{S}] => N grid size, K observation size,
+            M number of obstacles, S max steps, e.g. hardcore-20x20-random-obs7-o8
+        Raises a ValueError for unknown environment ids
         """
-
-        if environment_id == "empty-10x10":
-            return Gridworld(
-                grid_size=10,
-                observation_size=5,
-                random=False,
-                seed=seed,
-                obstacles=False,
-                max_steps=200,
-                num_obstacles=0,
-            )
-        if environment_id == "empty-10x10-random":
-            return Gridworld(
-                grid_size=10,
-                observation_size=5,
-                random=True,
-                seed=seed,
-                obstacles=False,
-                max_steps=200,
-                num_obstacles=0,
-            )
-
-        if environment_id == "hardcore-10x10-random":
-            return Gridworld(
-                grid_size=10,
-                observation_size=5,
-                random=True,
-                seed=seed,
-                obstacles=True,
-                max_steps=200,
-                num_obstacles=3,
-            )
+        return Gridworld(
+            **get_config(environment_id).as_dict(),
+            seed=seed,
+            level_filter=level_filter,
+            frame_stack=frame_stack,
+            lazy_observations=lazy_observations,
+            minimap=minimap,
+            fog_of_war=fog_of_war,
+        )
+
+    def init_level(self):
+        """
+        Creates the map and places the player and all objects
+        """
+        self.world = self.make_word()
+        if self.layout is not None:
+            self.init_layout()
+        else:
+            (
+                self.player_x,
+                self.player_y,
+                self.player_direction,
+                self.top_left_x,
+                self.top_left_y,
+            ) = self.init_player()
+            self.goal_x, self.goal_y = self.init_goal()
+            self.teleport = self.init_tp()
+            self.helper_x, self.helper_y = self.init_helper()
+            self.obstacle_list = self.init_obstacles()
+            self.lava_x, self.lava_y = self.init_lava()
+            self.level_walls = self.tables.walls
+        self.level_obstacles = [
+            (obstacle.x, obstacle.y, obstacle.direction)
+            for obstacle in self.obstacle_list
+        ]
+        self.distance_fields = None
+        self.zobrist = get_keys(self.world_size)
+        self.state_hash = self.compute_state_hash()
+        self.view_version += 1
+        if self.fog_of_war is not None:
+            self.explored = np.zeros((self.world_size, self.world_size), dtype=np.bool_)
+            update_fog(self)
+
+    def generate_level(self):
+        """
+        Creates a new level, re-rolled by the level filter if one is set
+        """
+        self.init_level()
+        if self.level_filter is not None:
+            self.level_filter.apply(self)
 
     def make_word(self):
-        world_size = self.grid_size + (2 * (self.observation_size - 1))
+        """
+        Creates the tiles of an empty map with walls on the border of the shared wall template
+        Returns the map
+        """
+        world_size = self.world_size
         world = [[Tile() for j in range(world_size)] for i in range(world_size)]
-        for i in range(world_size):
-            for j in range(self.observation_size - 1):
-                world[i][j].set_object(5)
-                world[j][i].set_object(5)
-                world[world_size - 1 - j][i].set_object(5)
-                world[i][world_size - 1 - j].set_object(5)
-        return world, world_size
+        for i, j in self.tables.wall_cells:
+            world[i][j].set_object(5)
+        return world
+
+    def init_layout(self):
+        """
+        Generates the walls of the layout and places the player and all objects with layout.generate_level,
+        the numpy generator of every level is seeded from the random generator of the gridworld
+        """
+        level = generate_level(
+            np.random.default_rng(self.rng.getrandbits(64)),
+            self.tables,
+            self.layout,
+            self.obstacles,
+            self.num_obstacles,
+        )
+        border = self.observation_size - 1
+        inside = level.grid[border:-border, border:-border] if border else level.grid
+        self.level_walls = level.grid
+        for i, j in np.argwhere(inside == 5).tolist():
+            self.world[i + border][j + border].set_object(5)
+
+        self.player_x, self.player_y, self.player_direction = level.player
+        corner_x, corner_y = self.tables.corners[self.player_direction]
+        self.top_left_x = self.player_x + corner_x
+        self.top_left_y = self.player_y + corner_y
+        self.world[self.player_x][self.player_y].set_object(self.player_direction + 1)
+        self.goal_x, self.goal_y = level.goal
+        self.world[self.goal_x][self.goal_y].set_object(12)
+        self.helper_x, self.helper_y = level.helper
+        self.world[self.helper_x][self.helper_y].set_object(13)
+        self.teleport = Teleporter(*level.teleporter)
+        self.world[self.teleport.x_1][self.teleport.y_1].set_object(6, self.teleport)
+        self.world[self.teleport.x_2][self.teleport.y_2].set_object(6, self.teleport)
+        self.lava_x, self.lava_y = level.lava
+        if self.lava_x >= 0:
+            self.world[self.lava_x][self.lava_y].set_object(7)
+        self.obstacle_list = []
+        for x, y, direction in level.obstacles.tolist():
+            obstacle = Obstacle(x=x, y=y, direction=direction, dead=False)
+            self.world[x][y].set_object(8 + direction, obstacle)
+            self.obstacle_list.append(obstacle)
 
     def init_player(self):
         """
@@ -188,30 +298,17 @@ class Gridworld:
                 self.observation_size - 1,
             )
         else:
-            x = random.randint(
+            x = self.rng.randint(
                 self.observation_size - 1, self.world_size - self.observation_size
             )
-            y = random.randint(
+            y = self.rng.randint(
                 self.observation_size - 1, self.world_size - self.observation_size
             )
-            direction = random.randint(0, 3)
-            top_left_x = 0
-            top_left_y = 0
-            if direction == 0:
-                top_left_x = x - self.observation_size + 1
-                top_left_y = y - int(self.observation_size / 2)
-            elif direction == 1:
-                top_left_x = x - int(self.observation_size / 2)
-                top_left_y = y - self.observation_size + 1
-            elif direction == 2:
-                top_left_x = x - int(self.observation_size / 2)
-                top_left_y = y
-            elif direction == 3:
-                top_left_x = x
-                top_left_y = y - int(self.observation_size / 2)
+            direction = self.rng.randint(0, 3)
+            corner_x, corner_y = self.tables.corners[direction]
 
             self.world[x][y].set_object(direction + 1)
-            return x, y, direction, top_left_x, top_left_y
+            return x, y, direction, x + corner_x, y + corner_y
 
     def init_goal(self):
         """
@@ -229,10 +326,10 @@ class Gridworld:
         else:
             set_goal = False
             while not set_goal:
-                x = random.randint(
+                x = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
-                y = random.randint(
+                y = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
                 if self.world[x][y].object_id == 0:
@@ -246,7 +343,7 @@ class Gridworld:
         Creates a Teleporter-object and places it on the map.
         Returns the Teleporter-object
         """
-        tp = Teleporter
+        tp = Teleporter()
         if not self.random:
             tp.x_1 = self.observation_size - 1
             tp.y_1 = self.observation_size + 1
@@ -257,16 +354,16 @@ class Gridworld:
             set_tp = False
 
             while not set_tp:
-                tp.x_1 = random.randint(
+                tp.x_1 = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
-                tp.y_1 = random.randint(
+                tp.y_1 = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
-                tp.x_2 = random.randint(
+                tp.x_2 = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
-                tp.y_2 = random.randint(
+                tp.y_2 = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
 
@@ -293,10 +390,10 @@ class Gridworld:
             set_helper = False
 
             while not set_helper:
-                x = random.randint(
+                x = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
-                y = random.randint(
+                y = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
                 if self.world[x][y].object_id == 0:
@@ -317,17 +414,17 @@ class Gridworld:
         for i in range(self.num_obstacles):
             set_obstacle = False
             while not set_obstacle:
-                x = random.randint(
+                x = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
-                y = random.randint(
+                y = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
                 #   0 = obstacle up
                 #   1 = obstacle left
                 #   2 = obstacle down
                 #   3 = obstacle right
-                direction = random.randint(0, 3)
+                direction = self.rng.randint(0, 3)
                 if self.world[x][y].object_id == 0:
                     set_obstacle = True
             obstacle = Obstacle()
@@ -347,10 +444,10 @@ class Gridworld:
         if self.obstacles:
             set_helper = False
             while not set_helper:
-                x = random.randint(
+                x = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
-                y = random.randint(
+                y = self.rng.randint(
                     self.observation_size - 1, self.world_size - self.observation_size
                 )
                 if self.world[x][y].object_id == 0:
@@ -384,7 +481,9 @@ class Gridworld:
             self.info.success = False
             reward = 0
             self.info.reward = 0
-            next_state = self.get_observation()
+            next_state = self.observe()
+            if self.frames is not None:
+                next_state = self.frames.push(next_state)
             return next_state, reward, self.done, self.info
 
         self.set_vision()
@@ -413,8 +512,10 @@ class Gridworld:
                 else:
                     self.move_player(teleport.x_1, teleport.y_1)
                     self.world[x][y].set_object(0)
+                self.touch(x, y)
                 self.world[teleport.x_1][teleport.y_1].object = None
                 self.world[teleport.x_2][teleport.y_2].object = None
+                self.state_hash ^= self.zobrist.teleport
 
             #   7 = lava
             if object_id == 7:
@@ -429,6 +530,9 @@ class Gridworld:
                 obstacle = self.world[x][y].object
                 obstacle.dead = True
                 self.world[x][y].object = None
+                self.state_hash ^= self.zobrist.obstacle[
+                    (obstacle.direction * self.world_size + x) * self.world_size + y
+                ]
                 self.info.reward_penalty += 0.2
                 self.info.obstacles_hit += 1
                 self.move_player(x, y)
@@ -443,6 +547,7 @@ class Gridworld:
                 #   13 = helper
             if object_id == 13:
                 self.move_player(x, y)
+                self.state_hash ^= self.zobrist.helper
                 self.info.helper_found = True
                 self.info.reward_penalty -= 0.1
                 self.current_reward_penalties -= 0.1
@@ -454,7 +559,9 @@ class Gridworld:
                 self.move_obstacle(obstacle)
 
         self.set_vision()
-        next_state = self.get_observation()
+        next_state = self.observe()
+        if self.frames is not None:
+            next_state = self.frames.push(next_state)
 
         reward = self.get_reward()
         if self.done:
@@ -493,24 +600,21 @@ class Gridworld:
             x => the input x coordinate
             y => the input y coordinate
         """
-
-        if self.player_direction == 0:
-            self.top_left_x = x - self.observation_size + 1
-            self.top_left_y = y - int(self.observation_size / 2)
-        elif self.player_direction == 1:
-            self.top_left_x = x - int(self.observation_size / 2)
-            self.top_left_y = y - self.observation_size + 1
-        elif self.player_direction == 2:
-            self.top_left_x = x - int(self.observation_size / 2)
-            self.top_left_y = y
-        elif self.player_direction == 3:
-            self.top_left_x = x
-            self.top_left_y = y - int(self.observation_size / 2)
+        corner_x, corner_y = self.tables.corners[self.player_direction]
+        self.top_left_x = x + corner_x
+        self.top_left_y = y + corner_y
 
         self.world[self.player_x][self.player_y].set_object(0)
         self.world[x][y].set_object(self.player_direction + 1)
+        keys = self.zobrist.player
+        offset = self.player_direction * self.world_size
+        self.state_hash ^= (
+            keys[(offset + self.player_x) * self.world_size + self.player_y]
+            ^ keys[(offset + x) * self.world_size + y]
+        )
         self.player_x = x
         self.player_y = y
+        self.view_version += 1
 
     #
     def turn(self, dir):
@@ -550,20 +654,18 @@ class Gridworld:
             elif self.player_direction == 3:
                 next_dir = 1
 
-        if next_dir == 0:
-            self.top_left_x = self.player_x - self.observation_size + 1
-            self.top_left_y = self.player_y - int(self.observation_size / 2)
-        elif next_dir == 1:
-            self.top_left_x = self.player_x - int(self.observation_size / 2)
-            self.top_left_y = self.player_y - self.observation_size + 1
-        elif next_dir == 2:
-            self.top_left_x = self.player_x - int(self.observation_size / 2)
-            self.top_left_y = self.player_y
-        elif next_dir == 3:
-            self.top_left_x = self.player_x
-            self.top_left_y = self.player_y - int(self.observation_size / 2)
+        corner_x, corner_y = self.tables.corners[next_dir]
+        self.top_left_x = self.player_x + corner_x
+        self.top_left_y = self.player_y + corner_y
 
         self.world[self.player_x][self.player_y].set_object(next_dir + 1)
+        keys = self.zobrist.player
+        position = self.player_x * self.world_size + self.player_y
+        square = self.world_size * self.world_size
+        self.state_hash ^= (
+            keys[self.player_direction * square + position]
+            ^ keys[next_dir * square + position]
+        )
         self.player_direction = next_dir
 
     #
@@ -582,11 +684,12 @@ class Gridworld:
         """
         move_done = False
         reward_penalty = 0
+        start_x, start_y, start_direction = obstacle.x, obstacle.y, obstacle.direction
         if move == -1:
             move_done = True
         while not move_done:
             if not move_done:
-                move = random.randint(0, 100)
+                move = self.rng.randint(0, 100)
                 if move < 60:
                     move = 0
                 elif move < 80:
@@ -680,6 +783,24 @@ class Gridworld:
                 if move_done:
                     obstacle.x = n_x
                     obstacle.y = n_y
+        if obstacle.dead or (obstacle.x, obstacle.y, obstacle.direction) != (
+            start_x,
+            start_y,
+            start_direction,
+        ):
+            keys = self.zobrist.obstacle
+            self.state_hash ^= keys[
+                (start_direction * self.world_size + start_x) * self.world_size
+                + start_y
+            ]
+            if not obstacle.dead:
+                self.state_hash ^= keys[
+                    (obstacle.direction * self.world_size + obstacle.x)
+                    * self.world_size
+                    + obstacle.y
+                ]
+            self.touch(start_x, start_y)
+            self.touch(obstacle.x, obstacle.y)
         return reward_penalty
 
     def get_reward(self):
@@ -687,25 +808,97 @@ class Gridworld:
         Calculates the current reward
         Returns the current reward
         """
-        reward = 1 - ((self.current_steps ** 1.5) / (self.max_steps ** 1.5))
+        reward = 1 - ((self.current_steps**1.5) / (self.max_steps**1.5))
         reward = reward - self.current_reward_penalties
         if reward < 0:
             self.done = True
             reward = 0
         return reward
 
+    def touch(self, x, y):
+        """
+        Invalidates the cached observation if the given coordinates are inside the observation
+        @params:
+            x => x coordinate of a changed tile
+            y => y coordinate of a changed tile
+        """
+        if (
+            0 <= x - self.top_left_x < self.observation_size
+            and 0 <= y - self.top_left_y < self.observation_size
+        ):
+            self.view_version += 1
+
+    def set_object(self, x, y, object_id: int, object=None):
+        """
+        Sets the object of a tile and invalidates the cached observation if the tile is inside the view
+        Tiles changed directly through Tile.set_object need a call of touch, else the cached observation
+        stays in use.
+        @params:
+            x => x coordinate of the tile
+            y => y coordinate of the tile
+            object_id => the id of the object to set
+            object => the associated obstacle or teleporter-object, None else
+        """
+        self.world[x][y].set_object(object_id, object)
+        self.touch(x, y)
+
+    def get_view_state(self):
+        """
+        Returns the key of the current view, it changes when the view is moved or a tile inside it changes
+        """
+        return (
+            self.top_left_x,
+            self.top_left_y,
+            self.player_direction,
+            self.view_version,
+            self.vision_parity,
+        )
+
+    def observe(self):
+        """
+        Returns the current observation image, a LazyObservation handle with lazy observations,
+        a dict of the view and the minimap with minimaps
+        """
+        if self.lazy_observations:
+            return LazyObservation(self)
+        if self.minimap is not None:
+            return combined_observation(self)
+        return self.get_observation()
+
     def get_observation(self):
         """
         Generates the current player observation
+        The observation is cached until the view is moved or turned or a tile inside it changes,
+        an unchanged view returns the same read-only array. Tiles are assumed to change only through
+        step, reset, set_object or a write followed by touch.
         Returns the current observation image
         """
+        key = self.get_view_state()
+        if key == self.observation_key:
+            if self.profiler is not None:
+                self.profiler.count("observation_cache_hits")
+            return self.observation_cache
+        if self.profiler is not None:
+            self.profiler.count("observation_cache_misses")
+            self.profiler.count("renders", self.observation_size**2)
+        image = self.build_observation()
+        image.setflags(write=False)
+        self.observation_key = key
+        self.observation_cache = image
+        return image
+
+    def build_observation(self):
+        """
+        Renders the current player observation without the cache
+        Returns a new observation image
+        """
         pixel_len = self.observation_size * 8
         image = np.zeros(shape=(pixel_len, pixel_len, 3), dtype=uint8)
         for i in range(self.observation_size):
             for j in range(self.observation_size):
-                image[i * 8 : i * 8 + 8, j * 8 : j * 8 + 8] = (
-                    self.world[self.top_left_x + i][self.top_left_y + j].render().copy()
-                )
+                image[i * 8 : i * 8 + 8, j * 8 : j * 8 + 8] = self.world[
+                    self.top_left_x + i
+                ][self.top_left_y + j].render()
         # directions:
         #   0 = up
         #   1 = right
@@ -741,9 +934,7 @@ class Gridworld:
         image = np.zeros(shape=(pixel_len, pixel_len, 3), dtype=uint8)
         for i in range(self.world_size):
             for j in range(self.world_size):
-                image[i * 8 : i * 8 + 8, j * 8 : j * 8 + 8] = (
-                    self.world[i][j].render().copy()
-                )
+                image[i * 8 : i * 8 + 8, j * 8 : j * 8 + 8] = self.world[i][j].render()
         return image
 
     def set_vision(self):
@@ -753,36 +944,157 @@ class Gridworld:
         for i in range(self.observation_size):
             for j in range(self.observation_size):
                 self.world[i + self.top_left_x][j + self.top_left_y].set_vision()
+        self.vision_parity ^= 1
 
-    def reset(self):
+    def reset(self, seed=None):
         """
         Creates a new map and resets all variables
+        @params:
+            seed => optional new seed, the levels of all following resets are derived from it
         Returns an observation of the new map
         """
-        self.world, self.world_size = self.make_word()
-        (
-            self.player_x,
-            self.player_y,
-            self.player_direction,
-            self.top_left_x,
-            self.top_left_y,
-        ) = self.init_player()
-        self.goal_x, self.goal_y = self.init_goal()
-        self.teleport = self.init_tp()
-        self.helper_x, self.helper_y = self.init_helper()
-        self.obstacle_list = self.init_obstacles()
-        self.init_lava()
+        if seed is not None:
+            self.seed = seed
+            self.rng.seed(seed)
+        self.generate_level()
         self.set_vision()
         self.current_steps = 0
         self.current_reward_penalties = 0
         self.info = Info()
         self.done = False
-        return self.get_observation()
+        if self.frames is not None:
+            return self.frames.reset(self.get_observation())
+        return self.observe()
+
+    def enable_profiling(self, callback=None, interval: int = 1000):
+        """
+        Starts recording phase timings and event counters
+        @params:
+            callback => optional function called with a profile snapshot every interval steps
+            interval => number of steps between two callbacks
+        Returns the StepProfiler object
+        """
+        if self.profiler is not None:
+            self.profiler.detach()
+        StepProfiler(callback, interval).attach(self)
+        return self.profiler
+
+    def disable_profiling(self):
+        """
+        Stops recording, the gridworld runs without any profiling code afterwards
+        """
+        if self.profiler is not None:
+            self.profiler.detach()
+
+    def __getstate__(self):
+        """
+        Returns the state for copy.deepcopy and pickle, the copy of a profiled gridworld runs without profiler,
+        the wrappers are bound to the original gridworld and its profiler
+        """
+        if self.profiler is None:
+            return self.__dict__
+        state = {
+            name: value
+            for name, value in self.__dict__.items()
+            if name not in WRAPPED_METHODS
+        }
+        state["profiler"] = None
+        return state
+
+    def get_profile(self):
+        """
+        Returns a snapshot dict of the phase timings and event counters, None if profiling is disabled
+        """
+        if self.profiler is None:
+            return None
+        return self.profiler.snapshot()
+
+    def compute_state_hash(self):
+        """
+        Hashes the dynamic state of the map from scratch, step keeps state_hash up to date incrementally
+        Returns the 64 bit xor of the keys of the player, all living obstacles and the unused teleporter and helper
+        """
+        keys = self.zobrist
+        size = self.world_size
+        state_hash = keys.player[
+            (self.player_direction * size + self.player_x) * size + self.player_y
+        ]
+        for obstacle in self.obstacle_list:
+            if not obstacle.dead:
+                state_hash ^= keys.obstacle[
+                    (obstacle.direction * size + obstacle.x) * size + obstacle.y
+                ]
+        if self.world[self.teleport.x_1][self.teleport.y_1].object_id == 6:
+            state_hash ^= keys.teleport
+        if self.world[self.helper_x][self.helper_y].object_id == 13:
+            state_hash ^= keys.helper
+        return state_hash
+
+    def get_config(self):
+        """
+        Returns the constructor arguments of the gridworld as a dict, without seed and level filter
+        """
+        return {
+            "grid_size": self.grid_size,
+            "observation_size": self.observation_size,
+            "random": self.random,
+            "obstacles": self.obstacles,
+            "max_steps": self.max_steps,
+            "num_obstacles": self.num_obstacles,
+            "frame_stack": self.frame_stack,
+            "layout": self.layout,
+            "lazy_observations": self.lazy_observations,
+            "minimap": self.minimap,
+            "fog_of_war": self.fog_of_war,
+        }
+
+    def get_frames(self, copy: bool = False):
+        """
+        Returns the last frame_stack observations, the oldest first, None without frame stacking
+        @params:
+            copy => if True a contiguous copy, else a read-only view
+        """
+        if self.frames is None:
+            return None
+        return self.frames.get(copy)
+
+    def get_object_grid(self):
+        """
+        Collects the object ids of all tiles
+        Returns a (world_size, world_size) uint8 array of object ids
+        """
+        return np.array(
+            [[tile.object_id for tile in row] for row in self.world], dtype=uint8
+        )
+
+    def get_distance_fields(self):
+        """
+        Returns the goal and helper distance fields of the current level as it was generated,
+        computed once per level from the walls and initial object positions, cached until the next reset
+        """
+        if self.distance_fields is None:
+            self.distance_fields = distance_fields(self)
+        return self.distance_fields
+
+    def get_goal_distance(self):
+        """
+        Returns the number of forward moves from the player to the goal, -1 if the goal is unreachable
+        """
+        fields = self.get_distance_fields()
+        return int(fields.goal[int(self.info.teleport), self.player_x, self.player_y])
+
+    def get_helper_distance(self):
+        """
+        Returns the number of forward moves from the player to the helper, -1 if the helper is unreachable
+        """
+        fields = self.get_distance_fields()
+        return int(fields.helper[int(self.info.teleport), self.player_x, self.player_y])
 
 
 """
 Example World creation
 
+import matplotlib.pyplot as plt
 
 gw = Gridworld.make("hardcore-10x10-random")
 plt.imshow(gw.render())
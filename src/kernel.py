@@ -0,0 +1,162 @@
+# @title:    kernel.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Code
+
+#   step kernel backends of a GridworldGroup
+#       numpy  => vectorized NumPy engine, always available
+#       python => the fused kernel run by the interpreter, slow, used to test the kernel without Numba
+#       numba  => the fused kernel compiled by Numba, only if Numba is installed
+#       auto   => numba if available, numpy else
+BACKENDS = ("auto", "numpy", "python", "numba")
+
+NUMBA_AVAILABLE = njit is not None
+
+#   direction offsets and turns, 0 = up, 1 = left, 2 = right, 3 = down
+_DIRECTION_X = np.array([-1, 0, 0, 1], dtype=np.int64)
+_DIRECTION_Y = np.array([0, -1, 1, 0], dtype=np.int64)
+_TURN_LEFT = np.array([1, 3, 0, 2], dtype=np.int64)
+_TURN_RIGHT = np.array([2, 0, 3, 1], dtype=np.int64)
+
+
+def step_kernel(
+    actions,
+    grid,
+    player_x,
+    player_y,
+    player_direction,
+    teleporters,
+    steps,
+    done,
+    rewards,
+    reward_table,
+    max_steps,
+    num_steps,
+    reward_penalty,
+    info_reward,
+    success,
+    helper_found,
+    obstacles_hit,
+    lava_hit,
+    wall_hit,
+    teleport,
+):
+    """
+    Performs one step of every gridworld of a group in place, with the rules of Gridworld.step
+    All arguments are the arrays of a GridworldGroup, followed by its Info columns in INFO_FIELDS order,
+    rewards is overwritten with the rewards of the step
+    """
+    for b in range(actions.shape[0]):
+        steps[b] += 1
+        num_steps[b] += 1
+        rewards[b] = 0.0
+        if steps[b] > max_steps:
+            done[b] = True
+            success[b] = False
+            info_reward[b] = 0.0
+            continue
+
+        x = player_x[b]
+        y = player_y[b]
+        direction = player_direction[b]
+        if actions[b] == 0:
+            target_x = x + _DIRECTION_X[direction]
+            target_y = y + _DIRECTION_Y[direction]
+            target = grid[b, target_x, target_y]
+            next_x = target_x
+            next_y = target_y
+            move = False
+            #   0 = empty
+            if target == 0:
+                move = True
+            #   5 = wall
+            elif target == 5:
+                wall_hit[b] += 1
+                reward_penalty[b] += 0.05
+            #   6 = teleport
+            elif target == 6:
+                teleport[b] = True
+                if target_x == teleporters[b, 0] and target_y == teleporters[b, 1]:
+                    next_x = teleporters[b, 2]
+                    next_y = teleporters[b, 3]
+                else:
+                    next_x = teleporters[b, 0]
+                    next_y = teleporters[b, 1]
+                move = True
+            #   7 = lava
+            elif target == 7:
+                lava_hit[b] = True
+                success[b] = False
+                reward_penalty[b] += 10
+                done[b] = True
+            #   8, 9, 10, 11 = obstacle
+            elif target >= 8 and target <= 11:
+                obstacles_hit[b] += 1
+                reward_penalty[b] += 0.2
+                move = True
+            #   12 = destination
+            elif target == 12:
+                done[b] = True
+                success[b] = True
+                move = True
+            #   13 = helper
+            elif target == 13:
+                helper_found[b] = True
+                reward_penalty[b] -= 0.1
+                move = True
+            if move:
+                grid[b, x, y] = 0
+                grid[b, next_x, next_y] = direction + 1
+                if target == 6:
+                    grid[b, target_x, target_y] = 0
+                player_x[b] = next_x
+                player_y[b] = next_y
+        else:
+            if actions[b] == 1:
+                direction = _TURN_LEFT[direction]
+            else:
+                direction = _TURN_RIGHT[direction]
+            grid[b, x, y] = direction + 1
+            player_direction[b] = direction
+
+        reward = reward_table[steps[b]] - reward_penalty[b]
+        if reward < 0:
+            done[b] = True
+            reward = 0.0
+        if done[b]:
+            rewards[b] = reward
+            info_reward[b] += reward
+
+
+#   compiled on first use, cached on disk between runs
+_compiled_kernel = None
+
+
+def get_step_kernel(backend: str = "auto"):
+    """
+    Returns the fused step kernel of a backend, None for the numpy backend
+    @params:
+        backend => one of BACKENDS
+    """
+    global _compiled_kernel
+    assert backend in BACKENDS, f"Error: unknown backend {backend}"
+    if backend == "auto":
+        backend = "numba" if NUMBA_AVAILABLE else "numpy"
+    if backend == "numpy":
+        return None
+    if backend == "python":
+        return step_kernel
+    if not NUMBA_AVAILABLE:
+        raise ImportError("the numba backend needs the numba package")
+    if _compiled_kernel is None:
+        _compiled_kernel = njit(cache=True, nogil=True)(step_kernel)
+    return _compiled_kernel
@@ -0,0 +1,258 @@
+# @title:    layout.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+from dataclasses import dataclass
+import numpy as np
+
+# Code
+
+#   layouts of the playable grid
+#       empty => no walls inside the border, the layout of the original gridworld
+#       maze => perfect maze with corridors of corridor_width tiles, loops adds random shortcuts
+#       rooms => grid of rooms with room_size tiles, connected by single tile doors, loops adds random doors
+#   every layout keeps all free cells connected
+LAYOUTS = ("empty", "maze", "rooms")
+
+
+@dataclass
+class Level:
+    """
+    Dataclass of a generated level
+        grid => (world_size, world_size) uint8 object ids, objects included, the player excluded
+        player => x, y and direction of the player
+        goal, helper, lava => x and y, lava is (-1, -1) without obstacles
+        teleporter => x_1, y_1, x_2, y_2 of the teleporter
+        obstacles => (num_obstacles, 3) x, y and direction of every obstacle
+    """
+
+    grid: np.ndarray
+    player: tuple
+    goal: tuple
+    helper: tuple
+    lava: tuple
+    teleporter: tuple
+    obstacles: np.ndarray
+
+
+def sidewinder(rng, rows: int, columns: int):
+    """
+    Generates a perfect maze over a lattice of cells with the sidewinder algorithm, vectorized over all rows
+    Every row is split into runs of cells connected to the right, every run except those of the first row
+    is connected upwards by one random cell.
+    @params:
+        rng => numpy Generator
+        rows, columns => size of the lattice
+    Returns two (rows, columns) bool arrays, east is True if a cell is connected to its right neighbour,
+    north if it is connected to its upper neighbour
+    """
+    east = rng.random((rows, columns)) < 0.5
+    east[0] = True
+    east[:, -1] = False
+    start = np.ones((rows, columns), dtype=np.bool_)
+    start[:, 1:] = ~east[:, :-1]
+    start = start.reshape(-1)
+    run = np.cumsum(start) - 1
+    #   the cell of every run with the highest random priority is connected upwards
+    priority = rng.random(rows * columns)
+    highest = np.maximum.reduceat(priority, np.flatnonzero(start))
+    north = (priority == highest[run]).reshape(rows, columns)
+    north[0] = False
+    return east, north
+
+
+def carve_walls(
+    rng, grid_size: int, cell_size: int, full_width: bool, loops: float = 0.0
+):
+    """
+    Creates a wall mask of cells separated by one tile thick walls, connected by a sidewinder maze
+    @params:
+        rng => numpy Generator
+        grid_size => side length of the playable grid
+        cell_size => side length of a cell in tiles
+        full_width => if True passages are as wide as the cells, else single tile doors at random positions
+        loops => probability of an additional passage between two neighbouring cells
+    Returns a (grid_size, grid_size) bool array, True for walls
+    """
+    period = cell_size + 1
+    cells = (grid_size + 1) // period
+    assert cells > 0, "Error: the grid is smaller than one cell"
+    walls = np.ones((grid_size, grid_size), dtype=np.bool_)
+    inside = np.arange(grid_size) < cells * period - 1
+    inside &= np.arange(grid_size) % period < cell_size
+    walls[np.ix_(inside, inside)] = False
+
+    east, north = sidewinder(rng, cells, cells)
+    if loops > 0:
+        east[:, :-1] |= rng.random((cells, cells - 1)) < loops
+        north[1:] |= rng.random((cells - 1, cells)) < loops
+    for passages, vertical in ((east, False), (north, True)):
+        i, j = np.nonzero(passages)
+        #   position of the passage along the wall and of the wall itself
+        if vertical:
+            along, across = j * period, i * period - 1
+        else:
+            along, across = i * period, j * period + cell_size
+        if full_width:
+            along = along[:, None] + np.arange(cell_size)
+            across = across[:, None]
+        else:
+            along = along + rng.integers(0, cell_size, size=len(along))
+        if vertical:
+            walls[across, along] = False
+        else:
+            walls[along, across] = False
+    return walls
+
+
+def generate_walls(
+    rng,
+    grid_size: int,
+    layout: str,
+    corridor_width: int = 1,
+    room_size: int = 7,
+    loops: float = None,
+):
+    """
+    Generates the walls of the playable grid
+    @params:
+        rng => numpy Generator
+        grid_size => side length of the playable grid
+        layout => one of LAYOUTS
+        corridor_width => width of the maze corridors
+        room_size => side length of the rooms
+        loops => probability of additional passages, 0.05 for mazes and 0.25 for rooms if None
+    Returns a (grid_size, grid_size) bool array, True for walls
+    """
+    assert layout in LAYOUTS, f"Error: unknown layout {layout}"
+    if layout == "maze":
+        loops = 0.05 if loops is None else loops
+        return carve_walls(rng, grid_size, corridor_width, True, loops)
+    if layout == "rooms":
+        loops = 0.25 if loops is None else loops
+        return carve_walls(rng, grid_size, room_size, False, loops)
+    return np.zeros((grid_size, grid_size), dtype=np.bool_)
+
+
+def simple_cells(free):
+    """
+    Finds the free cells whose removal keeps their free neighbours connected
+    A cell is simple if its free 4-neighbours are connected through its 8-neighbourhood. Blocking any set of
+    simple cells of which no two are 8-neighbours keeps all other free cells connected.
+    @params:
+        free => (W, W) bool array of free cells
+    Returns a (W, W) bool array
+    """
+    padded = np.pad(free, 1)
+    n, s = padded[:-2, 1:-1], padded[2:, 1:-1]
+    w, e = padded[1:-1, :-2], padded[1:-1, 2:]
+    ne, se, sw, nw = padded[:-2, 2:], padded[2:, 2:], padded[2:, :-2], padded[:-2, :-2]
+    #   number of groups of free 4-neighbours, counted at the last neighbour of every group clockwise
+    ends = np.zeros(free.shape, dtype=np.int8)
+    for edge, corner, following in ((n, ne, e), (e, se, s), (s, sw, w), (w, nw, n)):
+        ends += edge & ~(corner & following)
+    return free & ((ends == 1) | ((ends == 0) & n))
+
+
+def independent_cells(rng, candidates):
+    """
+    Selects a random subset of candidate cells of which no two are 8-neighbours
+    @params:
+        rng => numpy Generator
+        candidates => (W, W) bool array
+    Returns the flat indices of the selected cells in random order
+    """
+    priority = np.where(candidates, rng.random(candidates.shape), -1.0)
+    padded = np.pad(priority, 1, constant_values=-1.0)
+    size = candidates.shape[0]
+    highest = np.full(candidates.shape, -1.0)
+    for dx in range(3):
+        for dy in range(3):
+            if dx != 1 or dy != 1:
+                np.maximum(highest, padded[dx : dx + size, dy : dy + size], out=highest)
+    selected = np.flatnonzero(candidates & (priority > highest))
+    return rng.permutation(selected)
+
+
+def generate_level(
+    rng,
+    tables,
+    layout: str,
+    obstacles: bool = False,
+    num_obstacles: int = 0,
+    **options,
+):
+    """
+    Generates a level with a layout and places all objects in reachable cells
+    The goal and the lava are placed on independent simple cells, so neither of them cuts off any other
+    free cell. All other objects can be passed by the player and are placed on random free cells.
+    @params:
+        rng => numpy Generator
+        tables => registry.WorldTables of the grid and observation size
+        layout => one of LAYOUTS
+        obstacles => if True lava and obstacles are placed
+        num_obstacles => number of obstacles
+        options => corridor_width, room_size and loops, see generate_walls
+    Returns a Level object
+    """
+    world_size = tables.world_size
+    border = int(tables.interior[0, 0])
+    grid_size = world_size - 2 * border
+    grid = tables.walls.copy()
+    walls = generate_walls(rng, grid_size, layout, **options)
+    grid[border : border + grid_size, border : border + grid_size][walls] = 5
+    free = grid == 0
+
+    blocking = independent_cells(rng, simple_cells(free))
+    num_blocking = 2 if obstacles else 1
+    assert len(blocking) >= num_blocking, "Error: the layout has too few free cells"
+    goal, lava = blocking[0], blocking[1] if obstacles else -1
+    free.reshape(-1)[blocking[:num_blocking]] = False
+
+    num_objects = 4 + (num_obstacles if obstacles else 0)
+    cells = np.flatnonzero(free)
+    assert len(cells) >= num_objects, "Error: the layout has too few free cells"
+    player, helper, tp_1, tp_2, *others = rng.choice(
+        cells, size=num_objects, replace=False
+    )
+    directions = rng.integers(0, 4, size=len(others) + 1)
+
+    flat = grid.reshape(-1)
+    flat[goal] = 12
+    flat[helper] = 13
+    flat[[tp_1, tp_2]] = 6
+    if obstacles:
+        flat[lava] = 7
+        flat[others] = 8 + directions[1:]
+    obstacle_list = np.zeros((len(others), 3), dtype=np.int64)
+    obstacle_list[:, 0], obstacle_list[:, 1] = np.divmod(others, world_size)
+    obstacle_list[:, 2] = directions[1:]
+
+    def position(index):
+        return tuple(int(v) for v in divmod(index, world_size))
+
+    return Level(
+        grid=grid,
+        player=position(player) + (int(directions[0]),),
+        goal=position(goal),
+        helper=position(helper),
+        lava=position(lava) if obstacles else (-1, -1),
+        teleporter=position(tp_1) + position(tp_2),
+        obstacles=obstacle_list,
+    )
+
+
+def generate_levels(tables, layout: str, count: int, seed=None, **options):
+    """
+    Generates several levels of one size
+    @params:
+        tables => registry.WorldTables of the grid and observation size
+        layout => one of LAYOUTS
+        count => number of levels
+        seed => seed of the numpy Generator
+        options => obstacles, num_obstacles, corridor_width, room_size and loops, see generate_level
+    Returns a list of Level objects
+    """
+    rng = np.random.default_rng(seed)
+    return [generate_level(rng, tables, layout, **options) for _ in range(count)]
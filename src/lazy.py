@@ -0,0 +1,82 @@
+# @title:    lazy.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import numpy as np
+from .codec import encode_observation
+
+# Code
+
+
+class LazyObservation:
+    """
+    Handle of a gridworld observation that is rendered only on access
+    The handle captures the view state of the gridworld, the top left corner, the player direction and the
+    view version. It can be materialized as long as the view is unchanged, which includes all later steps
+    that do not move the view or change a tile inside it. Materializing a stale handle raises a RuntimeError.
+    """
+
+    __slots__ = ("env", "key")
+
+    def __init__(self, env):
+        """
+        Captures the current view state of a gridworld
+        @params:
+            env => the Gridworld object
+        """
+        self.env = env
+        self.key = env.get_view_state()
+
+    def is_valid(self):
+        """
+        Returns True if the captured view is still the current view of the gridworld
+        """
+        return self.env.get_view_state() == self.key
+
+    def get(self):
+        """
+        Renders the observation, served by the observation cache of the gridworld if it was rendered before
+        Returns the read-only observation image
+        """
+        if not self.is_valid():
+            raise RuntimeError(
+                "the view changed since the observation was captured, materialize it before the next step"
+            )
+        return self.env.get_observation()
+
+    def get_codes(self):
+        """
+        Returns the observation as tile codes without rendering, see codec.encode_observation
+        """
+        if not self.is_valid():
+            raise RuntimeError(
+                "the view changed since the observation was captured, materialize it before the next step"
+            )
+        return encode_observation(self.env)
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.get()
+        if dtype is not None and dtype != array.dtype:
+            return array.astype(dtype)
+        if copy:
+            return array.copy()
+        return array
+
+    @property
+    def shape(self):
+        return (self.env.obs_size, self.env.obs_size, 3)
+
+    @property
+    def dtype(self):
+        return np.dtype(np.uint8)
+
+    @property
+    def ndim(self):
+        return 3
+
+    def __len__(self):
+        return self.env.obs_size
+
+    def __getitem__(self, index):
+        return self.get()[index]
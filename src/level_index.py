@@ -0,0 +1,244 @@
+# @title:    level_index.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import argparse
+import json
+from random import Random
+import numpy as np
+from .gridworld import Gridworld
+from .registry import get_config
+from .solver import UNREACHABLE, cell_distances, level_arrays
+
+# Code
+
+#   level features stored by the index
+#       distance => forward moves from the player to the goal, UNREACHABLE if the goal can not be reached
+#       teleport_gain => forward moves saved by the teleporter, world_size ** 2 if the goal is only reachable
+#                        through it, 0 for unreachable goals
+#       obstacle_density => obstacles per cell in the rectangle spanned by the player and the goal
+#       lava_distance => forward moves from the player into the lava, UNREACHABLE without reachable lava
+FEATURES = ("distance", "teleport_gain", "obstacle_density", "lava_distance")
+
+
+def level_features(envs):
+    """
+    Computes the features of the current levels of several gridworlds in one batch
+    @params:
+        envs => list of Gridworld objects with the same world size
+    Returns a dict of (B,) arrays of the FEATURES
+    """
+    grids, teleporters, goals, _, players = level_arrays(envs)
+    n, world_size = grids.shape[0], grids.shape[1]
+    batch = np.arange(n)
+    x, y = players[:, 0], players[:, 1]
+
+    goal = cell_distances(grids, goals, teleporters)[batch, :, x, y]
+    distance = goal[:, 0]
+    without = np.where(goal[:, 1] == UNREACHABLE, world_size**2, goal[:, 1])
+    teleport_gain = np.where(distance == UNREACHABLE, 0, without - distance)
+
+    lava = np.array([(env.lava_x, env.lava_y) for env in envs], dtype=np.int64)
+    lava_distance = cell_distances(grids, lava, teleporters)[batch, 0, x, y]
+
+    #   obstacle counts of the player goal rectangles from a summed area table
+    obstacles = (grids >= 8) & (grids <= 11)
+    table = np.zeros((n, world_size + 1, world_size + 1), dtype=np.int64)
+    table[:, 1:, 1:] = obstacles.cumsum(axis=1).cumsum(axis=2)
+    low_x, high_x = np.minimum(x, goals[:, 0]), np.maximum(x, goals[:, 0]) + 1
+    low_y, high_y = np.minimum(y, goals[:, 1]), np.maximum(y, goals[:, 1]) + 1
+    count = (
+        table[batch, high_x, high_y]
+        - table[batch, low_x, high_y]
+        - table[batch, high_x, low_y]
+        + table[batch, low_x, low_y]
+    )
+    obstacle_density = count / ((high_x - low_x) * (high_y - low_y))
+
+    return {
+        "distance": distance.astype(np.int64),
+        "teleport_gain": teleport_gain.astype(np.int64),
+        "obstacle_density": obstacle_density,
+        "lava_distance": lava_distance.astype(np.int64),
+    }
+
+
+class LevelIndex:
+    """
+    Offline index of the levels of one config by seed
+    The first level of Gridworld(**config, seed=seed), which is also the level of reset(seed=seed), is
+    identified by its seed. For every feature the seeds of all levels and of the solvable levels are stored
+    sorted by the feature value, so seeds within a value range or a difficulty bucket are sampled with a
+    binary search. Indexed levels are generated without level filter.
+    """
+
+    def __init__(self, config: dict, seeds, features: dict):
+        """
+        Initializes a level index
+        @params:
+            config => Gridworld constructor arguments without seed, level filter and frame stacking
+            seeds => (n,) indexed seeds
+            features => dict of (n,) arrays of the FEATURES, in the order of seeds
+        """
+        self.config = config
+        self.seeds = np.asarray(seeds, dtype=np.int64)
+        self.features = features
+        #   (feature, solvable) => feature values and seeds sorted by the feature values
+        self.sorted = {}
+        solvable = features["distance"] != UNREACHABLE
+        for name, values in features.items():
+            for mask, key in ((slice(None), False), (solvable, True)):
+                order = np.argsort(values[mask], kind="stable")
+                self.sorted[name, key] = values[mask][order], self.seeds[mask][order]
+        self.buckets = {}
+
+    def __len__(self):
+        return len(self.seeds)
+
+    @staticmethod
+    def build(environment, seeds, batch_size: int = 256):
+        """
+        Scans the levels of a config
+        @params:
+            environment => environment id, EnvConfig or dict of its fields, see registry.get_config
+            seeds => iterable of the seeds to index
+            batch_size => number of levels whose features are computed in one batch
+        Returns a LevelIndex object
+        """
+        config = get_config(environment).as_dict()
+        seeds = np.fromiter(seeds, dtype=np.int64)
+        envs = [Gridworld(**config, seed=0) for _ in range(min(batch_size, len(seeds)))]
+        columns = {name: [] for name in FEATURES}
+        for start in range(0, len(seeds), batch_size):
+            chunk = seeds[start : start + batch_size]
+            for env, seed in zip(envs, chunk.tolist()):
+                env.rng.seed(seed)
+                env.init_level()
+            features = level_features(envs[: len(chunk)])
+            for name in FEATURES:
+                columns[name].append(features[name])
+        features = {
+            name: np.concatenate(column) if column else np.zeros(0)
+            for name, column in columns.items()
+        }
+        return LevelIndex(config, seeds, features)
+
+    def save(self, path: str):
+        """
+        Stores the index as npz file
+        """
+        np.savez(
+            path,
+            config=json.dumps(self.config),
+            seeds=self.seeds,
+            **{"feature_" + name: values for name, values in self.features.items()},
+        )
+
+    @staticmethod
+    def load(path: str):
+        """
+        Loads an index stored by save
+        Returns a LevelIndex object
+        """
+        with np.load(path) as data:
+            features = {
+                name[len("feature_") :]: data[name]
+                for name in data.files
+                if name.startswith("feature_")
+            }
+            return LevelIndex(json.loads(str(data["config"])), data["seeds"], features)
+
+    def count(self, feature: str, low, high, solvable: bool = True):
+        """
+        Returns the number of levels with low <= feature <= high
+        """
+        values, _ = self.sorted[feature, solvable]
+        return int(
+            np.searchsorted(values, high, side="right")
+            - np.searchsorted(values, low, side="left")
+        )
+
+    def sample(self, feature: str, low, high, rng=None, solvable: bool = True):
+        """
+        Draws the seed of a random level with low <= feature <= high in O(log n)
+        @params:
+            feature => one of FEATURES
+            low, high => inclusive feature range
+            rng => random.Random used for the draw, a new one if None
+            solvable => if True only levels with a reachable goal are drawn
+        Returns the seed
+        Raises a ValueError if no level lies within the range
+        """
+        values, seeds = self.sorted[feature, solvable]
+        start = np.searchsorted(values, low, side="left")
+        end = np.searchsorted(values, high, side="right")
+        if start >= end:
+            raise ValueError(f"no indexed level with {low} <= {feature} <= {high}")
+        rng = rng or Random()
+        return int(seeds[rng.randrange(start, end)])
+
+    def bucket_bounds(self, feature: str, num_buckets: int):
+        """
+        Splits the solvable levels into buckets of about equal size by a feature, computed once per split
+        @params:
+            feature => one of FEATURES
+            num_buckets => number of buckets
+        Returns a list of inclusive (low, high) feature ranges, from low to high feature values,
+        levels with a value on a bucket bound belong to both buckets
+        """
+        key = (feature, num_buckets)
+        if key not in self.buckets:
+            values, _ = self.sorted[feature, True]
+            assert len(values), "Error: no solvable level indexed"
+            edges = np.linspace(0, len(values), num_buckets + 1).astype(np.int64)
+            self.buckets[key] = [
+                (
+                    values[min(start, len(values) - 1)].item(),
+                    values[max(end - 1, 0)].item(),
+                )
+                for start, end in zip(edges[:-1], edges[1:])
+            ]
+        return self.buckets[key]
+
+    def sample_bucket(self, feature: str, bucket: int, num_buckets: int, rng=None):
+        """
+        Draws the seed of a random solvable level of a difficulty bucket
+        @params:
+            feature => one of FEATURES
+            bucket => index of the bucket, 0 for the lowest feature values
+            num_buckets => number of buckets, see bucket_bounds
+            rng => random.Random used for the draw, a new one if None
+        Returns the seed
+        """
+        low, high = self.bucket_bounds(feature, num_buckets)[bucket]
+        return self.sample(feature, low, high, rng)
+
+    def reset(self, env: Gridworld, feature: str, low, high, rng=None):
+        """
+        Resets a gridworld of the indexed config to a random level with low <= feature <= high
+        Returns the observation of the new level
+        """
+        config = env.get_config()
+        assert all(
+            config[name] == value for name, value in self.config.items()
+        ), "Error: the gridworld does not match the index"
+        assert env.level_filter is None, "Error: indexed levels are not filtered"
+        return env.reset(seed=self.sample(feature, low, high, rng))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Indexes the levels of a config")
+    parser.add_argument("environment", help="environment id")
+    parser.add_argument("output", help="path of the npz index")
+    parser.add_argument("--seeds", type=int, default=100000, help="number of seeds")
+    parser.add_argument("--first-seed", type=int, default=0, help="first seed")
+    parser.add_argument("--batch-size", type=int, default=256, help="levels per batch")
+    args = parser.parse_args()
+    index = LevelIndex.build(
+        args.environment,
+        range(args.first_seed, args.first_seed + args.seeds),
+        args.batch_size,
+    )
+    index.save(args.output)
+    print(f"indexed {len(index)} levels of {args.environment} in {args.output}")
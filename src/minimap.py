@@ -0,0 +1,85 @@
+# @title:    minimap.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import numpy as np
+from numpy import uint8
+from .codec import DIRECTION_SHIFT, ROTATIONS, VISION_BIT, get_atlas
+
+# Code
+
+#   minimap resolutions
+#       ids => one object id per tile, (world_size, world_size) uint8
+#       pixels => one pixel per tile, the block average of the sprite, (world_size, world_size, 3) uint8
+MINIMAP_MODES = ("ids", "pixels")
+
+#   fog of war masks, hidden cells are set to FOG_CODE
+#       seen => cells that were inside the observation of the player in the current episode
+#       visited => cells the player stood on in the current episode
+FOG_MODES = ("seen", "visited")
+
+#   object id 15 has no sprite and decodes to black
+FOG_CODE = 15
+
+
+def world_codes(env):
+    """
+    Encodes all tiles of a gridworld in one pass over the map
+    @params:
+        env => the Gridworld object
+    Returns a (world_size, world_size) uint8 array of tile codes without direction, the codes of Gridworld.render
+    """
+    size = env.world_size
+    return np.fromiter(
+        (
+            tile.object_id | (tile.vision << VISION_BIT)
+            for row in env.world
+            for tile in row
+        ),
+        dtype=uint8,
+        count=size * size,
+    ).reshape(size, size)
+
+
+def update_fog(env):
+    """
+    Adds the current observation or player cell to the explored cells of a gridworld
+    """
+    if env.fog_of_war == "seen":
+        size = env.observation_size
+        env.explored[
+            env.top_left_x : env.top_left_x + size,
+            env.top_left_y : env.top_left_y + size,
+        ] = True
+    else:
+        env.explored[env.player_x, env.player_y] = True
+
+
+def combined_observation(env):
+    """
+    Builds the egocentric observation and the minimap of a gridworld from one encoding of the map
+    The view is cropped from the map codes and decoded like codec.decode_observations, so it equals
+    Gridworld.get_observation. The minimap keeps the vision highlight of Gridworld.render.
+    @params:
+        env => the Gridworld object, env.minimap one of MINIMAP_MODES, env.fog_of_war one of FOG_MODES or None
+    Returns a dict with
+        view => (obs_size, obs_size, 3) uint8 observation image
+        minimap => (world_size, world_size) object ids or (world_size, world_size, 3) pixels
+    """
+    codes = world_codes(env)
+    size = env.observation_size
+    view = codes[
+        env.top_left_x : env.top_left_x + size, env.top_left_y : env.top_left_y + size
+    ] | uint8(env.player_direction << DIRECTION_SHIFT)
+    view = get_atlas(8)[np.rot90(view, ROTATIONS[env.player_direction])]
+    view = view.swapaxes(1, 2).reshape(size * 8, size * 8, 3)
+
+    if env.fog_of_war is not None:
+        update_fog(env)
+        codes[~env.explored] = FOG_CODE
+    if env.minimap == "ids":
+        minimap = codes & uint8((1 << VISION_BIT) - 1)
+    else:
+        minimap = get_atlas(1)[codes].reshape(env.world_size, env.world_size, 3)
+    return {"view": view, "minimap": minimap}
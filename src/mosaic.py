@@ -0,0 +1,161 @@
+# @title:    mosaic.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import math
+import numpy as np
+from numpy import uint8
+from .batched import BatchedGridworld, GridworldGroup
+from .codec import VISION_BIT, encode_observation, get_atlas
+
+# Code
+
+#   code of the background between and around the cells, object id 15 has no sprite and decodes to black
+BACKGROUND_CODE = 15
+
+
+def map_codes(grid, player_x, player_y, player_direction, offset_x, offset_y):
+    """
+    Encodes whole maps with the vision highlight of the current observations
+    @params:
+        grid => (B, W, W) object ids
+        player_x, player_y, player_direction => (B,) player states
+        offset_x, offset_y => observation cell offsets of the observation size, see registry.view_offsets
+    Returns a (B, W, W) uint8 array of tile codes, the codes of Gridworld.render
+    """
+    codes = np.array(grid, dtype=uint8)
+    rows = np.arange(len(codes))[:, None]
+    x = player_x[:, None] + offset_x[player_direction]
+    y = player_y[:, None] + offset_y[player_direction]
+    codes[rows, x, y] |= 1 << VISION_BIT
+    return codes
+
+
+def group_codes(group: GridworldGroup, view: bool):
+    """
+    Returns the (n, S, S) map or observation codes of a group
+    """
+    if view:
+        size = group.observation_size
+        return group.get_observations().reshape(-1, size, size)
+    return map_codes(
+        group.grid,
+        group.player_x,
+        group.player_y,
+        group.player_direction,
+        group.offset_x,
+        group.offset_y,
+    )
+
+
+def gridworld_codes(env, view: bool):
+    """
+    Returns the (S, S) map or observation codes of a Gridworld
+    """
+    if view:
+        size = env.observation_size
+        return encode_observation(env).reshape(size, size)
+    codes = env.get_object_grid()
+    size = env.observation_size
+    codes[
+        env.top_left_x : env.top_left_x + size, env.top_left_y : env.top_left_y + size
+    ] |= (1 << VISION_BIT)
+    return codes
+
+
+def collect_codes(source, view: bool = False):
+    """
+    Collects the codes of all environments of a source
+    @params:
+        source => list of Gridworld objects, a GridworldGroup or a BatchedGridworld
+        view => if True the egocentric observations, else the whole maps
+    Returns a list of (env_ids, (n, S, S) codes) tuples, the sizes S may differ between the entries
+    """
+    if isinstance(source, GridworldGroup):
+        return [(np.arange(source.size), group_codes(source, view))]
+    if isinstance(source, BatchedGridworld):
+        return [
+            (env_ids, group_codes(group, view))
+            for group, env_ids in zip(source.groups, source.env_ids)
+        ]
+    return [
+        (np.array([env_id]), gridworld_codes(env, view)[None])
+        for env_id, env in enumerate(source)
+    ]
+
+
+def mosaic_layout(count: int, cell_size: int, columns: int = None, padding: int = 1):
+    """
+    Computes the arrangement of a mosaic
+    @params:
+        count => number of cells
+        cell_size => side length of a cell in tiles
+        columns => number of cells per row, about square if None
+        padding => background tiles between the cells
+    Returns the number of rows and columns and the size of the mosaic in tiles
+    """
+    columns = columns or max(1, math.ceil(math.sqrt(count)))
+    rows = max(1, math.ceil(count / columns))
+    period = cell_size + padding
+    return rows, columns, (rows * period - padding, columns * period - padding)
+
+
+def render_mosaic(
+    source,
+    view: bool = False,
+    columns: int = None,
+    tile_size: int = 8,
+    padding: int = 1,
+    out=None,
+):
+    """
+    Renders the maps or observations of many environments into one image
+    The codes of all environments are arranged on one code canvas first, the canvas is then decoded in a
+    single atlas lookup. Smaller maps are aligned top left, the rest of their cell stays black.
+    @params:
+        source => list of Gridworld objects, a GridworldGroup or a BatchedGridworld
+        view => if True the egocentric observations, else the whole maps as rendered by Gridworld.render
+        columns => number of environments per row, about square if None
+        tile_size => side length of a tile in pixels, below 8 for downscaling, see codec.get_atlas
+        padding => background tiles between two environments
+        out => optional preallocated uint8 image with the shape of mosaic_shape
+    Returns the (height, width, 3) uint8 mosaic, environment i in row i // columns and column i % columns
+    """
+    entries = collect_codes(source, view)
+    count = sum(len(env_ids) for env_ids, _ in entries)
+    cell_size = max(codes.shape[-1] for _, codes in entries)
+    rows, columns, (height, width) = mosaic_layout(count, cell_size, columns, padding)
+    period = cell_size + padding
+
+    canvas = np.full((rows * period, columns * period), BACKGROUND_CODE, dtype=uint8)
+    cells = canvas.reshape(rows, period, columns, period)
+    for env_ids, codes in entries:
+        size = codes.shape[-1]
+        cells[env_ids // columns, :size, env_ids % columns, :size] = codes
+    canvas = canvas[:height, :width]
+
+    if out is None:
+        out = np.empty((height * tile_size, width * tile_size, 3), dtype=uint8)
+    out.reshape(height, tile_size, width, tile_size, 3)[...] = get_atlas(tile_size)[
+        canvas
+    ].swapaxes(1, 2)
+    return out
+
+
+def mosaic_shape(
+    count: int,
+    cell_size: int,
+    columns: int = None,
+    tile_size: int = 8,
+    padding: int = 1,
+):
+    """
+    Returns the shape of the image of render_mosaic, for preallocating out
+    @params:
+        count => number of environments
+        cell_size => largest world size for maps, largest observation size for views
+        columns, tile_size, padding => the arguments of render_mosaic
+    """
+    _, _, (height, width) = mosaic_layout(count, cell_size, columns, padding)
+    return height * tile_size, width * tile_size, 3
@@ -0,0 +1,255 @@
+# @title:    multiplayer.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import numpy as np
+from numpy import uint8
+from .gridworld import Gridworld
+from .batched import INFO_FIELDS
+from .codec import DIRECTION_SHIFT, VISION_BIT, decode_observations
+from .registry import get_reward_table
+from .solver import DIRECTION_X, DIRECTION_Y, TURN_LEFT, TURN_RIGHT
+
+# Code
+
+#   Info fields of every player, the Info fields of a Gridworld and the number of blocked moves into other players
+PLAYER_FIELDS = dict(INFO_FIELDS, players_hit=np.int64)
+
+
+class MultiGridworld:
+    """
+    Gridworld with several players acting in the same map
+    The map, the obstacles, the teleporter and the helper exist once and are shared by all players.
+    Levels are generated by a Gridworld, player 0 is its player, the other players are placed on
+    random empty tiles. With one player all results are identical to the Gridworld.
+
+    rules of a tick:
+        players act one after another in the order of their index, finished players do not act
+        a player moving into another player is blocked without penalty and counts players_hit
+        the teleporter and the helper are consumed by the first player using them
+        a player on the goal finishes with success, a player moving into lava or whose reward drops below zero
+        finishes without success
+        finished players leave the map at the start of the next tick, the goal stays for the others
+        after max_steps ticks all players are finished
+        the episode is done when all players are finished
+    """
+
+    def __init__(self, env: Gridworld, num_players: int = 2):
+        """
+        Initializes a multi player gridworld
+        @params:
+            env => the Gridworld object used as level generator
+            num_players => number of players
+        """
+        assert num_players > 0, "Error: at least one player is needed"
+        self.env = env
+        self.num_players = num_players
+        self.world_size = env.world_size
+        self.observation_size = env.observation_size
+        self.max_steps = env.max_steps
+        self.offset_x, self.offset_y = env.tables.offset_x, env.tables.offset_y
+        self.reward_table = get_reward_table(self.max_steps)
+        self.player_x = np.zeros(num_players, dtype=np.int64)
+        self.player_y = np.zeros(num_players, dtype=np.int64)
+        self.player_direction = np.zeros(num_players, dtype=np.int64)
+        self.finished = np.zeros(num_players, dtype=np.bool_)
+        self.on_map = np.zeros(num_players, dtype=np.bool_)
+        self.info = {
+            name: np.zeros(num_players, dtype=dtype)
+            for name, dtype in PLAYER_FIELDS.items()
+        }
+        self.load()
+
+    @staticmethod
+    def make(environment_id: str, num_players: int = 2, seed=None, level_filter=None):
+        """
+        Makes a multi player gridworld
+        @params:
+            environment_id => id of the environment, see Gridworld.make
+            num_players => number of players
+            seed => random seed, None default
+            level_filter => optional LevelFilter, None default
+        Returns a MultiGridworld object
+        """
+        env = Gridworld.make(environment_id, seed=seed, level_filter=level_filter)
+        return MultiGridworld(env, num_players)
+
+    def load(self):
+        """
+        Copies the current level of the generator, places the other players and resets the episode state
+        """
+        env = self.env
+        self.grid = env.get_object_grid()
+        self.teleport = env.teleport
+        self.player_x[0] = env.player_x
+        self.player_y[0] = env.player_y
+        self.player_direction[0] = env.player_direction
+        low, high = self.observation_size - 1, self.world_size - self.observation_size
+        for player in range(1, self.num_players):
+            while True:
+                x = env.rng.randint(low, high)
+                y = env.rng.randint(low, high)
+                if self.grid[x, y] == 0:
+                    break
+            direction = env.rng.randint(0, 3)
+            self.grid[x, y] = direction + 1
+            self.player_x[player] = x
+            self.player_y[player] = y
+            self.player_direction[player] = direction
+        self.current_steps = 0
+        self.done = False
+        self.finished[:] = False
+        self.on_map[:] = True
+        for column in self.info.values():
+            column[:] = 0
+
+    def reset(self):
+        """
+        Creates a new level
+        Returns the observation codes of all players
+        """
+        self.env.generate_level()
+        self.load()
+        return self.get_observations()
+
+    def step(self, actions):
+        """
+        Performs one tick, every unfinished player performs its action
+        @params:
+            actions => (num_players,) actions, 0 = forward, 1 = turn left, 2 = turn right
+        Returns:
+            observations => (num_players, observation_size ** 2) observation codes
+            rewards => (num_players,) rewards, non zero only in the tick a player finishes
+            dones => (num_players,) True for finished players
+            info => dict of (num_players,) arrays of the PLAYER_FIELDS
+        """
+        assert len(actions) == self.num_players, "Error: one action per player"
+        info = self.info
+        for player in np.flatnonzero(self.finished & self.on_map):
+            self.leave(player)
+        self.current_steps += 1
+        active = np.flatnonzero(~self.finished)
+        info["num_steps"][active] += 1
+        rewards = np.zeros(self.num_players)
+
+        if self.current_steps > self.max_steps:
+            self.finished[active] = True
+            info["success"][active] = False
+            info["reward"][active] = 0
+            self.done = True
+            return self.get_observations(), rewards, self.finished.copy(), info
+
+        for player in active:
+            if actions[player] == 0:
+                self.move(player)
+            else:
+                self.turn(player, actions[player])
+
+        for player in active:
+            reward = (
+                self.reward_table[self.current_steps] - info["reward_penalty"][player]
+            )
+            if reward < 0:
+                self.finished[player] = True
+                reward = 0
+            if self.finished[player]:
+                info["reward"][player] += reward
+                rewards[player] = reward
+        self.done = bool(self.finished.all())
+        return self.get_observations(), rewards, self.finished.copy(), info
+
+    def move(self, player: int):
+        """
+        Performs the forward action of a player
+        """
+        info = self.info
+        x, y = self.player_x[player], self.player_y[player]
+        direction = self.player_direction[player]
+        next_x, next_y = x + DIRECTION_X[direction], y + DIRECTION_Y[direction]
+        object_id = self.grid[next_x, next_y]
+
+        #   1, 2, 3, 4 = other player
+        if 1 <= object_id <= 4:
+            info["players_hit"][player] += 1
+            return
+
+        #   5 = wall
+        if object_id == 5:
+            info["wall_hit"][player] += 1
+            info["reward_penalty"][player] += 0.05
+            return
+
+        #   7 = lava
+        if object_id == 7:
+            info["lava_hit"][player] = True
+            info["success"][player] = False
+            info["reward_penalty"][player] += 10
+            self.finished[player] = True
+            return
+
+        #   6 = teleport, the first user removes both teleporter tiles
+        if object_id == 6:
+            tp = self.teleport
+            info["teleport"][player] = True
+            self.grid[next_x, next_y] = 0
+            if next_x == tp.x_1 and next_y == tp.y_1:
+                next_x, next_y = tp.x_2, tp.y_2
+            else:
+                next_x, next_y = tp.x_1, tp.y_1
+
+        #   8, 9, 10, 11 = obstacle
+        if 8 <= object_id <= 11:
+            info["obstacles_hit"][player] += 1
+            info["reward_penalty"][player] += 0.2
+
+        #   12 = destination
+        if object_id == 12:
+            self.finished[player] = True
+            info["success"][player] = True
+
+        #   13 = helper, the first player takes it
+        if object_id == 13:
+            info["helper_found"][player] = True
+            info["reward_penalty"][player] -= 0.1
+
+        self.grid[x, y] = 0
+        self.grid[next_x, next_y] = direction + 1
+        self.player_x[player] = next_x
+        self.player_y[player] = next_y
+
+    def turn(self, player: int, action: int):
+        """
+        Turns a player, 1 = turn left, 2 = turn right
+        """
+        direction = self.player_direction[player]
+        direction = TURN_LEFT[direction] if action == 1 else TURN_RIGHT[direction]
+        self.grid[self.player_x[player], self.player_y[player]] = direction + 1
+        self.player_direction[player] = direction
+
+    def leave(self, player: int):
+        """
+        Removes a finished player from the map, a player on the goal leaves the goal behind
+        """
+        x, y = self.player_x[player], self.player_y[player]
+        self.grid[x, y] = 12 if (x, y) == (self.env.goal_x, self.env.goal_y) else 0
+        self.on_map[player] = False
+
+    def get_observations(self):
+        """
+        Encodes the observations of all players in one call
+        Returns a (num_players, observation_size ** 2) uint8 array of tile codes
+        """
+        direction = self.player_direction
+        x = self.player_x[:, None] + self.offset_x[direction]
+        y = self.player_y[:, None] + self.offset_y[direction]
+        codes = self.grid[x, y]
+        flags = ((direction << DIRECTION_SHIFT) | (1 << VISION_BIT)).astype(uint8)
+        codes |= flags[:, None]
+        return codes
+
+    def get_rgb_observations(self):
+        """
+        Returns the RGB observations of all players as (num_players, pixels, pixels, 3) uint8 array
+        """
+        return decode_observations(self.get_observations())
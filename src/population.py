@@ -0,0 +1,488 @@
+# @title:    population.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+import numpy as np
+from .gridworld import Gridworld
+from .solver import DIRECTION_X, DIRECTION_Y, TURN_LEFT, TURN_RIGHT
+
+# Code
+
+#   object ids are one hot encoded for the cells in front, left and right of the player
+NUM_IDS = 15
+NUM_FEATURES = 3 * NUM_IDS + 1
+
+#   hyperparameters of a new member, explore multiplies each by one of EXPLORE_FACTORS
+DEFAULT_HYPERPARAMETERS = {"learning_rate": 0.5, "noise": 0.5}
+EXPLORE_FACTORS = (0.8, 1.25)
+
+#   seconds after which the lock file of a lease is considered left behind by a crashed worker
+LOCK_TIMEOUT = 10.0
+
+
+def atomic_write(path: str, data: bytes):
+    """
+    Writes a file atomically, readers see either the old or the new content
+    The data is written to a unique temporary file in the same directory and renamed onto the path.
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_json(path: str):
+    """
+    Returns the content of a json file, None if it does not exist
+    """
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+class SharedDirectory:
+    """
+    Coordination state of a population in a directory shared by all workers
+    All files are replaced atomically, members are owned through lease files created with O_EXCL, so no
+    service besides a file system with atomic rename and exclusive create is needed.
+
+    layout:
+        leases/{member}.json => owner and expiry time of the lease of a member
+        leases/{member}.lock => held while an existing lease is renewed, released or taken over
+        scores/{member}.json => last score, training step and hyperparameters of a member
+        checkpoints/{member}.npz => compressed policy parameters of a member
+        workers/{worker}.json => throughput statistics of a finished worker
+    """
+
+    def __init__(self, root: str):
+        """
+        Initializes the directory layout
+        @params:
+            root => path of the shared directory
+        """
+        self.root = root
+        for name in ("leases", "scores", "checkpoints", "workers"):
+            os.makedirs(os.path.join(root, name), exist_ok=True)
+
+    def path(self, kind: str, name, suffix: str = ".json"):
+        return os.path.join(self.root, kind, f"{name}{suffix}")
+
+    def read_lease(self, member: int):
+        """
+        Returns the lease dict of a member, None if it is not leased
+        """
+        try:
+            return read_json(self.path("leases", member))
+        except json.JSONDecodeError:
+            #   an exclusively created lease file is empty until its content is written
+            return {"owner": None, "expires": float("inf")}
+
+    @contextlib.contextmanager
+    def lock(self, member: int):
+        """
+        Holds the lock file of a member, which serializes all changes of an existing lease
+        Creating a lease where none exists needs no lock, O_EXCL decides between workers.
+        """
+        path = self.path("leases", member, ".lock")
+        while True:
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if os.path.getmtime(path) < time.time() - LOCK_TIMEOUT:
+                        os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                time.sleep(0.001)
+        try:
+            yield
+        finally:
+            os.unlink(path)
+
+    def acquire(self, member: int, owner: str, duration: float, steal: bool = True):
+        """
+        Tries to lease a member
+        @params:
+            member => id of the member
+            owner => id of the worker
+            duration => seconds until the lease expires
+            steal => if True an expired lease of another worker is taken over
+        Returns True if the worker holds the lease afterwards
+        """
+        path = self.path("leases", member)
+        lease = self.read_lease(member)
+        if lease is not None:
+            if lease["owner"] == owner:
+                return self.renew(member, owner, duration)
+            if not steal or lease["expires"] > time.time():
+                return False
+            with self.lock(member):
+                #   the lease may have been renewed or released before the lock was taken
+                lease = self.read_lease(member)
+                if lease is not None:
+                    if lease["expires"] > time.time():
+                        return False
+                    os.unlink(path)
+        try:
+            descriptor = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(descriptor, "w") as file:
+            json.dump({"owner": owner, "expires": time.time() + duration}, file)
+        return True
+
+    def renew(self, member: int, owner: str, duration: float):
+        """
+        Extends the lease of a member
+        The lease is replaced in place under the lock of the member, so the lease file exists throughout and
+        a lease taken over by another worker is never overwritten.
+        Returns False if the worker does not hold the lease anymore
+        """
+        with self.lock(member):
+            lease = self.read_lease(member)
+            if lease is None or lease["owner"] != owner:
+                return False
+            lease = {"owner": owner, "expires": time.time() + duration}
+            atomic_write(self.path("leases", member), json.dumps(lease).encode())
+        return True
+
+    def release(self, member: int, owner: str):
+        """
+        Gives up the lease of a member
+        """
+        with self.lock(member):
+            lease = self.read_lease(member)
+            if lease is not None and lease["owner"] == owner:
+                os.unlink(self.path("leases", member))
+
+    def write_score(self, member: int, record: dict):
+        atomic_write(self.path("scores", member), json.dumps(record).encode())
+
+    def read_scores(self):
+        """
+        Returns a dict mapping member ids to their score records
+        """
+        scores = {}
+        for name in os.listdir(os.path.join(self.root, "scores")):
+            if name.endswith(".json"):
+                record = read_json(os.path.join(self.root, "scores", name))
+                if record is not None:
+                    scores[int(name[: -len(".json")])] = record
+        return scores
+
+    def save_checkpoint(self, member: int, params, hyperparameters: dict, step: int):
+        """
+        Stores the float16 policy parameters, the hyperparameters and the training step of a member
+        """
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            params=params.astype(np.float16),
+            hyperparameters=json.dumps(hyperparameters),
+            step=step,
+        )
+        atomic_write(self.path("checkpoints", member, ".npz"), buffer.getvalue())
+
+    def load_checkpoint(self, member: int):
+        """
+        Returns the float64 parameters, the hyperparameters and the step of a member, None without checkpoint
+        """
+        try:
+            with np.load(self.path("checkpoints", member, ".npz")) as data:
+                return (
+                    data["params"].astype(np.float64),
+                    json.loads(str(data["hyperparameters"])),
+                    int(data["step"]),
+                )
+        except FileNotFoundError:
+            return None
+
+
+def policy_features(env):
+    """
+    Returns the one hot features of the object ids in front, left and right of the player and a bias
+    """
+    features = np.zeros(NUM_FEATURES)
+    x, y, direction = env.player_x, env.player_y, env.player_direction
+    for i, d in enumerate((direction, TURN_LEFT[direction], TURN_RIGHT[direction])):
+        object_id = env.world[x + DIRECTION_X[d]][y + DIRECTION_Y[d]].object_id
+        features[i * NUM_IDS + object_id] = 1
+    features[-1] = 1
+    return features
+
+
+def evaluate(params, env, seeds):
+    """
+    Runs one greedy episode of a linear policy per seed
+    @params:
+        params => (NUM_FEATURES, 3) weights of the action logits
+        env => Gridworld object, observations are never used
+        seeds => level seeds
+    Returns the mean episode reward and the number of steps
+    """
+    total, steps = 0.0, 0
+    for seed in seeds:
+        env.reset(seed=int(seed))
+        done = False
+        while not done:
+            action = int(np.argmax(policy_features(env) @ params))
+            _, reward, done, _ = env.step(action)
+            steps += 1
+        total += reward
+    return total / len(seeds), steps
+
+
+class PopulationWorker:
+    """
+    Worker process training a shard of a population against Gridworld.make
+    Members are linear policies trained by antithetic random search. Worker i owns the members with
+    member % num_workers == i and takes over members of other workers whose lease expired. After every
+    training round a member in the bottom exploit_fraction of all scores copies the checkpoint of a random
+    member of the top fraction (exploit) and perturbs the copied hyperparameters (explore).
+    """
+
+    def __init__(
+        self,
+        root: str,
+        worker: int,
+        num_workers: int,
+        num_members: int,
+        environment_id: str = "hardcore-10x10-random",
+        steps_per_round: int = 4,
+        episodes: int = 2,
+        exploit_fraction: float = 0.25,
+        lease_time: float = 30.0,
+    ):
+        """
+        Initializes a worker
+        @params:
+            root => path of the shared directory
+            worker => index of the worker
+            num_workers => number of workers
+            num_members => size of the population
+            environment_id => environment id passed to Gridworld.make
+            steps_per_round => random search steps of a member per round
+            episodes => episodes per evaluation of a perturbation
+            exploit_fraction => share of the population that is replaced and copied from
+            lease_time => seconds until the lease of an unresponsive worker expires
+        """
+        self.directory = SharedDirectory(root)
+        self.worker = worker
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{worker}"
+        self.num_workers = num_workers
+        self.num_members = num_members
+        self.steps_per_round = steps_per_round
+        self.episodes = episodes
+        self.exploit_fraction = exploit_fraction
+        self.lease_time = lease_time
+        self.env = Gridworld.make(environment_id, lazy_observations=True)
+        self.statistics = {
+            "members": 0,
+            "train_steps": 0,
+            "env_steps": 0,
+            "exploits": 0,
+            "explores": 0,
+            "elapsed": 0.0,
+        }
+
+    def lease_members(self):
+        """
+        Leases the own shard and expired members of other shards
+        Returns the list of leased member ids
+        """
+        leased = []
+        for member in range(self.num_members):
+            own = member % self.num_workers == self.worker
+            if own or self.directory.read_lease(member) is not None:
+                if self.directory.acquire(member, self.owner, self.lease_time):
+                    leased.append(member)
+        return leased
+
+    def train(self, member: int):
+        """
+        Trains a member for one round and stores its checkpoint and score
+        The lease is renewed before anything is written, a member leased by another worker in the meantime
+        is left untouched.
+        Returns the new score, None if the lease was lost
+        """
+        checkpoint = self.directory.load_checkpoint(member)
+        if checkpoint is None:
+            params = np.zeros((NUM_FEATURES, 3))
+            hyperparameters, step = dict(DEFAULT_HYPERPARAMETERS), 0
+        else:
+            params, hyperparameters, step = checkpoint
+        rng = np.random.default_rng([member, step])
+        noise, learning_rate = (
+            hyperparameters["noise"],
+            hyperparameters["learning_rate"],
+        )
+        for _ in range(self.steps_per_round):
+            seeds = rng.integers(0, 2**31, size=self.episodes)
+            epsilon = rng.normal(size=params.shape) * noise
+            plus, steps_plus = evaluate(params + epsilon, self.env, seeds)
+            minus, steps_minus = evaluate(params - epsilon, self.env, seeds)
+            params = params + learning_rate * (plus - minus) / (2 * noise) * epsilon
+            self.statistics["env_steps"] += steps_plus + steps_minus
+            step += 1
+        score, steps = evaluate(params, self.env, rng.integers(0, 2**31, size=8))
+        self.statistics["env_steps"] += steps
+        self.statistics["train_steps"] += self.steps_per_round
+        if not self.directory.renew(member, self.owner, self.lease_time):
+            return None
+        self.directory.save_checkpoint(member, params, hyperparameters, step)
+        self.directory.write_score(
+            member,
+            {
+                "score": score,
+                "step": step,
+                "hyperparameters": hyperparameters,
+                "owner": self.owner,
+                "time": time.time(),
+            },
+        )
+        return score
+
+    def exploit_and_explore(self, member: int, rng):
+        """
+        Replaces a member of the bottom fraction with a perturbed copy of a member of the top fraction
+        Returns True if the member was replaced, False if it was kept or its lease was lost
+        """
+        scores = self.directory.read_scores()
+        if member not in scores or len(scores) < 2:
+            return False
+        ranking = sorted(scores, key=lambda other: scores[other]["score"])
+        cut = max(1, int(len(ranking) * self.exploit_fraction))
+        if member not in ranking[:cut]:
+            return False
+        source = ranking[-cut:][rng.integers(cut)]
+        checkpoint = self.directory.load_checkpoint(source)
+        if source == member or checkpoint is None:
+            return False
+        params, hyperparameters, _ = checkpoint
+        hyperparameters = {
+            name: value * EXPLORE_FACTORS[rng.integers(len(EXPLORE_FACTORS))]
+            for name, value in hyperparameters.items()
+        }
+        _, _, step = self.directory.load_checkpoint(member)
+        if not self.directory.renew(member, self.owner, self.lease_time):
+            return False
+        self.statistics["exploits"] += 1
+        self.statistics["explores"] += 1
+        self.directory.save_checkpoint(member, params, hyperparameters, step)
+        record = dict(scores[source], hyperparameters=hyperparameters, step=step)
+        self.directory.write_score(member, dict(record, owner=self.owner))
+        return True
+
+    def run(self, rounds: int):
+        """
+        Trains the leased members for several rounds and writes the worker statistics
+        Returns the statistics dict
+        """
+        start = time.perf_counter()
+        rng = np.random.default_rng([self.worker, os.getpid()])
+        members = set()
+        for _ in range(rounds):
+            for member in self.lease_members():
+                if self.train(member) is None:
+                    members.discard(member)
+                    continue
+                members.add(member)
+                self.exploit_and_explore(member, rng)
+        for member in members:
+            self.directory.release(member, self.owner)
+        self.statistics["members"] = len(members)
+        self.statistics["elapsed"] = time.perf_counter() - start
+        atomic_write(
+            self.directory.path("workers", self.worker),
+            json.dumps(self.statistics).encode(),
+        )
+        return self.statistics
+
+
+def run_worker(root: str, worker: int, num_workers: int, rounds: int, options: dict):
+    """
+    Entry point of a worker process
+    """
+    PopulationWorker(root, worker, num_workers, **options).run(rounds)
+
+
+def run_workers(root: str, num_workers: int, rounds: int, **options):
+    """
+    Runs several worker processes on the local machine, standing in for nodes sharing the directory
+    @params:
+        root => path of the shared directory
+        num_workers => number of worker processes
+        rounds => training rounds per worker
+        options => further PopulationWorker arguments, num_members is required
+    Returns a dict with the summed worker statistics, the wall time and the throughputs per second
+    """
+    processes = [
+        multiprocessing.Process(
+            target=run_worker, args=(root, worker, num_workers, rounds, options)
+        )
+        for worker in range(num_workers)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    assert all(
+        process.exitcode == 0 for process in processes
+    ), "Error: a worker process failed"
+
+    directory = SharedDirectory(root)
+    totals = {}
+    for worker in range(num_workers):
+        for name, value in read_json(directory.path("workers", worker)).items():
+            totals[name] = totals.get(name, 0) + value
+    totals["wall_time"] = elapsed
+    for name in ("train_steps", "env_steps", "exploits"):
+        totals[name + "_per_second"] = totals[name] / elapsed
+    return totals
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    parser = argparse.ArgumentParser(
+        description="Measures the population throughput for several worker counts"
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--members", type=int, default=16, help="population size")
+    parser.add_argument("--rounds", type=int, default=3, help="rounds per worker")
+    parser.add_argument("--environment", default="hardcore-10x10-random")
+    parser.add_argument(
+        "--root", help="shared directory, a new temporary one per run if not set"
+    )
+    args = parser.parse_args()
+    for num_workers in args.workers:
+        with tempfile.TemporaryDirectory() as directory:
+            totals = run_workers(
+                args.root or directory,
+                num_workers,
+                args.rounds,
+                num_members=args.members,
+                environment_id=args.environment,
+            )
+        print(
+            f"workers {num_workers}: {totals['train_steps_per_second']:.1f} train steps/s, "
+            f"{totals['env_steps_per_second']:.0f} env steps/s, "
+            f"{totals['exploits_per_second']:.2f} exploits/s"
+        )
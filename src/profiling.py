@@ -0,0 +1,170 @@
+# @title:    profiling.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+from time import perf_counter
+
+# Code
+
+#   timed phases of a gridworld
+PHASES = (
+    "step",
+    "reset",
+    "player",
+    "obstacles",
+    "vision",
+    "observation",
+    "render",
+)
+
+#   methods of a gridworld shadowed by the profiling wrappers
+WRAPPED_METHODS = (
+    "step",
+    "reset",
+    "move_player",
+    "turn",
+    "move_obstacle",
+    "set_vision",
+    "get_observation",
+    "render",
+)
+
+#   event counters of a gridworld
+COUNTERS = (
+    "renders",
+    "observation_cache_hits",
+    "observation_cache_misses",
+)
+
+
+class StepProfiler:
+    """
+    Opt-in phase timings and event counters of a gridworld
+    attach() shadows the timed methods of one gridworld with wrappers, detach() removes them again,
+    so a gridworld without profiler runs the plain methods. Copies and pickles of a profiled gridworld
+    are not profiled, see Gridworld.__getstate__.
+    """
+
+    def __init__(self, callback=None, interval: int = 1000):
+        """
+        Initializes a profiler
+        @params:
+            callback => optional function called with a snapshot every interval steps
+            interval => number of steps between two callbacks
+        """
+        self.callback = callback
+        self.interval = interval
+        self.env = None
+        self.clear()
+
+    def clear(self):
+        """
+        Sets all timings and counters to zero
+        """
+        self.steps = 0
+        self.time = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def count(self, counter: str, n: int = 1):
+        """
+        Increases an event counter
+        @params:
+            counter => name of the counter
+            n => the increment
+        """
+        self.counters[counter] += n
+
+    def snapshot(self):
+        """
+        Returns a dict with copies of all timings and counters
+        """
+        return {
+            "steps": self.steps,
+            "time": dict(self.time),
+            "calls": dict(self.calls),
+            "counters": dict(self.counters),
+            "mean_step_time": self.time["step"] / self.steps if self.steps else 0.0,
+            "observation_cache_hit_rate": self.get_hit_rate(),
+        }
+
+    def get_hit_rate(self):
+        """
+        Returns the share of observations served from the observation cache
+        """
+        hits = self.counters["observation_cache_hits"]
+        total = hits + self.counters["observation_cache_misses"]
+        return hits / total if total else 0.0
+
+    def attach(self, env):
+        """
+        Installs the profiling wrappers on a gridworld
+        @params:
+            env => the Gridworld object to profile
+        """
+        assert self.env is None, "Error: profiler is already attached"
+        self.env = env
+        env.profiler = self
+        env.step = self._step(env.step)
+        env.reset = self._timed("reset", env.reset)
+        env.move_player = self._timed("player", env.move_player)
+        env.turn = self._timed("player", env.turn)
+        env.move_obstacle = self._timed("obstacles", env.move_obstacle)
+        env.set_vision = self._timed("vision", env.set_vision)
+        env.get_observation = self._timed("observation", env.get_observation)
+        env.render = self._rendered("render", env.render, lambda: env.world_size)
+
+    def detach(self):
+        """
+        Removes the profiling wrappers from the gridworld
+        """
+        env = self.env
+        for name in WRAPPED_METHODS:
+            del env.__dict__[name]
+        env.profiler = None
+        self.env = None
+
+    def _timed(self, phase, function):
+        """
+        Returns a wrapper adding the run time of function to a phase
+        """
+        time, calls = self.time, self.calls
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                time[phase] += perf_counter() - start
+                calls[phase] += 1
+
+        return wrapper
+
+    def _step(self, function):
+        """
+        Returns a timed step wrapper that calls the callback every interval steps
+        """
+        timed = self._timed("step", function)
+
+        def wrapper(action):
+            result = timed(action)
+            self.steps += 1
+            if self.callback is not None and self.steps % self.interval == 0:
+                self.callback(self.snapshot())
+            return result
+
+        return wrapper
+
+    def _rendered(self, phase, function, size):
+        """
+        Returns a timed wrapper that counts the tiles rendered into the image
+        """
+        counters = self.counters
+        timed = self._timed(phase, function)
+
+        def wrapper():
+            counters["renders"] += size() ** 2
+            return timed()
+
+        return wrapper
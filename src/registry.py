@@ -0,0 +1,202 @@
+# @title:    registry.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import re
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+import numpy as np
+from .codec import ROTATIONS
+
+# Code
+
+
+@dataclass(frozen=True)
+class EnvConfig:
+    """
+    Dataclass of the constructor arguments of a Gridworld without seed, level filter and frame stacking
+    """
+
+    grid_size: int = 10
+    observation_size: int = 5
+    random: bool = False
+    obstacles: bool = False
+    max_steps: int = 200
+    num_obstacles: int = 0
+    layout: str = None
+
+    def as_dict(self):
+        """
+        Returns the config as dict of Gridworld constructor arguments
+        """
+        return asdict(self)
+
+
+#   named configs, Gridworld.make looks up ids here before parsing them
+REGISTRY = {
+    "empty-10x10": EnvConfig(),
+    "empty-10x10-random": EnvConfig(random=True),
+    "hardcore-10x10-random": EnvConfig(random=True, obstacles=True, num_obstacles=3),
+}
+
+#   parametric ids, {kind}-{N}x{N}[-random[-{layout}]][-obs{K}][-o{M}][-s{S}]
+#       kind => empty or hardcore, hardcore worlds contain lava and obstacles
+#       N => grid size
+#       layout => maze or rooms, see layout.LAYOUTS, border walls only if not set
+#       K => observation size, 5 default
+#       M => number of obstacles, hardcore only, 3 default
+#       S => max steps, 200 default
+ID_PATTERN = re.compile(
+    r"(?P<kind>empty|hardcore)-(?P<rows>\d+)x(?P<columns>\d+)(?P<random>-random)?(?:-(?P<layout>maze|rooms))?"
+    r"(?:-obs(?P<observation_size>\d+))?(?:-o(?P<num_obstacles>\d+))?(?:-s(?P<max_steps>\d+))?"
+)
+
+
+def register(environment_id: str, config: EnvConfig):
+    """
+    Registers a named config
+    @params:
+        environment_id => the new environment id
+        config => the EnvConfig created by the id
+    """
+    assert environment_id not in REGISTRY, f"Error: {environment_id} already registered"
+    REGISTRY[environment_id] = config
+
+
+def parse_id(environment_id: str):
+    """
+    Parses a parametric environment id
+    Returns the EnvConfig of the id
+    Raises a ValueError if the id does not match ID_PATTERN
+    """
+    match = ID_PATTERN.fullmatch(environment_id)
+    if match is None:
+        raise ValueError(f"unknown environment id {environment_id}")
+    if match["rows"] != match["columns"]:
+        raise ValueError(f"only square grids are supported, got {environment_id}")
+    hardcore = match["kind"] == "hardcore"
+    if match["layout"] is not None and match["random"] is None:
+        raise ValueError(f"layouts need random placement, got {environment_id}")
+    if match["num_obstacles"] is not None and not hardcore:
+        raise ValueError(f"only hardcore worlds have obstacles, got {environment_id}")
+    observation_size = int(match["observation_size"] or 5)
+    if observation_size % 2 == 0:
+        raise ValueError(f"only odd observation sizes allowed, got {environment_id}")
+    return EnvConfig(
+        grid_size=int(match["rows"]),
+        observation_size=observation_size,
+        random=match["random"] is not None,
+        obstacles=hardcore,
+        max_steps=int(match["max_steps"] or 200),
+        num_obstacles=int(match["num_obstacles"] or 3) if hardcore else 0,
+        layout=match["layout"],
+    )
+
+
+def get_config(environment):
+    """
+    Resolves an environment description
+    @params:
+        environment => a registered or parametric environment id, an EnvConfig or a dict of its fields
+    Returns the EnvConfig
+    """
+    if isinstance(environment, EnvConfig):
+        return environment
+    if isinstance(environment, dict):
+        return EnvConfig(**environment)
+    if environment in REGISTRY:
+        return REGISTRY[environment]
+    return parse_id(environment)
+
+
+def view_offsets(observation_size: int):
+    """
+    Computes the map offsets of all observation cells relative to the player
+    @params:
+        observation_size => side length of the observation
+    Returns two (4, observation_size ** 2) arrays of x and y offsets indexed by player direction,
+    in the order of the rotated observation
+    """
+    size = observation_size
+    window = np.arange(size * size).reshape(size, size)
+    offset_x = np.empty(shape=(4, size * size), dtype=np.int64)
+    offset_y = np.empty(shape=(4, size * size), dtype=np.int64)
+    for direction, (corner_x, corner_y) in enumerate(view_corners(size)):
+        cells = np.rot90(window, ROTATIONS[direction]).reshape(-1)
+        offset_x[direction] = corner_x + cells // size
+        offset_y[direction] = corner_y + cells % size
+    return offset_x, offset_y
+
+
+def view_corners(observation_size: int):
+    """
+    Returns the offsets of the top left observation cell relative to the player per direction
+    """
+    size = observation_size
+    half = size // 2
+    return ((-size + 1, -half), (-half, -size + 1), (-half, 0), (0, -half))
+
+
+@dataclass(frozen=True)
+class WorldTables:
+    """
+    Dataclass of the static tables of one grid and observation size, shared by all gridworlds using them
+    All arrays are read-only.
+        world_size => side length of the map including the walls
+        walls => (world_size, world_size) uint8 object ids of an empty map, 5 on the border
+        wall_cells => tuple of the (x, y) coordinates of all border walls
+        interior => (grid_size ** 2, 2) coordinates of all playable cells in row major order
+        corners => top left observation cell relative to the player per direction
+        offset_x, offset_y => (4, observation_size ** 2) observation cell offsets, see view_offsets
+    """
+
+    world_size: int
+    walls: np.ndarray
+    wall_cells: tuple
+    interior: np.ndarray
+    corners: tuple
+    offset_x: np.ndarray
+    offset_y: np.ndarray
+
+
+@lru_cache(maxsize=None)
+def get_tables(grid_size: int, observation_size: int):
+    """
+    Returns the WorldTables of a grid and observation size, created once per size
+    @params:
+        grid_size => side length of the playable grid
+        observation_size => side length of the observation
+    """
+    border = observation_size - 1
+    world_size = grid_size + 2 * border
+    walls = np.full((world_size, world_size), 5, dtype=np.uint8)
+    walls[border : world_size - border, border : world_size - border] = 0
+    interior = np.argwhere(walls == 0)
+    offset_x, offset_y = view_offsets(observation_size)
+    tables = WorldTables(
+        world_size=world_size,
+        walls=walls,
+        wall_cells=tuple(map(tuple, np.argwhere(walls == 5).tolist())),
+        interior=interior,
+        corners=view_corners(observation_size),
+        offset_x=offset_x,
+        offset_y=offset_y,
+    )
+    for array in (walls, interior, offset_x, offset_y):
+        array.setflags(write=False)
+    return tables
+
+
+@lru_cache(maxsize=None)
+def get_reward_table(max_steps: int):
+    """
+    Returns the step dependent part of the reward, 1 - steps ** 1.5 / max_steps ** 1.5, as read-only array
+    indexed by the number of steps, index 0 is never used, created once per step limit
+    """
+    reward_table = np.array(
+        [0.0]
+        + [1 - ((steps**1.5) / (max_steps**1.5)) for steps in range(1, max_steps + 1)]
+    )
+    reward_table.setflags(write=False)
+    return reward_table
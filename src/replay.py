@@ -0,0 +1,192 @@
+# @title:    replay.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import base64
+import copy
+import json
+from dataclasses import dataclass, field
+from .gridworld import Gridworld
+from .solver import LevelFilter
+
+# Code
+
+
+@dataclass
+class EpisodeLog:
+    """
+    Dataclass for a recorded episode containing everything needed to replay it
+    """
+
+    seed: int = 0
+    config: dict = field(default_factory=dict)
+    level_filter: dict = None
+    actions: bytearray = field(default_factory=bytearray)
+
+
+class EpisodeRecorder:
+    """
+    Records the episodes of a gridworld as seed, config and action sequence
+    Every episode is started with a seed drawn from the gridworld, so each episode can be replayed on its own.
+    """
+
+    def __init__(self, env: Gridworld):
+        """
+        Initializes an episode recorder
+        @params:
+            env => the Gridworld object to record
+        """
+        self.env = env
+        self.episodes = []
+        self.current = None
+
+    def reset(self):
+        """
+        Resets the gridworld with a new episode seed and starts a new episode log
+        Returns an observation of the new map
+        """
+        seed = self.env.rng.getrandbits(32)
+        level_filter = self.env.level_filter
+        self.current = EpisodeLog(
+            seed=seed,
+            config=self.env.get_config(),
+            level_filter=None if level_filter is None else level_filter.get_config(),
+        )
+        self.episodes.append(self.current)
+        return self.env.reset(seed=seed)
+
+    def step(self, action):
+        """
+        Performs and records a step with the given action
+        @params:
+            action => the action to perform
+        Returns the same values as Gridworld.step
+        Raises a RuntimeError if no episode was started with reset
+        """
+        if self.current is None:
+            raise RuntimeError("no episode started, call reset before step")
+        self.current.actions.append(action)
+        return self.env.step(action)
+
+    def pop_episodes(self):
+        """
+        Returns all finished episode logs and removes them from the recorder
+        """
+        finished = [episode for episode in self.episodes if episode is not self.current]
+        self.episodes = [] if self.current is None else [self.current]
+        return finished
+
+
+def make_env(log: EpisodeLog):
+    """
+    Creates a gridworld at the start of a recorded episode
+    @params:
+        log => the EpisodeLog of the episode
+    Returns the Gridworld object
+    """
+    level_filter = None
+    if log.level_filter is not None:
+        level_filter = LevelFilter(**log.level_filter)
+    return Gridworld(**log.config, seed=log.seed, level_filter=level_filter)
+
+
+class ReplayEngine:
+    """
+    Regenerates observations, rewards, dones and infos of a recorded episode
+    Snapshots of the gridworld are taken every snapshot_interval steps while replaying,
+    so random access to a step only replays the steps since the closest snapshot.
+    """
+
+    def __init__(self, log: EpisodeLog, snapshot_interval: int = 32):
+        """
+        Initializes a replay engine
+        @params:
+            log => the EpisodeLog to replay
+            snapshot_interval => number of steps between two snapshots
+        """
+        assert snapshot_interval > 0, "Error: snapshot interval must be positive"
+        self.log = log
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = {0: (make_env(log), 0)}
+
+    def __len__(self):
+        return len(self.log.actions)
+
+    def __iter__(self):
+        """
+        Replays the episode from the start
+        Yields observation, reward, done and info after every step
+        """
+        env = make_env(self.log)
+        for action in self.log.actions:
+            observation, reward, done, info = env.step(action)
+            yield observation, reward, done, copy.copy(info)
+
+    def get(self, t: int):
+        """
+        Returns the state of the episode after t steps
+        @params:
+            t => number of performed steps, 0 for the state after the reset
+        Returns:
+            observation => the observation after step t as returned by step, stacked frames with frame stacking,
+                           a LazyObservation handle with lazy observations, a dict with minimaps
+            reward => the reward of step t, 0 for t = 0
+            done => True if the state is terminal
+            info => a copy of the Info object after step t
+        """
+        if not 0 <= t <= len(self):
+            raise IndexError(
+                f"step {t} out of range for an episode of {len(self)} steps"
+            )
+        start = t - t % self.snapshot_interval
+        while start not in self.snapshots:
+            start -= self.snapshot_interval
+        env, reward = self.snapshots[start]
+        env = copy.deepcopy(env)
+        for i in range(start, t):
+            _, reward, _, _ = env.step(self.log.actions[i])
+            if (i + 1) % self.snapshot_interval == 0 and i + 1 not in self.snapshots:
+                self.snapshots[i + 1] = (copy.deepcopy(env), reward)
+        observation = env.get_frames() if env.frames is not None else env.observe()
+        return observation, reward, env.done, copy.copy(env.info)
+
+
+def save_episodes(path, logs):
+    """
+    Appends episode logs to a json lines file, the actions are stored as base64 encoded bytes
+    @params:
+        path => path of the file
+        logs => list of EpisodeLog objects
+    """
+    with open(path, "a") as file:
+        for log in logs:
+            record = {
+                "seed": log.seed,
+                "config": log.config,
+                "level_filter": log.level_filter,
+                "actions": base64.b64encode(log.actions).decode("ascii"),
+            }
+            file.write(json.dumps(record) + "\n")
+
+
+def load_episodes(path):
+    """
+    Loads all episode logs of a json lines file
+    @params:
+        path => path of the file
+    Returns a list of EpisodeLog objects
+    """
+    logs = []
+    with open(path) as file:
+        for line in file:
+            record = json.loads(line)
+            logs.append(
+                EpisodeLog(
+                    seed=record["seed"],
+                    config=record["config"],
+                    level_filter=record["level_filter"],
+                    actions=bytearray(base64.b64decode(record["actions"])),
+                )
+            )
+    return logs
@@ -0,0 +1,359 @@
+# @title:    server.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import argparse
+import json
+import os
+import socket
+import struct
+import numpy as np
+from numpy import uint8
+from .batched import INFO_FIELDS, BatchedGridworld
+
+# Code
+
+#   every message starts with an opcode and the payload length
+HEADER = struct.Struct("<BI")
+
+#   opcodes of requests and replies, all numbers are little endian
+#       SPEC    request: empty
+#               reply:   json with num_envs, observation_size, frame_stack, config_ids and configs
+#       STEP    request: flags byte, num_envs uint8 actions
+#               reply:   padded observation codes, float64 rewards, bool dones, Info columns in INFO_FIELDS order
+#       RESET   request: 1 to reset all environments, else 0 followed by uint32 environment ids
+#               reply:   padded observation codes
+#       CLOSE   request: empty, closes the connection without reply
+#       ERROR   reply:   utf-8 error message
+SPEC = 1
+STEP = 2
+RESET = 3
+CLOSE = 4
+ERROR = 255
+
+#   flags of a step request
+AUTO_RESET = 1
+
+
+def receive_exactly(connection, size: int):
+    """
+    Receives a fixed number of bytes
+    @params:
+        connection => the socket
+        size => number of bytes
+    Returns a bytearray, None if the connection was closed before the first byte
+    """
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = connection.recv_into(view[received:])
+        if n == 0:
+            if received == 0:
+                return None
+            raise ConnectionError("connection closed in the middle of a message")
+        received += n
+    return buffer
+
+
+def receive_message(connection):
+    """
+    Receives one message
+    Returns the opcode and the payload, (None, None) if the connection was closed
+    """
+    header = receive_exactly(connection, HEADER.size)
+    if header is None:
+        return None, None
+    opcode, size = HEADER.unpack(header)
+    payload = receive_exactly(connection, size) if size else bytearray()
+    if payload is None:
+        raise ConnectionError("connection closed in the middle of a message")
+    return opcode, payload
+
+
+def send_message(connection, opcode: int, *parts):
+    """
+    Sends one message
+    @params:
+        connection => the socket
+        opcode => opcode of the message
+        parts => bytes like payload parts, sent back to back
+    """
+    payload = b"".join(parts)
+    connection.sendall(HEADER.pack(opcode, len(payload)) + payload)
+
+
+def create_socket(address):
+    """
+    Creates an unconnected socket for an address
+    @params:
+        address => (host, port) tuple for TCP or a path for a Unix socket
+    """
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    family = socket.AF_INET6 if ":" in address[0] else socket.AF_INET
+    return socket.socket(family, socket.SOCK_STREAM)
+
+
+class EnvServer:
+    """
+    Hosts a BatchedGridworld behind a TCP or Unix socket
+    Clients are served one after another on a persistent connection, every request steps or resets
+    the whole batch and is answered with flat arrays in a compact binary format.
+    """
+
+    def __init__(self, batch: BatchedGridworld, address=("127.0.0.1", 0)):
+        """
+        Initializes a server and binds its socket
+        @params:
+            batch => the hosted BatchedGridworld
+            address => (host, port) tuple for TCP, port 0 picks a free port, or a path for a Unix socket
+        """
+        self.batch = batch
+        self.listener = create_socket(address)
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address)
+        else:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(address)
+        self.listener.listen()
+        self.listener.settimeout(0.2)
+        self.address = self.listener.getsockname()
+        self.running = False
+        self.requests = 0
+        spec = {
+            "num_envs": batch.num_envs,
+            "observation_size": batch.observation_size,
+            "frame_stack": batch.frame_stack,
+            "config_ids": batch.config_ids.tolist(),
+            "configs": batch.configs,
+        }
+        self.spec = json.dumps(spec).encode()
+
+    def serve_forever(self):
+        """
+        Accepts and serves clients until stop is called
+        """
+        self.running = True
+        try:
+            while self.running:
+                try:
+                    connection, _ = self.listener.accept()
+                except socket.timeout:
+                    continue
+                with connection:
+                    connection.settimeout(None)
+                    if connection.family != socket.AF_UNIX:
+                        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self.handle(connection)
+        finally:
+            self.listener.close()
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.unlink(self.address)
+
+    def stop(self):
+        """
+        Stops serve_forever after the current client disconnected
+        """
+        self.running = False
+
+    def handle(self, connection):
+        """
+        Answers the requests of one client until it closes the connection
+        """
+        while self.running:
+            try:
+                opcode, payload = receive_message(connection)
+            except ConnectionError:
+                return
+            if opcode is None or opcode == CLOSE:
+                return
+            self.requests += 1
+            try:
+                reply = self.dispatch(opcode, payload)
+            except Exception as error:
+                send_message(
+                    connection, ERROR, f"{type(error).__name__}: {error}".encode()
+                )
+                continue
+            send_message(connection, opcode, *reply)
+
+    def dispatch(self, opcode: int, payload):
+        """
+        Executes a request
+        Returns the list of reply payload parts
+        """
+        batch = self.batch
+        if opcode == SPEC:
+            return [self.spec]
+        if opcode == STEP:
+            flags = payload[0]
+            actions = np.frombuffer(payload, dtype=uint8, offset=1)
+            if len(actions) != batch.num_envs or actions.max(initial=0) > 2:
+                raise ValueError(f"expected {batch.num_envs} actions in 0 - 2")
+            observations, rewards, dones, info = batch.step(actions)
+            if flags & AUTO_RESET and dones.any():
+                observations = batch.reset(np.flatnonzero(dones))
+            observations = np.ascontiguousarray(observations)
+            return [observations, rewards, dones] + [info[name] for name in INFO_FIELDS]
+        if opcode == RESET:
+            if payload[0]:
+                return [np.ascontiguousarray(batch.reset())]
+            env_ids = np.frombuffer(payload, dtype=np.uint32, offset=1)
+            if env_ids.size and env_ids.max() >= batch.num_envs:
+                raise IndexError("environment id out of range")
+            return [np.ascontiguousarray(batch.reset(env_ids))]
+        raise ValueError(f"unknown opcode {opcode}")
+
+
+class EnvClient:
+    """
+    Client of an EnvServer with the step and reset API of a BatchedGridworld
+    Requests can be pipelined with send_step and receive_step, the connection is kept open until close.
+    """
+
+    def __init__(self, address):
+        """
+        Connects to a server
+        @params:
+            address => (host, port) tuple for TCP or a path for a Unix socket
+        """
+        self.connection = create_socket(address)
+        self.connection.connect(address)
+        if not isinstance(address, str):
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        spec = json.loads(self.request(SPEC))
+        self.num_envs = spec["num_envs"]
+        self.observation_size = spec["observation_size"]
+        self.frame_stack = spec["frame_stack"]
+        self.config_ids = np.array(spec["config_ids"], dtype=np.int64)
+        self.configs = spec["configs"]
+        self.pending = 0
+
+    def request(self, opcode: int, *parts):
+        """
+        Sends a request and waits for its reply
+        Returns the reply payload
+        """
+        send_message(self.connection, opcode, *parts)
+        return self.receive(opcode)
+
+    def receive(self, opcode: int):
+        """
+        Receives the reply of a request
+        Returns the reply payload
+        Raises a RuntimeError if the server could not execute the request
+        """
+        reply, payload = receive_message(self.connection)
+        if reply is None:
+            raise ConnectionError("server closed the connection")
+        if reply == ERROR:
+            raise RuntimeError("server error: " + payload.decode())
+        assert reply == opcode, "Error: reply does not match the request"
+        return payload
+
+    def observations(self, payload, offset: int = 0):
+        """
+        Returns the padded observation codes of a reply, stacked if the server stacks frames
+        """
+        size = self.observation_size
+        shape = (self.num_envs, size, size)
+        if self.frame_stack > 1:
+            shape = (self.num_envs, self.frame_stack, size, size)
+        return np.frombuffer(
+            payload, dtype=uint8, count=int(np.prod(shape)), offset=offset
+        ).reshape(shape)
+
+    def send_step(self, actions, auto_reset: bool = False):
+        """
+        Sends a step request without waiting for the reply
+        @params:
+            actions => (num_envs,) actions
+            auto_reset => if True the server resets finished environments and returns their new observations
+        """
+        actions = np.ascontiguousarray(actions, dtype=uint8)
+        flags = AUTO_RESET if auto_reset else 0
+        send_message(self.connection, STEP, bytes((flags,)), actions)
+        self.pending += 1
+
+    def receive_step(self):
+        """
+        Receives the reply of the oldest pending step request
+        Returns the same values as BatchedGridworld.step
+        """
+        assert self.pending, "Error: no step request pending"
+        self.pending -= 1
+        payload = self.receive(STEP)
+        n = self.num_envs
+        observations = self.observations(payload)
+        offset = observations.nbytes
+        rewards = np.frombuffer(payload, dtype=np.float64, count=n, offset=offset)
+        offset += rewards.nbytes
+        dones = np.frombuffer(payload, dtype=np.bool_, count=n, offset=offset)
+        offset += dones.nbytes
+        info = {}
+        for name, dtype in INFO_FIELDS.items():
+            info[name] = np.frombuffer(payload, dtype=dtype, count=n, offset=offset)
+            offset += info[name].nbytes
+        return observations, rewards, dones, info
+
+    def step(self, actions, auto_reset: bool = False):
+        """
+        Performs one step in every hosted environment
+        @params:
+            actions => (num_envs,) actions
+            auto_reset => if True finished environments are reset in the same request
+        Returns the same values as BatchedGridworld.step
+        """
+        self.send_step(actions, auto_reset)
+        return self.receive_step()
+
+    def reset(self, env_ids=None):
+        """
+        Creates new levels
+        @params:
+            env_ids => ids of the environments to reset, all if None
+        Returns the padded observation codes of all environments
+        """
+        assert not self.pending, "Error: receive all pending steps first"
+        if env_ids is None:
+            payload = self.request(RESET, b"\x01")
+        else:
+            env_ids = np.asarray(env_ids, dtype=np.uint32)
+            payload = self.request(RESET, b"\x00", env_ids)
+        return self.observations(payload)
+
+    def close(self):
+        """
+        Closes the connection, the server continues with the next client
+        """
+        try:
+            send_message(self.connection, CLOSE)
+        finally:
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hosts gridworlds behind a socket")
+    parser.add_argument(
+        "environments", nargs="+", help="environment ids, one per environment"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="seed of the first env")
+    parser.add_argument("--host", default="127.0.0.1", help="host of the tcp socket")
+    parser.add_argument("--port", type=int, default=5555, help="port of the tcp socket")
+    parser.add_argument("--unix", help="path of a unix socket, used instead of tcp")
+    args = parser.parse_args()
+    server = EnvServer(
+        BatchedGridworld.make(args.environments, seed=args.seed),
+        args.unix or (args.host, args.port),
+    )
+    print(f"serving {server.batch.num_envs} environments on {server.address}")
+    server.serve_forever()
@@ -0,0 +1,412 @@
+# @title:    solver.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import time
+from dataclasses import dataclass
+import numpy as np
+
+# Code
+
+#   object ids a shortest path never enters: 5 = wall, 7 = lava
+BLOCKING_IDS = (5, 7)
+
+#   object ids of the obstacles, the player walks onto an obstacle and destroys it for a penalty,
+#   so obstacles only block paths with avoid_obstacles
+OBSTACLE_IDS = (8, 9, 10, 11)
+
+#   distance value of unreachable cells and states
+UNREACHABLE = -1
+
+#   internal distance of unreachable cells, small enough to add 1 without overflow
+_INF = np.int32(2**30)
+
+#   direction offsets and turns
+#       0 = up, 1 = left, 2 = right, 3 = down
+DIRECTION_X = np.array([-1, 0, 0, 1])
+DIRECTION_Y = np.array([0, -1, 1, 0])
+TURN_LEFT = np.array([1, 3, 0, 2])
+TURN_RIGHT = np.array([2, 0, 3, 1])
+
+
+@dataclass
+class DistanceFields:
+    """
+    Dataclass for the distance fields of a level
+    Both fields have the shape (2, world_size, world_size), the first index is 0 while the teleporter
+    is still available and 1 after it was used. Each entry is the number of forward moves from a cell
+    to the target, turns are not counted. Unreachable cells are UNREACHABLE.
+    """
+
+    goal: np.ndarray
+    helper: np.ndarray
+
+
+def level_arrays(envs):
+    """
+    Collects the array state of several gridworlds with the same world size
+    @params:
+        envs => list of Gridworld objects
+    Returns:
+        grids => (B, W, W) object ids
+        teleporters => (B, 4) x_1, y_1, x_2, y_2 of the teleporter, -1 if it is not available anymore
+        goals => (B, 2) goal coordinates
+        helpers => (B, 2) helper coordinates
+        players => (B, 3) player x, y and direction
+    """
+    grids = np.stack([env.get_object_grid() for env in envs])
+    teleporters = np.full((len(envs), 4), -1, dtype=np.int64)
+    for i, env in enumerate(envs):
+        tp = env.teleport
+        if grids[i, tp.x_1, tp.y_1] == 6 and grids[i, tp.x_2, tp.y_2] == 6:
+            teleporters[i] = (tp.x_1, tp.y_1, tp.x_2, tp.y_2)
+    goals = np.array([(env.goal_x, env.goal_y) for env in envs], dtype=np.int64)
+    helpers = np.array([(env.helper_x, env.helper_y) for env in envs], dtype=np.int64)
+    players = np.array(
+        [(env.player_x, env.player_y, env.player_direction) for env in envs],
+        dtype=np.int64,
+    )
+    return grids, teleporters, goals, helpers, players
+
+
+def initial_level_arrays(env):
+    """
+    Rebuilds the level of a gridworld as it was generated, independent of the steps since the last reset
+    @params:
+        env => the Gridworld object
+    Returns:
+        grids => (1, W, W) object ids with all objects at their initial positions, the player excluded
+        teleporters => (1, 4) x_1, y_1, x_2, y_2 of the teleporter
+        goals => (1, 2) goal coordinates
+        helpers => (1, 2) helper coordinates
+    """
+    grid = np.array(env.level_walls, dtype=np.uint8)
+    tp = env.teleport
+    grid[[tp.x_1, tp.x_2], [tp.y_1, tp.y_2]] = 6
+    grid[env.goal_x, env.goal_y] = 12
+    grid[env.helper_x, env.helper_y] = 13
+    if env.lava_x >= 0:
+        grid[env.lava_x, env.lava_y] = 7
+    for x, y, direction in env.level_obstacles:
+        grid[x, y] = 8 + direction
+    teleporters = np.array([[tp.x_1, tp.y_1, tp.x_2, tp.y_2]], dtype=np.int64)
+    goals = np.array([[env.goal_x, env.goal_y]], dtype=np.int64)
+    helpers = np.array([[env.helper_x, env.helper_y]], dtype=np.int64)
+    return grid[None], teleporters, goals, helpers
+
+
+def blocking_cells(grids, avoid_obstacles: bool = False):
+    """
+    Returns the bool mask of the cells a path never enters, obstacles included with avoid_obstacles
+    """
+    if avoid_obstacles:
+        return np.isin(grids, BLOCKING_IDS + OBSTACLE_IDS)
+    return np.isin(grids, BLOCKING_IDS)
+
+
+def _neighbour_min(dist):
+    """
+    Returns the minimum over the four neighbours of every cell of a (..., W, W) array
+    """
+    best = np.full_like(dist, _INF)
+    np.minimum(best[..., 1:, :], dist[..., :-1, :], out=best[..., 1:, :])
+    np.minimum(best[..., :-1, :], dist[..., 1:, :], out=best[..., :-1, :])
+    np.minimum(best[..., :, 1:], dist[..., :, :-1], out=best[..., :, 1:])
+    np.minimum(best[..., :, :-1], dist[..., :, 1:], out=best[..., :, :-1])
+    return best
+
+
+def _relax(dist, free):
+    """
+    Breadth first wavefront over a batch of grids
+    @params:
+        dist => (..., W, W) int32 start distances, all fixed cells already set
+        free => bool mask of the cells whose distance is relaxed
+    Returns the relaxed distances
+    """
+    while True:
+        relaxed = np.where(free, np.minimum(dist, _neighbour_min(dist) + 1), dist)
+        if np.array_equal(relaxed, dist):
+            return dist
+        dist = relaxed
+
+
+def _to_public(dist):
+    """
+    Replaces the internal infinity with UNREACHABLE
+    """
+    return np.where(dist >= _INF, UNREACHABLE, dist).astype(np.int32)
+
+
+def cell_distances(
+    grids, targets, teleporters, blocked=None, avoid_obstacles: bool = False
+):
+    """
+    Computes the number of forward moves from every cell to a target cell for a batch of levels
+    @params:
+        grids => (B, W, W) object ids
+        targets => (B, 2) target coordinates, -1 if the level has no target
+        teleporters => (B, 4) teleporter coordinates, -1 if not available
+        blocked => optional (B, W, W) bool mask of impassable cells, see blocking_cells if None
+        avoid_obstacles => if True obstacles are impassable, only used without blocked
+    Returns a (B, 2, W, W) int32 array, index 0 with the teleporter available and 1 after its use
+    """
+    grids = np.asarray(grids)
+    batch = np.arange(grids.shape[0])
+    if blocked is None:
+        blocked = blocking_cells(grids, avoid_obstacles)
+    has_target = targets[:, 0] >= 0
+    tx, ty = targets[has_target, 0], targets[has_target, 1]
+
+    # after the teleporter is used both teleporter tiles behave like floor
+    used = np.full(grids.shape, _INF, dtype=np.int32)
+    used[batch[has_target], tx, ty] = 0
+    free = ~blocked
+    free[batch[has_target], tx, ty] = False
+    used = _relax(used, free)
+
+    # before its use, entering one teleporter tile continues from the other one
+    unused = np.full(grids.shape, _INF, dtype=np.int32)
+    unused[batch[has_target], tx, ty] = 0
+    free = free & (grids != 6)
+    has_tp = teleporters[:, 0] >= 0
+    b = batch[has_tp]
+    x_1, y_1, x_2, y_2 = teleporters[has_tp].T
+    unused[b, x_1, y_1] = used[b, x_2, y_2]
+    unused[b, x_2, y_2] = used[b, x_1, y_1]
+    unused = _relax(unused, free)
+    # without an available teleporter both layers are identical
+    unused[~has_tp] = used[~has_tp]
+
+    return _to_public(np.stack([unused, used], axis=1))
+
+
+def distance_fields(env, avoid_obstacles: bool = False):
+    """
+    Computes the goal and helper distance fields of the level of a gridworld as it was generated
+    @params:
+        env => the Gridworld object
+        avoid_obstacles => if True obstacles are impassable
+    Returns a DistanceFields object
+    """
+    grids, teleporters, goals, helpers = initial_level_arrays(env)
+    goal = cell_distances(grids, goals, teleporters, avoid_obstacles=avoid_obstacles)
+    # the episode ends on the goal tile, so it can not be crossed on the way to the helper
+    blocked = blocking_cells(grids, avoid_obstacles) | (grids == 12)
+    helper = cell_distances(grids, helpers, teleporters, blocked)
+    return DistanceFields(goal=goal[0], helper=helper[0])
+
+
+def action_distances(grids, goals, teleporters, avoid_obstacles: bool = False):
+    """
+    Computes the minimal number of actions to reach the goal from every player state
+    @params:
+        grids => (B, W, W) object ids
+        goals => (B, 2) goal coordinates
+        teleporters => (B, 4) teleporter coordinates, -1 if not available
+        avoid_obstacles => if True obstacles are impassable
+    Returns a (B, 2, 4, W, W) int32 array indexed by teleporter used, direction, x and y,
+    the goal state itself has distance 0
+    """
+    grids = np.asarray(grids)
+    n, w = grids.shape[0], grids.shape[1]
+    batch = np.arange(n)
+    gx, gy = goals[:, 0], goals[:, 1]
+    blocked = blocking_cells(grids, avoid_obstacles)
+    teleporter = grids == 6
+
+    free = np.repeat((~blocked)[:, None, None], 2, axis=1)
+    free = np.repeat(free, 4, axis=2)
+    free[:, 0] &= ~teleporter[:, None]
+    free[batch, :, :, gx, gy] = False
+
+    dist = np.full((n, 2, 4, w, w), _INF, dtype=np.int32)
+    dist[batch, :, :, gx, gy] = 0
+
+    has_tp = teleporters[:, 0] >= 0
+    b = batch[has_tp]
+    x_1, y_1, x_2, y_2 = teleporters[has_tp].T
+
+    while True:
+        # entering a teleporter tile while it is available continues from the other tile
+        dist[b, 0, :, x_1, y_1] = dist[b, 1, :, x_2, y_2]
+        dist[b, 0, :, x_2, y_2] = dist[b, 1, :, x_1, y_1]
+
+        enter = np.full_like(dist, _INF)
+        for d in range(4):
+            sx, sy = DIRECTION_X[d], DIRECTION_Y[d]
+            target = dist[:, :, d]
+            dst = enter[:, :, d]
+            dst[..., max(0, -sx) : w - max(0, sx), max(0, -sy) : w - max(0, sy)] = (
+                target[..., max(0, sx) : w + min(0, sx), max(0, sy) : w + min(0, sy)]
+            )
+        turn = np.minimum(dist[:, :, TURN_LEFT], dist[:, :, TURN_RIGHT])
+        relaxed = np.where(free, np.minimum(dist, np.minimum(enter, turn) + 1), dist)
+        if np.array_equal(relaxed, dist):
+            break
+        dist = relaxed
+
+    return _to_public(dist)
+
+
+def solve_levels(grids, goals, teleporters, players, avoid_obstacles: bool = False):
+    """
+    Computes optimal action sequences for a batch of levels
+    @params:
+        grids => (B, W, W) object ids
+        goals => (B, 2) goal coordinates
+        teleporters => (B, 4) teleporter coordinates, -1 if not available
+        players => (B, 3) player x, y and direction
+        avoid_obstacles => if True paths never enter obstacles
+    Returns:
+        actions => (B, T) int8 actions padded with -1
+        lengths => (B,) number of actions per level, UNREACHABLE if the goal can not be reached
+    """
+    dist = action_distances(grids, goals, teleporters, avoid_obstacles)
+    n, w = dist.shape[0], dist.shape[-1]
+    batch = np.arange(n)
+    x, y, d = players[:, 0].copy(), players[:, 1].copy(), players[:, 2].copy()
+    u = (teleporters[:, 0] < 0).astype(np.int64)
+    lengths = dist[batch, u, d, x, y]
+    horizon = max(int(lengths.max(initial=0)), 0)
+    actions = np.full((n, horizon), -1, dtype=np.int8)
+
+    for t in range(horizon):
+        active = lengths > t
+        current = dist[batch, u, d, x, y]
+
+        nx = np.clip(x + DIRECTION_X[d], 0, w - 1)
+        ny = np.clip(y + DIRECTION_Y[d], 0, w - 1)
+        portal = (u == 0) & (grids[batch, nx, ny] == 6) & (teleporters[:, 0] >= 0)
+        first = portal & (nx == teleporters[:, 0]) & (ny == teleporters[:, 1])
+        px = np.where(portal, np.where(first, teleporters[:, 2], teleporters[:, 0]), nx)
+        py = np.where(portal, np.where(first, teleporters[:, 3], teleporters[:, 1]), ny)
+        pu = np.where(portal, 1, u)
+        forward = dist[batch, pu, d, px, py]
+        left = dist[batch, u, TURN_LEFT[d], x, y]
+
+        move = active & (forward == current - 1) & (forward >= 0)
+        turn_left = active & ~move & (left == current - 1) & (left >= 0)
+        turn_right = active & ~move & ~turn_left
+
+        actions[move, t] = 0
+        actions[turn_left, t] = 1
+        actions[turn_right, t] = 2
+        x = np.where(move, px, x)
+        y = np.where(move, py, y)
+        u = np.where(move, pu, u)
+        d = np.where(turn_left, TURN_LEFT[d], np.where(turn_right, TURN_RIGHT[d], d))
+
+    return actions, lengths
+
+
+def solve_batch(envs, avoid_obstacles: bool = False):
+    """
+    Computes optimal action sequences from the current state of several gridworlds
+    Obstacles are treated as static, the plans are optimal for the current obstacle positions.
+    @params:
+        envs => list of Gridworld objects with the same world size
+        avoid_obstacles => if True paths never enter obstacles
+    Returns:
+        actions => list with one int8 action array per gridworld, None if the goal is unreachable
+        lengths => (B,) number of actions per gridworld, UNREACHABLE if the goal is unreachable
+    """
+    grids, teleporters, goals, _, players = level_arrays(envs)
+    actions, lengths = solve_levels(grids, goals, teleporters, players, avoid_obstacles)
+    return [
+        actions[i, :length].copy() if length >= 0 else None
+        for i, length in enumerate(lengths)
+    ], lengths
+
+
+class LevelFilter:
+    """
+    Reachability and difficulty filter for the level generation of a gridworld
+    A level is accepted if the goal is reachable from the player and the number of forward moves
+    to the goal lies within [min_distance, max_distance]. Rejected levels are re-rolled.
+    """
+
+    def __init__(
+        self,
+        min_distance: int = 2,
+        max_distance: int = None,
+        max_attempts: int = 100,
+        avoid_obstacles: bool = False,
+    ):
+        """
+        Initializes a level filter
+        @params:
+            min_distance: int minimal number of forward moves from the player to the goal
+            max_distance: int maximal number of forward moves, None for no limit
+            max_attempts: int number of generated levels per reset, the last one is kept if none is accepted
+            avoid_obstacles: bool if True the goal has to be reachable without walking onto obstacles
+        """
+        self.min_distance = min_distance
+        self.max_distance = max_distance
+        self.max_attempts = max_attempts
+        self.avoid_obstacles = avoid_obstacles
+        self.levels = 0
+        self.checked = 0
+        self.rejected = 0
+        self.exhausted = 0
+        self.latency = 0.0
+
+    def get_config(self):
+        """
+        Returns the constructor arguments of the level filter as a dict
+        """
+        return {
+            "min_distance": self.min_distance,
+            "max_distance": self.max_distance,
+            "max_attempts": self.max_attempts,
+            "avoid_obstacles": self.avoid_obstacles,
+        }
+
+    def accept(self, env):
+        """
+        Checks a generated level with a flood fill from the goal over the object grid
+        @params:
+            env => the Gridworld object holding the level
+        Returns True if the level is accepted
+        """
+        grids, teleporters, goals, _, players = level_arrays([env])
+        goal = cell_distances(
+            grids, goals, teleporters, avoid_obstacles=self.avoid_obstacles
+        )
+        distance = goal[0, 0, players[0, 0], players[0, 1]]
+        if distance == UNREACHABLE or distance < self.min_distance:
+            return False
+        return self.max_distance is None or distance <= self.max_distance
+
+    def apply(self, env):
+        """
+        Re-rolls the level of the gridworld until it is accepted or max_attempts levels were generated
+        @params:
+            env => the Gridworld object holding a freshly generated level
+        """
+        start = time.perf_counter()
+        attempts = 1
+        accepted = self.accept(env)
+        while not accepted and attempts < self.max_attempts:
+            env.init_level()
+            attempts += 1
+            accepted = self.accept(env)
+        self.levels += 1
+        self.checked += attempts
+        self.rejected += attempts - int(accepted)
+        self.exhausted += int(not accepted)
+        self.latency += time.perf_counter() - start
+
+    def get_statistics(self):
+        """
+        Returns a dict with the rejection rate and the reset latency added by the filter
+        """
+        return {
+            "levels": self.levels,
+            "checked": self.checked,
+            "rejected": self.rejected,
+            "exhausted": self.exhausted,
+            "rejection_rate": self.rejected / self.checked if self.checked else 0.0,
+            "latency_per_reset": self.latency / self.levels if self.levels else 0.0,
+        }
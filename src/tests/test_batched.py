@@ -0,0 +1,95 @@
+# @title:    test_batched.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import dataclasses
+from random import Random
+import numpy as np
+import pytest
+from src.gridworld import Gridworld
+from src.batched import BatchedGridworld
+from src.codec import decode_observations
+from src.kernel import NUMBA_AVAILABLE
+
+# Code
+
+ENVIRONMENTS = [
+    "empty-10x10",
+    "empty-10x10-random",
+    "hardcore-10x10-random",
+    "hardcore-10x10-random",
+    {
+        "grid_size": 15,
+        "observation_size": 7,
+        "random": True,
+        "obstacles": True,
+        "max_steps": 60,
+        "num_obstacles": 8,
+    },
+    {
+        "grid_size": 6,
+        "observation_size": 3,
+        "random": True,
+        "obstacles": True,
+        "max_steps": 30,
+        "num_obstacles": 2,
+    },
+]
+
+
+def make_reference(environment, seed):
+    if isinstance(environment, str):
+        return Gridworld.make(environment, seed=seed)
+    return Gridworld(**environment, seed=seed)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "python", "numba"])
+def test_batched_matches_gridworld(backend):
+    """
+    Steps a mixed batch and the same gridworlds one by one, all results have to be identical with every backend
+    """
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    batch = BatchedGridworld.make(ENVIRONMENTS, seed=10, backend=backend)
+    references = [make_reference(env, 10 + i) for i, env in enumerate(ENVIRONMENTS)]
+    assert len(batch.groups) == 5
+    assert batch.config_ids.tolist() == [0, 1, 2, 2, 3, 4]
+    rng = Random(0)
+    for _ in range(400):
+        actions = [rng.randint(0, 2) for _ in references]
+        observations, rewards, dones, info = batch.step(actions)
+        for env_ids, codes in batch.get_group_observations():
+            for env_id, env_codes in zip(env_ids, codes):
+                reference = references[env_id]
+                observation, reward, done, reference_info = reference.step(
+                    actions[env_id]
+                )
+                assert np.array_equal(decode_observations(env_codes), observation)
+                assert rewards[env_id] == reward
+                assert dones[env_id] == done
+                for name, value in dataclasses.asdict(reference_info).items():
+                    assert info[name][env_id] == value, name
+        done_ids = np.flatnonzero(dones)
+        batch.reset(done_ids)
+        for env_id in done_ids:
+            references[env_id].reset()
+
+
+def test_batched_padding():
+    """
+    Smaller observations are padded around the player cell of the largest observation
+    """
+    batch = BatchedGridworld.make(["empty-10x10", ENVIRONMENTS[4]], seed=0)
+    observations = batch.reset()
+    assert observations.shape == (2, 7, 7)
+    view = np.zeros(shape=(7, 7), dtype=bool)
+    view[2:, 1:6] = True
+    assert (observations[0][~view] == 0).all()
+    assert (observations[0][view] >> 4 & 1).all()
+    (first_ids, first_codes), _ = batch.get_group_observations()
+    assert first_ids.tolist() == [0]
+    assert np.array_equal(observations[0][view], first_codes[0])
+    #   the player is always in the bottom center cell
+    assert 1 <= observations[0, 6, 3] & 15 <= 4
+    assert 1 <= observations[1, 6, 3] & 15 <= 4
@@ -0,0 +1,77 @@
+# @title:    test_benchmark.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import json
+import src.benchmark as benchmark
+from src.benchmark import compare, main, result
+
+# Code
+
+
+def test_compare():
+    """
+    Only results outside the tolerance in the worse direction are regressions, new results are ignored
+    """
+    baseline = {
+        "steps": result(100.0, "1/s", True),
+        "latency": result(1.0, "s", False),
+        "removed": result(1.0, "s", False),
+    }
+    within = {
+        "steps": result(81.0, "1/s", True),
+        "latency": result(1.19, "s", False),
+        "new": result(0.0, "1/s", True),
+    }
+    assert compare(within, baseline, 0.2) == []
+    better = {"steps": result(1e6, "1/s", True), "latency": result(0.0, "s", False)}
+    assert compare(better, baseline, 0.2) == []
+    worse = {"steps": result(79.0, "1/s", True), "latency": result(1.21, "s", False)}
+    regressions = compare(worse, baseline, 0.2)
+    assert [regression.split(":")[0] for regression in regressions] == [
+        "steps",
+        "latency",
+    ]
+    assert compare(worse, baseline, 0.25) == []
+
+
+def test_main_against_baseline(tmp_path, capsys):
+    """
+    A quick run writes its results and fails on a regression against a quick baseline file
+    """
+    baseline, output = tmp_path / "baseline.json", tmp_path / "results.json"
+    name = "make/empty-10x10/steps_per_second"
+    baseline.write_text(
+        json.dumps(
+            {
+                "quick": True,
+                "results": {
+                    name: result(1e12, "1/s", True),
+                    "startup/import_time": result(1e3, "s", False),
+                },
+            }
+        )
+    )
+    argv = ["--quick", "--baseline", str(baseline), "--output", str(output)]
+    assert main(argv) == 1
+    errors = capsys.readouterr().err.splitlines()
+    assert len(errors) == 1 and errors[0].startswith("Regression: " + name)
+    report = json.loads(output.read_text())
+    assert report["quick"] and report["results"][name]["value"] > 0
+
+
+def test_update_baseline(tmp_path, monkeypatch, capsys):
+    """
+    Updating stores the report as baseline, runs with another --quick setting are not compared
+    """
+    results = {"steps": result(100.0, "1/s", True)}
+    monkeypatch.setattr(benchmark, "run_benchmarks", lambda quick: dict(results))
+    baseline = tmp_path / "baseline.json"
+    assert main(["--baseline", str(baseline), "--update-baseline"]) == 0
+    assert json.loads(baseline.read_text())["results"] == results
+    results["steps"] = result(1.0, "1/s", True)
+    assert main(["--quick", "--baseline", str(baseline)]) == 0
+    assert "skipping comparison" in capsys.readouterr().err
+    assert main(["--baseline", str(baseline)]) == 1
+    assert main(["--baseline", str(baseline), "--tolerance", "1.0"]) == 0
@@ -0,0 +1,131 @@
+# @title:    test_episode_stats.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import json
+import os
+import tracemalloc
+from random import Random
+import numpy as np
+import pytest
+from src.batched import BatchedGridworld
+from src.episode_stats import FIELDS, EpisodeStatistics
+from src.helper import Info
+
+# Code
+
+
+def make_info(reward: float, num_steps: int, success: bool = True):
+    info = Info()
+    info.reward, info.num_steps, info.success = reward, num_steps, success
+    return info
+
+
+def test_record_rolling_window():
+    """
+    Means are taken over the last window episodes of every environment, nan without episodes
+    """
+    stats = EpisodeStatistics(num_envs=3, window=4)
+    for num_steps in range(10):
+        stats.record(0, make_info(num_steps / 10, num_steps, num_steps % 2 == 0))
+    stats.record(1, make_info(1.0, 7))
+    means = stats.get_means()
+    assert means["num_steps"][0] == np.mean([6, 7, 8, 9])
+    assert means["success"][0] == 0.5
+    assert means["reward"][1] == 1.0 and means["num_steps"][1] == 7
+    assert np.isnan(means["reward"][2])
+    assert stats.episodes.tolist() == [10, 1, 0]
+
+
+def test_record_batch_matches_record():
+    """
+    Recording a batch of value rows equals recording the Info objects one by one
+    """
+    single = EpisodeStatistics(num_envs=2, window=3)
+    batch = EpisodeStatistics(num_envs=2, window=3)
+    for episode in range(5):
+        infos = [make_info(0.1 * episode, episode), make_info(0.2, 10 + episode)]
+        for env_id, info in enumerate(infos):
+            single.record(env_id, info)
+        values = [[getattr(info, field) for field in FIELDS] for info in infos]
+        batch.record_batch(np.array([0, 1]), np.array(values, dtype=np.float64))
+    assert np.array_equal(single.values, batch.values)
+    assert np.array_equal(single.episodes, batch.episodes)
+
+
+def test_record_info_of_batched_gridworld():
+    """
+    The finished episodes of batched steps are recorded from the batched info dict
+    """
+    environments = ["empty-10x10-random", "hardcore-10x10-random"] * 2
+    batch = BatchedGridworld.make(environments, seed=0)
+    stats = EpisodeStatistics(num_envs=len(environments), window=8)
+    reference = EpisodeStatistics(num_envs=len(environments), window=8)
+    rng = Random(0)
+    for _ in range(300):
+        actions = [rng.randint(0, 2) for _ in environments]
+        _, _, dones, info = batch.step(actions)
+        recorded = stats.record_info(dones, info)
+        assert recorded.tolist() == np.flatnonzero(dones).tolist()
+        batch.reset(recorded)
+        for env_id in recorded:
+            values = [info[field][env_id] for field in FIELDS]
+            reference.record_batch(np.array([env_id]), np.array([values], dtype=float))
+    assert stats.episodes.sum() > 0
+    assert np.array_equal(stats.values, reference.values)
+    assert stats.get_means()["num_steps"].max() <= 201
+
+
+def test_record_info_without_dones():
+    """
+    Steps without a finished episode return the shared empty id array and allocate nothing
+    """
+    stats = EpisodeStatistics(num_envs=4, window=8)
+    dones = np.zeros(4, dtype=np.bool_)
+    info = {field: np.zeros(4) for field in FIELDS}
+    stats.record_info(dones, info)
+    tracemalloc.start()
+    for _ in range(100):
+        recorded = stats.record_info(dones, info)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert recorded is stats.no_env_ids and allocated == 0
+    assert stats.episodes.sum() == 0
+
+
+def test_histograms():
+    """
+    Values are counted into the bins of every environment, values outside the bins into the outer bins
+    """
+    stats = EpisodeStatistics(num_envs=2, window=10)
+    for num_steps in (0, 19, 20, 199, 500):
+        stats.record(0, make_info(0.0, num_steps))
+    stats.record(1, make_info(0.0, 45))
+    bins, counts = stats.get_histograms("num_steps")
+    assert len(bins) == 11 and counts.shape == (2, 10)
+    assert counts[0].tolist() == [2, 1, 0, 0, 0, 0, 0, 0, 0, 2]
+    assert counts[1].tolist() == [0, 0, 1, 0, 0, 0, 0, 0, 0, 0]
+    _, counts = stats.get_histograms("success", bins=[0, 0.5, 1])
+    assert counts.tolist() == [[0, 5], [0, 1]]
+
+
+def test_flush(tmp_path):
+    """
+    Flushing replaces the json file atomically and needs a path
+    """
+    path = str(tmp_path / "metrics.json")
+    stats = EpisodeStatistics(num_envs=2, window=4, path=path, flush_interval=0.0)
+    stats.record(0, make_info(0.5, 12))
+    with open(path) as file:
+        summary = json.load(file)
+    assert summary["episodes"] == [1, 0]
+    assert summary["means"]["num_steps"] == [12.0, None]
+    assert os.listdir(tmp_path) == ["metrics.json"]
+
+    other = str(tmp_path / "other.json")
+    stats.flush(other)
+    with open(other) as file:
+        assert json.load(file)["window"] == 4
+    with pytest.raises(ValueError):
+        EpisodeStatistics().flush()
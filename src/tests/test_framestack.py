@@ -0,0 +1,109 @@
+# @title:    test_framestack.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+from random import Random
+import numpy as np
+from src.framestack import FrameStack
+from src.gridworld import Gridworld
+from src.batched import BatchedGridworld
+
+# Code
+
+
+def test_frame_stack_wraps():
+    """
+    The stacked view always holds the last frames in order, also after the buffer wrapped
+    """
+    stack = FrameStack(4, (2,), capacity=11)
+    history = [np.zeros(2, dtype=np.uint8)] * 3 + [np.full(2, 100, dtype=np.uint8)]
+    frames = stack.reset(history[-1])
+    assert np.array_equal(frames, np.stack(history))
+    for i in range(30):
+        frame = np.full(2, i, dtype=np.uint8)
+        history.append(frame)
+        frames = stack.push(frame)
+        assert not frames.flags.writeable
+        assert np.array_equal(frames, np.stack(history[-4:]))
+        assert np.shares_memory(frames, stack.buffer)
+        assert np.array_equal(stack.get(copy=True), frames)
+        assert stack.get(copy=True).flags.c_contiguous
+    assert np.array_equal(stack.reset(history[0])[:3], np.zeros((3, 2)))
+
+
+def test_gridworld_frame_stack():
+    """
+    Stepping with frame stacking returns the last observations of a plain gridworld, reset clears them
+    """
+    env = Gridworld.make("hardcore-10x10-random", seed=4)
+    stacked = Gridworld(**dict(env.get_config(), frame_stack=4), seed=4)
+    observations = [np.zeros_like(env.get_observation())] * 3 + [env.get_observation()]
+    assert np.array_equal(stacked.get_frames(), np.stack(observations))
+    rng = Random(4)
+    for _ in range(300):
+        action = rng.randint(0, 2)
+        observation, _, done, _ = env.step(action)
+        frames, _, _, _ = stacked.step(action)
+        observations.append(observation)
+        assert frames.shape == (4, 40, 40, 3)
+        assert np.array_equal(frames, np.stack(observations[-4:]))
+        if done:
+            observations = [np.zeros_like(observation)] * 3 + [env.reset()]
+            assert np.array_equal(stacked.reset(), np.stack(observations))
+
+
+def test_batched_frame_stack():
+    """
+    Batched frame stacking matches stacking the single observations, resetting clears only the reset environments
+    """
+    environments = ["empty-10x10", "hardcore-10x10-random"] * 3
+    batch = BatchedGridworld.make(environments, seed=0)
+    stacked = BatchedGridworld.make(environments, seed=0, frame_stack=3)
+    history = [np.zeros_like(batch.observations)] * 2 + [batch.reset()]
+    assert np.array_equal(stacked.reset(), np.stack(history, axis=1))
+    rng = Random(0)
+    for _ in range(200):
+        actions = [rng.randint(0, 2) for _ in environments]
+        observations, _, dones, _ = batch.step(actions)
+        frames, _, _, _ = stacked.step(actions)
+        history.append(observations)
+        assert np.array_equal(frames, np.stack(history[-3:], axis=1))
+        if dones.any():
+            done_ids = np.flatnonzero(dones)
+            history = [frame.copy() for frame in history[-3:]]
+            for frame in history[:-1]:
+                frame[done_ids] = 0
+            history[-1] = batch.reset(done_ids)
+            frames = stacked.reset(done_ids)
+            assert np.array_equal(frames, np.stack(history, axis=1))
+
+
+def test_reset_keeps_returned_views():
+    """
+    The terminal stacked view returned by step is not changed by the following reset
+    """
+    stack = FrameStack(3, (2,), capacity=8)
+    rng = Random(1)
+    for i in range(100):
+        frames = stack.push(np.full(2, i, dtype=np.uint8))
+        expected = frames.copy()
+        if rng.random() < 0.5:
+            stack.reset(np.full(2, 255, dtype=np.uint8))
+            assert np.array_equal(frames, expected)
+
+    env = Gridworld.make("empty-10x10-random", seed=0, frame_stack=4)
+    batch = BatchedGridworld.make(["empty-10x10-random"] * 3, seed=0, frame_stack=4)
+    rng = Random(0)
+    for _ in range(200):
+        frames, _, done, _ = env.step(rng.randint(0, 2))
+        expected = frames.copy()
+        env.reset()
+        assert np.array_equal(frames, expected)
+
+        batch_frames, _, _, _ = batch.step([rng.randint(0, 2) for _ in range(3)])
+        expected = batch_frames.copy()
+        batch.reset([rng.randint(0, 2)])
+        assert np.array_equal(batch_frames, expected)
+        batch.reset()
+        assert np.array_equal(batch_frames, expected)
@@ -3,249 +3,220 @@
 # @date:     29.06.2021
 
 # Imports
+import copy
+import pytest
+from random import Random
 from src.gridworld import Gridworld
 from src.tile import Tile
 from src.helper import Obstacle
-import matplotlib.pyplot as plt
+from src.differential import (
+    GOLDEN_ENVIRONMENT_IDS,
+    DivergenceError,
+    check_trace,
+    load_golden_traces,
+    observation_hash,
+    run_differential,
+)
 
 # Code
 
+GOLDEN = load_golden_traces()
 
-class GridworldTest:
+
+class TestGridworld:
     """
-    Vision tests for the gridworld
+    Headless tests for the gridworld, renderings are compared against the golden traces
     """
 
-    def __init__(self, render_test: bool = True):
-        """
-        Performs all tests
-        @param:
-            render_test => true, if all tests including rendering should be performed
-        """
-        self.success = [0, 0]
-        self.test_render()
-        self.test_render_tile()
-        if render_test:
-            self.test_render_observation()
-            self.test_render_step()
-            self.test_render_turn_left()
-            self.test_render_turn_right()
-            self.test_render_obstacle_turn_left()
-            self.test_render_obstacle_turn_right()
-            self.test_render_obstacle_step()
-        self.test_helper()
-
-    def test_render(self):
+    @pytest.mark.parametrize("name", sorted(GOLDEN["traces"]))
+    def test_golden_trace(self, name):
         """
-        Renders all different gridworld modes
+        Renders the map and steps every gridworld mode with the recorded actions,
+        all observations, rewards, dones and infos have to match the golden trace
         """
-
-        gw = Gridworld.make("empty-10x10")
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
-
-        gw = Gridworld.make("empty-10x10-random")
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
-
-        gw = Gridworld.make("hardcore-10x10-random")
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
+        environment_id, seed = name.rsplit("/", 1)
+        env = Gridworld.make(environment_id, seed=int(seed))
+        check_trace(env, int(seed), GOLDEN["traces"][name])
 
     def test_render_tile(self):
         """
-        Renders all tiles
+        Renders all tiles with and without vision
         """
         tile = Tile()
-        print(
-            """0 = empty
-            1 = player dir up
-            2 = player dir left
-            3 = player dir right
-            4 = player dir down
-            5 = wall
-            6 = teleport
-            7 = lava
-            8 = obstacle up
-            9 = obstacle left
-            10 = obstacle right
-            11 = obstacle down
-            12 = destination
-            13 = helper
-            14 = debug"""
-        )
+        hashes = []
         for i in range(15):
             tile.set_object(i)
-            img = tile.render()
-            plt.imshow(img)
-            plt.show()
+            hashes.append(observation_hash(tile.render()))
             tile.set_vision()
-            img = tile.render()
-            plt.imshow(img)
-            plt.show()
+            hashes.append(observation_hash(tile.render()))
             tile.set_vision()
+        assert hashes == GOLDEN["tiles"]
 
-    def test_render_observation(self):
+    @pytest.mark.parametrize("action", [1, 2])
+    def test_turn(self, action):
         """
-        Renders an observation for all modes
+        Four turns in the same direction restore the player direction and observation window
         """
         gw = Gridworld.make("empty-10x10")
-        plt.imshow(gw.render())
-        plt.show()
-        plt.imshow(gw.get_observation())
-        plt.show()
-
-        gw = Gridworld.make("empty-10x10-random")
-        plt.imshow(gw.render())
-        plt.show()
-        plt.imshow(gw.get_observation())
-        plt.show()
-
-        gw = Gridworld.make("hardcore-10x10-random")
-        plt.imshow(gw.render())
-        plt.show()
-        plt.imshow(gw.get_observation())
-        plt.show()
+        start = (gw.player_direction, gw.top_left_x, gw.top_left_y)
+        observation = gw.get_observation()
+        directions = set()
+        for _ in range(4):
+            gw.step(action)
+            directions.add(gw.player_direction)
+            assert (
+                gw.world[gw.player_x][gw.player_y].object_id == gw.player_direction + 1
+            )
+        assert directions == {0, 1, 2, 3}
+        assert (gw.player_direction, gw.top_left_x, gw.top_left_y) == start
+        assert observation_hash(gw.get_observation()) == observation_hash(observation)
+
+    @pytest.mark.parametrize("move", [0, 1, 2])
+    def test_obstacle_move(self, move):
+        """
+        Moves an obstacle several times, its tile always matches its position and direction
+        """
+        gw = Gridworld.make("empty-10x10", seed=0)
+        obstacle = Obstacle()
+        obstacle.x = 10
+        obstacle.y = 10
+        obstacle.direction = 0
+        gw.obstacle_list.append(obstacle)
+        gw.world[10][10].set_object(8, obstacle)
+        for _ in range(5):
+            gw.move_obstacle(obstacle, move)
+            if obstacle.dead:
+                break
+            tile = gw.world[obstacle.x][obstacle.y]
+            assert tile.object_id == 8 + obstacle.direction
+            assert tile.object is obstacle
+        ids = [tile.object_id for row in gw.world for tile in row]
+        assert sum(8 <= i <= 11 for i in ids) == int(not obstacle.dead)
 
-    def test_render_step(self):
+    def test_helper(self):
         """
-        Performs a step in every gridworld and renders before and after
+        Tests if the helper tile works as intended
         """
         gw = Gridworld.make("empty-10x10")
-        plt.imshow(gw.render())
-        plt.show()
+        assert gw.current_reward_penalties == 0
         gw.step(0)
-        plt.imshow(gw.render())
-        plt.show()
+        assert gw.current_reward_penalties == -0.1
+        assert gw.info.helper_found
 
-        gw = Gridworld.make("empty-10x10-random")
-        plt.imshow(gw.render())
-        plt.show()
-        gw.step(0)
-        plt.imshow(gw.render())
-        plt.show()
+    def test_differential_detects_divergence(self):
+        """
+        The differential harness accepts identical engines and reports the first step of a divergence
+        """
 
-        gw = Gridworld.make("hardcore-10x10-random")
-        plt.imshow(gw.render())
-        plt.show()
-        gw.step(0)
-        plt.imshow(gw.render())
-        plt.show()
+        def make(seed):
+            return Gridworld.make("hardcore-10x10-random", seed=seed)
 
-    def test_render_turn_left(self):
+        def make_other(seed):
+            return Gridworld.make("hardcore-10x10-random", seed=seed + 1)
+
+        assert run_differential(make, make, seeds=range(3), steps=50) == 150
+        with pytest.raises(DivergenceError) as error:
+            run_differential(make, make_other, seeds=[0], steps=50)
+        assert error.value.step == 0
+        assert error.value.state_diff
+
+    def test_golden_environment_ids(self):
         """
-        Performs a turn left for every direction
+        The golden traces cover every environment id
         """
-        gw = Gridworld.make("empty-10x10")
-        plt.imshow(gw.render())
-        plt.show()
-        gw.step(1)
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
-        gw.step(1)
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
-        gw.step(1)
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
-        gw.step(1)
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
+        recorded = {name.rsplit("/", 1)[0] for name in GOLDEN["traces"]}
+        assert recorded == set(GOLDEN_ENVIRONMENT_IDS)
 
-    def test_render_turn_right(self):
+    @pytest.mark.parametrize("environment_id", GOLDEN_ENVIRONMENT_IDS)
+    def test_state_hash(self, environment_id):
         """
-        Performs a turn right for every direction
+        The incremental state hash always matches a hash computed from scratch
         """
-        gw = Gridworld.make("empty-10x10")
-        plt.imshow(gw.render())
-        plt.show()
-        gw.step(2)
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
-        gw.step(2)
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
-        gw.step(2)
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
-        gw.step(2)
-        gw.world[gw.top_left_x][gw.top_left_y].set_object(14)
-        plt.imshow(gw.render())
-        plt.show()
-
-    def test_render_obstacle_turn_left(self):
-        """
-        Turns an obstacle right and renders the before and after
-        """
-        gw = Gridworld.make("hardcore-10x10-random")
-        plt.imshow(gw.render())
-        plt.show()
-        for i in range(5):
-            gw.world[0][i].set_object(14)
-            gw.move_obstacle(gw.obstacle_list[0], 1)
-            plt.imshow(gw.render())
-            plt.show()
-
-    def test_render_obstacle_turn_right(self):
-        """
-        Turns an obstacle right and renders the before and after
-        """
-        gw = Gridworld.make("hardcore-10x10-random")
-        plt.imshow(gw.render())
-        plt.show()
-        for i in range(5):
-            gw.world[0][i].set_object(14)
-            gw.move_obstacle(gw.obstacle_list[0], 2)
-            plt.imshow(gw.render())
-            plt.show()
-
-    def test_render_obstacle_step(self):
-        """
-        Performs an obstacle step and renders the bevore and after
+        env = Gridworld.make(environment_id, seed=3)
+        rng = Random(3)
+        hashes = set()
+        for _ in range(500):
+            _, _, done, _ = env.step(rng.randint(0, 2))
+            assert env.state_hash == env.compute_state_hash()
+            if done:
+                env.reset()
+                assert env.state_hash == env.compute_state_hash()
+            hashes.add(env.state_hash)
+        assert len(hashes) > 50
+        assert 0 <= env.state_hash < 2**64
+
+    def test_state_hash_turns(self):
+        """
+        Turning around restores the state hash
         """
         gw = Gridworld.make("empty-10x10")
-        obstacle = Obstacle()
-        obstacle.x = 10
-        obstacle.y = 10
-        obstacle.direction = 0
-        gw.obstacle_list.append(obstacle)
-        gw.world[10][10].set_object(8, obstacle)
-        plt.imshow(gw.render())
-        plt.show()
-
-        for i in range(5):
-            gw.world[0][i].set_object(14)
-            gw.move_obstacle(gw.obstacle_list[0], 0)
-            plt.imshow(gw.render())
-            plt.show()
-            gw.move_obstacle(gw.obstacle_list[0], 1)
-            plt.imshow(gw.render())
-            plt.show()
+        start = gw.state_hash
+        gw.step(1)
+        assert gw.state_hash != start
+        for _ in range(3):
+            gw.step(1)
+        assert gw.state_hash == start
 
-    def test_helper(self):
+    @pytest.mark.parametrize("environment_id", GOLDEN_ENVIRONMENT_IDS)
+    def test_observation_cache(self, environment_id):
         """
-        Tests if the helper tile works as intended
+        Cached observations always match a rebuilt observation and are read-only
+        """
+        env = Gridworld.make(environment_id, seed=5)
+        env.enable_profiling()
+        rng = Random(5)
+        for _ in range(500):
+            observation, _, done, _ = env.step(rng.randint(0, 2))
+            assert not observation.flags.writeable
+            assert (observation == env.build_observation()).all()
+            if done:
+                env.reset()
+        counters = env.get_profile()["counters"]
+        assert counters["observation_cache_misses"] > 0
 
-        @returns:
-            0 if Helper correct
-            1 if Error: Reward penalty not 0
+    def test_observation_cache_wall(self):
+        """
+        Walking into a wall returns the cached observation
         """
         gw = Gridworld.make("empty-10x10")
-        if gw.current_reward_penalties > 0:
-            return 1
-        gw.step(0)
-        if gw.current_reward_penalties == -0.1:
-            return 0
-
+        gw.enable_profiling()
+        observation, _, _, _ = gw.step(1)
+        assert gw.step(0)[0] is observation
+        assert gw.step(0)[0] is observation
+        assert gw.get_profile()["counters"]["observation_cache_hits"] == 2
 
-gw_test = GridworldTest(True)
+    def test_observation_cache_outside_writes(self):
+        """
+        Turning needs no new view version, tiles written from outside invalidate the cache through
+        set_object or touch
+        """
+        gw = Gridworld.make("empty-10x10")
+        version = gw.view_version
+        for _ in range(4):
+            gw.step(1)
+        assert gw.view_version == version
+        x, y = gw.player_x - 1, gw.player_y
+        gw.set_object(x, y, 7)
+        assert (gw.get_observation() == gw.build_observation()).all()
+        gw.world[x][y].set_object(5)
+        gw.touch(x, y)
+        assert (gw.get_observation() == gw.build_observation()).all()
+
+    def test_profiled_copy(self):
+        """
+        A deep copy of a profiled gridworld steps itself and is not profiled, the original keeps its counts
+        """
+        gw = Gridworld.make("hardcore-10x10-random", seed=3)
+        profiler = gw.enable_profiling()
+        gw.step(1)
+        clone = copy.deepcopy(gw)
+        assert clone.profiler is None and clone.get_profile() is None
+        state = clone.compute_state_hash()
+        for _ in range(4):
+            clone.step(1)
+        assert profiler.steps == 1
+        assert clone.current_steps == 5 and gw.current_steps == 1
+        assert clone.state_hash == state
+        clone.enable_profiling()
+        clone.step(0)
+        assert clone.get_profile()["steps"] == 1 and profiler.steps == 1
@@ -0,0 +1,98 @@
+# @title:    test_layout.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import numpy as np
+import pytest
+from src.gridworld import Gridworld
+from src.layout import generate_level, generate_walls, simple_cells
+from src.registry import get_tables, parse_id
+from src.solver import cell_distances, level_arrays
+
+# Code
+
+
+def reachable(free, x, y):
+    """
+    Flood fills the free cells reachable from a cell
+    """
+    reached = np.zeros_like(free)
+    reached[x, y] = True
+    while True:
+        padded = np.pad(reached, 1)
+        neighbours = padded[:-2, 1:-1] | padded[2:, 1:-1]
+        neighbours |= padded[1:-1, :-2] | padded[1:-1, 2:]
+        expanded = reached | (neighbours & free)
+        if np.array_equal(expanded, reached):
+            return reached
+        reached = expanded
+
+
+@pytest.mark.parametrize("layout", ["maze", "rooms"])
+def test_layouts_are_connected(layout):
+    """
+    All free cells of a layout are connected and the walls cover the interior of the map
+    """
+    rng = np.random.default_rng(0)
+    for grid_size in (7, 20, 41):
+        walls = generate_walls(rng, grid_size, layout, room_size=4)
+        assert walls.any()
+        free = ~walls
+        start = np.argwhere(free)[0]
+        assert np.array_equal(reachable(free, *start), free)
+
+
+def test_simple_cells():
+    """
+    Corridor cells are not simple, dead ends and open area cells are
+    """
+    free = np.zeros((5, 7), dtype=np.bool_)
+    free[2, 1:6] = True
+    free[1:4, 4:7] = True
+    simple = simple_cells(free)
+    assert simple[2, 1] and not simple[2, 2] and not simple[2, 3]
+    assert simple[1, 6] and simple[3, 5]
+
+
+@pytest.mark.parametrize("layout", ["empty", "maze", "rooms"])
+def test_objects_are_reachable(layout):
+    """
+    Every passable cell, the goal and the helper can be reached by the player, lava never cuts off a cell
+    """
+    rng = np.random.default_rng(1)
+    tables = get_tables(21, 5)
+    for _ in range(20):
+        level = generate_level(rng, tables, layout, True, 6)
+        grid = level.grid
+        free = ~np.isin(grid, (5, 7, 12))
+        reached = reachable(free, *level.player[:2])
+        assert reached[free].all()
+        goal_x, goal_y = level.goal
+        assert grid[level.goal] == 12 and grid[level.helper] == 13
+        assert reached[goal_x - 1 : goal_x + 2, goal_y].any() or (
+            reached[goal_x, goal_y - 1 : goal_y + 2].any()
+        )
+        assert (grid[level.obstacles[:, 0], level.obstacles[:, 1]] >= 8).all()
+
+
+def test_gridworld_layout():
+    """
+    Layout ids create reproducible gridworlds whose goal can be reached
+    """
+    assert parse_id("hardcore-64x64-random-maze-obs7").layout == "maze"
+    with pytest.raises(ValueError):
+        parse_id("empty-64x64-rooms")
+    first = Gridworld.make("empty-40x40-random-rooms", seed=3)
+    second = Gridworld.make("empty-40x40-random-rooms", seed=3)
+    assert np.array_equal(first.get_object_grid(), second.get_object_grid())
+    assert first.get_config()["layout"] == "rooms"
+    for seed in range(5):
+        env = Gridworld.make("hardcore-30x30-random-maze", seed=seed)
+        assert env.state_hash == env.compute_state_hash()
+        grids, teleporters, goals, _, players = level_arrays([env])
+        blocked = np.isin(grids, (5, 7))
+        distances = cell_distances(grids, goals, teleporters, blocked)
+        assert distances[0, 0, players[0, 0], players[0, 1]] >= 0
+        for _ in range(20):
+            env.step(seed % 3)
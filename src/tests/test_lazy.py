@@ -0,0 +1,55 @@
+# @title:    test_lazy.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+from random import Random
+import numpy as np
+import pytest
+from src.codec import encode_observation
+from src.gridworld import Gridworld
+from src.lazy import LazyObservation
+
+# Code
+
+
+def test_lazy_matches_eager():
+    """
+    Materialized handles equal the observations of an eager gridworld, ignored handles are never rendered
+    """
+    eager = Gridworld.make("hardcore-10x10-random", seed=7)
+    lazy = Gridworld.make("hardcore-10x10-random", seed=7, lazy_observations=True)
+    profiler = lazy.enable_profiling()
+    rng = Random(0)
+    for t in range(100):
+        action = rng.randint(0, 2)
+        expected, reward, done, _ = eager.step(action)
+        handle, lazy_reward, lazy_done, _ = lazy.step(action)
+        assert isinstance(handle, LazyObservation)
+        assert (reward, done) == (lazy_reward, lazy_done)
+        if t % 10 == 0:
+            assert handle.shape == expected.shape
+            assert np.array_equal(np.asarray(handle), expected)
+            assert np.array_equal(handle.get_codes(), encode_observation(eager))
+        if done:
+            assert np.array_equal(np.asarray(lazy.reset()), eager.reset())
+    assert profiler.counters["observation_cache_misses"] < 20
+
+
+def test_stale_handles():
+    """
+    A handle stays valid while the view is unchanged and raises after the view changed
+    """
+    env = Gridworld.make("empty-10x10", lazy_observations=True)
+    handle = env.reset()
+    turned = env.step(1)[0]
+    assert turned.is_valid() and not handle.is_valid()
+    with pytest.raises(RuntimeError):
+        np.asarray(handle)
+    #   the player faces the border wall after turning left, bumping into it keeps the view
+    bumped, _, _, info = env.step(0)
+    assert info.wall_hit == 1
+    assert turned.is_valid() and bumped.is_valid()
+    assert np.asarray(turned) is np.asarray(bumped)
+    with pytest.raises(AssertionError):
+        Gridworld.make("empty-10x10", frame_stack=2, lazy_observations=True)
@@ -0,0 +1,78 @@
+# @title:    test_level_index.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import os
+import tempfile
+from random import Random
+import numpy as np
+import pytest
+from src.gridworld import Gridworld
+from src.level_index import FEATURES, LevelIndex
+
+# Code
+
+
+@pytest.fixture(scope="module")
+def index():
+    return LevelIndex.build("hardcore-10x10-random", range(300), batch_size=64)
+
+
+def test_features_match_levels(index):
+    """
+    Indexed features describe the level created by the seed
+    """
+    for i in range(0, 300, 37):
+        env = Gridworld.make("hardcore-10x10-random", seed=int(index.seeds[i]))
+        assert index.features["distance"][i] == env.get_goal_distance()
+        fields = env.get_distance_fields()
+        without = fields.goal[1, env.player_x, env.player_y]
+        if without >= 0 and env.get_goal_distance() >= 0:
+            assert (
+                index.features["teleport_gain"][i] == without - env.get_goal_distance()
+            )
+
+
+def test_sample_by_range_and_bucket(index):
+    """
+    Sampled seeds lie within the requested range, buckets cover all solvable levels from easy to hard
+    """
+    rng = Random(0)
+    for _ in range(50):
+        seed = index.sample("distance", 5, 8, rng)
+        assert (
+            5
+            <= Gridworld.make("hardcore-10x10-random", seed=seed).get_goal_distance()
+            <= 8
+        )
+    with pytest.raises(ValueError):
+        index.sample("distance", 1000, 2000)
+    bounds = index.bucket_bounds("distance", 4)
+    assert bounds == sorted(bounds)
+    assert (
+        sum(index.count("distance", *bound) for bound in bounds)
+        >= len(index) - (index.features["distance"] < 0).sum()
+    )
+    low, high = index.bucket_bounds("lava_distance", 3)[0]
+    seed = index.sample_bucket("lava_distance", 0, 3, rng)
+    position = np.flatnonzero(index.seeds == seed)[0]
+    assert low <= index.features["lava_distance"][position] <= high
+    assert index.features["distance"][position] >= 0
+
+
+def test_save_load_and_reset(index):
+    """
+    A stored index is loaded unchanged and resets a gridworld to an indexed level
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.npz")
+        index.save(path)
+        loaded = LevelIndex.load(path)
+    assert loaded.config == index.config
+    assert np.array_equal(loaded.seeds, index.seeds)
+    for name in FEATURES:
+        assert np.array_equal(loaded.features[name], index.features[name])
+    env = Gridworld.make("hardcore-10x10-random", seed=0)
+    loaded.reset(env, "distance", 10, 12, Random(1))
+    assert 10 <= env.get_goal_distance() <= 12
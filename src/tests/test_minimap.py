@@ -0,0 +1,93 @@
+# @title:    test_minimap.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+from random import Random
+import numpy as np
+import pytest
+from src.gridworld import Gridworld
+from src.minimap import FOG_CODE
+
+# Code
+
+
+@pytest.mark.parametrize(
+    "environment_id", ["hardcore-10x10-random", "hardcore-20x20-random-rooms-obs7-o8"]
+)
+@pytest.mark.parametrize("minimap", ["ids", "pixels"])
+def test_minimap_matches_render(environment_id, minimap):
+    """
+    The view equals get_observation, the minimap the object grid or the block average of render
+    """
+    reference = Gridworld.make(environment_id, seed=3)
+    env = Gridworld.make(environment_id, seed=3, minimap=minimap)
+    size = env.world_size
+    observation = env.reset(seed=5)
+    reference.reset(seed=5)
+    rng = Random(0)
+    for _ in range(200):
+        assert np.array_equal(observation["view"], reference.get_observation())
+        if minimap == "ids":
+            expected = reference.get_object_grid()
+        else:
+            expected = reference.render().reshape(size, 8, size, 8, 3)
+            expected = expected.mean(axis=(1, 3)).round().astype(np.uint8)
+        assert np.array_equal(observation["minimap"], expected)
+        action = rng.randint(0, 2)
+        observation, reward, done, _ = env.step(action)
+        assert (reward, done) == reference.step(action)[1:3]
+        if done:
+            observation = env.reset()
+            reference.reset()
+
+
+def test_fog_of_war():
+    """
+    Only cells inside past views or stood on are shown, the explored cells are cleared on reset
+    """
+    seen = Gridworld.make(
+        "hardcore-20x20-random", seed=1, minimap="ids", fog_of_war="seen"
+    )
+    visited = Gridworld.make(
+        "hardcore-20x20-random", seed=1, minimap="ids", fog_of_war="visited"
+    )
+    grid = seen.get_object_grid()
+    size = seen.observation_size
+    first = seen.reset(seed=2)["minimap"]
+    visited.reset(seed=2)
+    window = np.zeros(grid.shape, dtype=np.bool_)
+    window[
+        seen.top_left_x : seen.top_left_x + size,
+        seen.top_left_y : seen.top_left_y + size,
+    ] = True
+    assert np.array_equal(first != FOG_CODE, window)
+    assert np.array_equal(first[window], seen.get_object_grid()[window])
+
+    cells = {(visited.player_x, visited.player_y)}
+    for action in (1, 0, 0, 2, 0, 0):
+        observation = seen.step(action)[0]
+        minimap = visited.step(action)[0]["minimap"]
+        cells.add((visited.player_x, visited.player_y))
+        assert np.count_nonzero(observation["minimap"] != FOG_CODE) >= window.sum()
+        assert {
+            tuple(cell) for cell in np.argwhere(minimap != FOG_CODE).tolist()
+        } == cells
+    assert np.count_nonzero(seen.reset()["minimap"] != FOG_CODE) == size * size
+
+
+def test_minimap_options():
+    """
+    Minimaps need single eager observations, fog of war needs a minimap
+    """
+    with pytest.raises(AssertionError):
+        Gridworld.make("empty-10x10", minimap="tiles")
+    with pytest.raises(AssertionError):
+        Gridworld.make("empty-10x10", minimap="ids", lazy_observations=True)
+    with pytest.raises(AssertionError):
+        Gridworld.make("empty-10x10", minimap="ids", frame_stack=2)
+    with pytest.raises(AssertionError):
+        Gridworld.make("empty-10x10", fog_of_war="seen")
+    env = Gridworld.make("empty-10x10", minimap="pixels", fog_of_war="visited")
+    assert env.get_config()["minimap"] == "pixels"
+    assert env.reset()["minimap"].shape == (env.world_size, env.world_size, 3)
@@ -0,0 +1,80 @@
+# @title:    test_mosaic.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+from random import Random
+import numpy as np
+from src.batched import BatchedGridworld
+from src.gridworld import Gridworld
+from src.mosaic import mosaic_shape, render_mosaic
+
+# Code
+
+ENVIRONMENTS = [
+    "hardcore-10x10-random",
+    "empty-10x10",
+    "hardcore-12x12-random-obs7",
+] * 3
+
+
+def cell(mosaic, index, columns, period, size, tile_size=8):
+    """
+    Cuts the image of one environment out of a mosaic
+    """
+    row, column = divmod(index, columns)
+    x, y = row * period * tile_size, column * period * tile_size
+    return mosaic[x : x + size * tile_size, y : y + size * tile_size]
+
+
+def test_mosaic_matches_gridworld_images():
+    """
+    Every cell of a map mosaic equals Gridworld.render, every cell of a view mosaic Gridworld.get_observation
+    """
+    rng = Random(0)
+    envs = [
+        Gridworld.make(environment, seed=i)
+        for i, environment in enumerate(ENVIRONMENTS)
+    ]
+    for env in envs:
+        for _ in range(10):
+            env.step(rng.randint(0, 2))
+    maps = render_mosaic(envs, padding=2)
+    period = max(env.world_size for env in envs) + 2
+    assert maps.shape == mosaic_shape(len(envs), period - 2, padding=2)
+    views = render_mosaic(envs, view=True, columns=4, padding=0)
+    for i, env in enumerate(envs):
+        assert np.array_equal(cell(maps, i, 3, period, env.world_size), env.render())
+        observation = cell(views, i, 4, 7, env.observation_size)
+        assert np.array_equal(observation, env.get_observation())
+
+
+def test_batched_mosaic_and_downscaling():
+    """
+    A batched gridworld renders the same mosaic as its gridworlds stepped one by one,
+    downscaled mosaics average the pixels of every tile
+    """
+    batch = BatchedGridworld.make(ENVIRONMENTS, seed=5)
+    envs = [
+        Gridworld.make(environment, seed=5 + i)
+        for i, environment in enumerate(ENVIRONMENTS)
+    ]
+    rng = Random(1)
+    for _ in range(15):
+        actions = [rng.randint(0, 2) for _ in envs]
+        _, _, dones, _ = batch.step(actions)
+        for env, action in zip(envs, actions):
+            env.step(action)
+        if dones.any():
+            break
+    for view in (False, True):
+        assert np.array_equal(render_mosaic(batch, view), render_mosaic(envs, view))
+    full = render_mosaic(batch).astype(np.float64)
+    out = np.empty(
+        mosaic_shape(len(envs), envs[-1].world_size, tile_size=2), dtype=np.uint8
+    )
+    small = render_mosaic(batch, tile_size=2, out=out)
+    assert small is out
+    height, width, _ = small.shape
+    blocks = full.reshape(height, 4, width, 4, 3).mean(axis=(1, 3))
+    assert np.abs(blocks - small).max() <= 1
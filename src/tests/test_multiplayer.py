@@ -0,0 +1,64 @@
+# @title:    test_multiplayer.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import dataclasses
+from random import Random
+import numpy as np
+import pytest
+from src.gridworld import Gridworld
+from src.multiplayer import MultiGridworld
+
+# Code
+
+
+@pytest.mark.parametrize(
+    "environment_id", ["empty-10x10", "empty-10x10-random", "hardcore-10x10-random"]
+)
+def test_single_player_matches_gridworld(environment_id):
+    """
+    With one player every tick matches a Gridworld step
+    """
+    world = MultiGridworld.make(environment_id, num_players=1, seed=2)
+    reference = Gridworld.make(environment_id, seed=2)
+    rng = Random(2)
+    for _ in range(400):
+        action = rng.randint(0, 2)
+        observation, reward, done, info = reference.step(action)
+        world.step([action])
+        assert np.array_equal(world.get_rgb_observations()[0], observation)
+        for name, value in dataclasses.asdict(info).items():
+            assert world.info[name][0] == value, name
+        assert world.done == done
+        if done:
+            reference.reset()
+            world.reset()
+
+
+def test_shared_world():
+    """
+    Players share the map, never overlap and leave it when they are finished
+    """
+    world = MultiGridworld.make("hardcore-10x10-random", num_players=4, seed=0)
+    rng = Random(0)
+    episodes = 0
+    players_hit = 0
+    for _ in range(2000):
+        observations, rewards, dones, info = world.step(
+            [rng.randint(0, 2) for _ in range(4)]
+        )
+        assert observations.shape == (4, 25)
+        players = (world.grid >= 1) & (world.grid <= 4)
+        assert players.sum() == world.on_map.sum()
+        for player in np.flatnonzero(world.on_map):
+            x, y = world.player_x[player], world.player_y[player]
+            assert world.grid[x, y] == world.player_direction[player] + 1
+        assert (rewards[~dones] == 0).all()
+        assert info["teleport"].sum() <= 1 and info["helper_found"].sum() <= 1
+        if world.done:
+            episodes += 1
+            players_hit += info["players_hit"].sum()
+            world.reset()
+    assert episodes > 0
+    assert players_hit > 0
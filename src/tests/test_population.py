@@ -0,0 +1,200 @@
+# @title:    test_population.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import json
+import os
+import threading
+import time
+import numpy as np
+import src.population as population
+from src.population import PopulationWorker, SharedDirectory, run_workers
+
+# Code
+
+
+def test_leases(tmp_path):
+    """
+    A lease is exclusive until it expires or is released, expired leases are taken over
+    """
+    directory = SharedDirectory(str(tmp_path))
+    assert directory.acquire(0, "a", 30.0)
+    assert not directory.acquire(0, "b", 30.0)
+    assert directory.acquire(0, "a", 30.0)
+    directory.release(0, "b")
+    assert directory.read_lease(0)["owner"] == "a"
+    directory.release(0, "a")
+    assert directory.read_lease(0) is None
+
+    assert directory.acquire(1, "a", 0.0)
+    time.sleep(0.01)
+    assert not directory.acquire(1, "b", 30.0, steal=False)
+    assert directory.acquire(1, "b", 30.0)
+    assert not directory.renew(1, "a", 30.0)
+    assert directory.renew(1, "b", 30.0)
+    assert [name for name in os.listdir(tmp_path / "leases")] == ["1.json"]
+
+
+def test_checkpoints_and_scores(tmp_path):
+    """
+    Checkpoints keep the float16 parameters, scores are listed by member
+    """
+    directory = SharedDirectory(str(tmp_path))
+    assert directory.load_checkpoint(3) is None
+    params = np.random.default_rng(0).normal(size=(46, 3))
+    directory.save_checkpoint(3, params, {"noise": 0.5}, 7)
+    loaded, hyperparameters, step = directory.load_checkpoint(3)
+    assert np.allclose(loaded, params, atol=1e-2)
+    assert (hyperparameters, step) == ({"noise": 0.5}, 7)
+
+    directory.write_score(3, {"score": 1.0})
+    directory.write_score(5, {"score": 0.0})
+    assert directory.read_scores() == {3: {"score": 1.0}, 5: {"score": 0.0}}
+    assert not [name for name in os.listdir(tmp_path / "scores") if "tmp" in name]
+
+
+def test_exploit_and_explore(tmp_path):
+    """
+    The worst member copies the checkpoint of the best one and perturbs its hyperparameters, if it is leased
+    """
+    worker = PopulationWorker(
+        str(tmp_path), 0, 1, 4, environment_id="empty-6x6-random-obs3-s30"
+    )
+    directory = worker.directory
+    for member in range(4):
+        params = np.full((46, 3), member, dtype=np.float64)
+        directory.save_checkpoint(member, params, {"noise": 1.0}, 10 + member)
+        directory.write_score(member, {"score": float(member)})
+    rng = np.random.default_rng(0)
+    assert not worker.exploit_and_explore(0, rng)
+    assert directory.read_scores()[0]["score"] == 0.0
+    assert worker.lease_members() == [0, 1, 2, 3]
+    assert not worker.exploit_and_explore(3, rng)
+    assert worker.exploit_and_explore(0, rng)
+    params, hyperparameters, step = directory.load_checkpoint(0)
+    assert np.all(params == 3) and step == 10
+    assert hyperparameters["noise"] in (0.8, 1.25)
+    assert directory.read_scores()[0]["score"] == 3.0
+    assert worker.statistics["exploits"] == worker.statistics["explores"] == 1
+
+
+def test_worker_processes(tmp_path):
+    """
+    Local worker processes train every member of their shards and release all leases
+    """
+    totals = run_workers(
+        str(tmp_path),
+        2,
+        2,
+        num_members=5,
+        environment_id="empty-6x6-random-obs3-s30",
+        steps_per_round=1,
+        episodes=1,
+    )
+    directory = SharedDirectory(str(tmp_path))
+    scores = directory.read_scores()
+    assert sorted(scores) == list(range(5))
+    assert all(record["step"] == 2 for record in scores.values())
+    assert totals["members"] == 5 and totals["train_steps"] == 10
+    assert totals["train_steps_per_second"] > 0
+    assert not os.listdir(tmp_path / "leases")
+    for worker in range(2):
+        with open(directory.path("workers", worker)) as file:
+            assert json.load(file)["members"] in (2, 3)
+
+
+def test_orphaned_members(tmp_path):
+    """
+    Members of a worker whose leases expired are taken over by another worker
+    """
+    directory = SharedDirectory(str(tmp_path))
+    directory.acquire(1, "dead", 0.0)
+    time.sleep(0.01)
+    worker = PopulationWorker(
+        str(tmp_path),
+        0,
+        2,
+        4,
+        environment_id="empty-6x6-random-obs3-s30",
+        steps_per_round=1,
+        episodes=1,
+    )
+    assert worker.lease_members() == [0, 1, 2]
+
+
+def test_renew_keeps_foreign_leases(tmp_path):
+    """
+    Renewing a lease that was taken over neither overwrites nor removes the new lease
+    """
+    directory = SharedDirectory(str(tmp_path))
+    assert directory.acquire(0, "a", 0.0)
+    time.sleep(0.01)
+    assert directory.acquire(0, "b", 30.0)
+    assert not directory.renew(0, "a", 30.0)
+    assert directory.read_lease(0)["owner"] == "b"
+    assert directory.renew(0, "b", 60.0)
+    assert directory.read_lease(0)["expires"] > time.time() + 30.0
+    assert os.listdir(tmp_path / "leases") == ["0.json"]
+
+
+def test_lease_expires_mid_round(tmp_path, monkeypatch):
+    """
+    A worker whose lease was taken over during training writes neither checkpoint nor score
+    """
+    worker = PopulationWorker(
+        str(tmp_path),
+        0,
+        1,
+        1,
+        environment_id="empty-6x6-random-obs3-s30",
+        steps_per_round=1,
+        episodes=1,
+        lease_time=0.0,
+    )
+    directory = worker.directory
+    assert worker.lease_members() == [0]
+    evaluate = population.evaluate
+
+    def stolen(*args):
+        directory.acquire(0, "thief", 30.0)
+        return evaluate(*args)
+
+    monkeypatch.setattr(population, "evaluate", stolen)
+    assert worker.train(0) is None
+    assert directory.load_checkpoint(0) is None
+    assert directory.read_scores() == {}
+    assert directory.read_lease(0)["owner"] == "thief"
+
+    monkeypatch.setattr(population, "evaluate", evaluate)
+    worker.lease_time = 30.0
+    statistics = worker.run(1)
+    assert statistics["members"] == 0 and statistics["train_steps"] == 1
+    assert directory.read_lease(0)["owner"] == "thief"
+
+
+def test_acquire_during_renew(tmp_path, monkeypatch):
+    """
+    The lease file exists while it is renewed, other workers neither take it nor steal it once expired
+    """
+    directory = SharedDirectory(str(tmp_path))
+    atomic_write = population.atomic_write
+    results = {}
+
+    def in_flight(path, data):
+        results["b"] = directory.acquire(0, "b", 30.0, steal=False)
+        results["thief"] = threading.Thread(
+            target=lambda: results.update(c=directory.acquire(0, "c", 30.0))
+        )
+        results["thief"].start()
+        time.sleep(0.05)
+        atomic_write(path, data)
+
+    assert directory.acquire(0, "a", 0.0)
+    time.sleep(0.01)
+    monkeypatch.setattr(population, "atomic_write", in_flight)
+    assert directory.renew(0, "a", 30.0)
+    results["thief"].join()
+    assert results["b"] is False and results["c"] is False
+    assert directory.read_lease(0)["owner"] == "a"
+    assert os.listdir(tmp_path / "leases") == ["0.json"]
@@ -0,0 +1,89 @@
+# @title:    test_registry.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import numpy as np
+import pytest
+from src.codec import ATLAS, decode_observations, encode_observation, get_atlas
+from src.gridworld import Gridworld
+from src.registry import (
+    REGISTRY,
+    EnvConfig,
+    get_config,
+    get_tables,
+    parse_id,
+    register,
+)
+
+# Code
+
+
+def test_parametric_ids():
+    """
+    Parametric ids are parsed into configs, the registered ids keep their configs
+    """
+    assert parse_id("hardcore-10x10-random") == REGISTRY["hardcore-10x10-random"]
+    assert parse_id("empty-10x10") == REGISTRY["empty-10x10"]
+    assert parse_id("hardcore-20x20-random-obs7-o8-s400") == EnvConfig(
+        grid_size=20,
+        observation_size=7,
+        random=True,
+        obstacles=True,
+        max_steps=400,
+        num_obstacles=8,
+    )
+    for environment_id in [
+        "maze-10x10",
+        "empty-10x12",
+        "empty-10x10-o3",
+        "empty-8x8-obs4",
+    ]:
+        with pytest.raises(ValueError):
+            Gridworld.make(environment_id)
+
+
+def test_registered_config():
+    """
+    Registered configs and config objects create the same gridworlds as the constructor
+    """
+    config = EnvConfig(grid_size=6, observation_size=3, random=True, obstacles=True)
+    register("test-small", config)
+    assert get_config("test-small") is config
+    env = Gridworld.make("test-small", seed=3)
+    reference = Gridworld(**config.as_dict(), seed=3)
+    assert np.array_equal(env.get_object_grid(), reference.get_object_grid())
+    assert Gridworld.make(config, seed=3).get_config() == reference.get_config()
+
+
+def test_shared_tables():
+    """
+    Gridworlds of one geometry share their tables, the tables describe their maps and observations
+    """
+    envs = [
+        Gridworld.make("hardcore-12x12-random-obs7", seed=seed) for seed in range(4)
+    ]
+    tables = get_tables(12, 7)
+    assert all(env.tables is tables for env in envs)
+    assert not tables.walls.flags.writeable
+    for env in envs:
+        grid = env.get_object_grid()
+        assert ((grid == 5) == (tables.walls == 5)).all()
+        assert len(tables.interior) == 12 * 12
+        direction = env.player_direction
+        x = env.player_x + tables.offset_x[direction]
+        y = env.player_y + tables.offset_y[direction]
+        codes = encode_observation(env)
+        assert np.array_equal(codes & 15, grid[x, y])
+
+
+def test_scaled_atlas():
+    """
+    Atlases are created once per tile size, scaled observations repeat the pixels of the default size
+    """
+    assert get_atlas() is ATLAS
+    assert get_atlas(16) is get_atlas(16)
+    codes = encode_observation(Gridworld.make("hardcore-10x10-random", seed=0))
+    image = decode_observations(codes)
+    scaled = decode_observations(codes, tile_size=16)
+    assert np.array_equal(scaled, image.repeat(2, axis=0).repeat(2, axis=1))
@@ -0,0 +1,200 @@
+# @title:    test_replay.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import copy
+import os
+import random
+import numpy as np
+import pytest
+from src.gridworld import Gridworld
+from src.replay import (
+    EpisodeLog,
+    EpisodeRecorder,
+    ReplayEngine,
+    load_episodes,
+    save_episodes,
+)
+from src.codec import encode_observation, decode_observations
+from src.trajectory import TrajectoryWriter, TrajectoryReader
+
+# Code
+
+
+def test_replay_matches_recording():
+    """
+    Replays recorded episodes in random step order and compares them with the recorded steps
+    """
+    rng = random.Random(0)
+    env = Gridworld.make("hardcore-10x10-random", seed=0)
+    recorder = EpisodeRecorder(env)
+    for _ in range(5):
+        steps = [(recorder.reset().copy(), 0, False, copy.copy(env.info))]
+        done = False
+        while not done:
+            observation, reward, done, info = recorder.step(rng.randint(0, 2))
+            steps.append((observation.copy(), reward, done, copy.copy(info)))
+
+        engine = ReplayEngine(recorder.current, snapshot_interval=8)
+        for t in rng.sample(range(len(steps)), len(steps)):
+            observation, reward, done, info = engine.get(t)
+            assert np.array_equal(observation, steps[t][0])
+            assert (reward, done, info) == steps[t][1:]
+
+
+def test_reset_seed_is_deterministic():
+    """
+    Two gridworlds reset with the same seed generate the same level
+    """
+    first = Gridworld.make("hardcore-10x10-random")
+    second = Gridworld.make("hardcore-10x10-random")
+    assert np.array_equal(first.reset(seed=7), second.reset(seed=7))
+    assert np.array_equal(first.get_object_grid(), second.get_object_grid())
+
+
+def test_codec_is_bit_identical():
+    """
+    Decoded tile codes reproduce the rendered observations for all directions
+    """
+    rng = random.Random(1)
+    env = Gridworld.make("hardcore-10x10-random", seed=1)
+    codes, observations = [], []
+    for _ in range(200):
+        observation, _, done, _ = env.step(rng.randint(0, 2))
+        codes.append(encode_observation(env))
+        observations.append(observation)
+        if done:
+            env.reset()
+    assert np.array_equal(decode_observations(np.stack(codes)), np.stack(observations))
+
+
+def test_trajectory_round_trip(tmp_path):
+    """
+    Steps written in chunks are streamed back in the same order
+    """
+    rng = random.Random(2)
+    env = Gridworld.make("hardcore-10x10-random", seed=2)
+    actions, rewards = [], []
+    with TrajectoryWriter(str(tmp_path), chunk_size=64, max_pending=1) as writer:
+        for _ in range(300):
+            action = rng.randint(0, 2)
+            _, reward, done, info = env.step(action)
+            writer.add(encode_observation(env), action, reward, done, info)
+            actions.append(action)
+            rewards.append(reward)
+            if done:
+                env.reset()
+    assert writer.get_statistics()["rows_written"] == 300
+    batches = list(TrajectoryReader(str(tmp_path)).iter_batches(100))
+    assert [len(batch["action"]) for batch in batches] == [100, 100, 100]
+    assert np.array_equal(
+        np.concatenate([batch["action"] for batch in batches]), actions
+    )
+    assert np.array_equal(
+        np.concatenate([batch["reward"] for batch in batches]), rewards
+    )
+
+
+@pytest.mark.parametrize("batch_size", [1, 10, 64, 100, 1000])
+def test_trajectory_batches(tmp_path, batch_size):
+    """
+    Batches cover all rows in order, batches inside one chunk are views of its columns
+    """
+    env = Gridworld.make("empty-10x10", seed=0)
+    with TrajectoryWriter(str(tmp_path), chunk_size=64) as writer:
+        for step in range(300):
+            writer.add(encode_observation(env), step % 3, step, False, env.info)
+    batches = list(TrajectoryReader(str(tmp_path)).iter_batches(batch_size))
+    sizes = [len(batch["reward"]) for batch in batches]
+    assert sizes[:-1] == [batch_size] * (len(batches) - 1) and sum(sizes) == 300
+    assert np.array_equal(
+        np.concatenate([batch["reward"] for batch in batches]), np.arange(300)
+    )
+    if batch_size <= 64:
+        assert batches[0]["reward"].base is not None
+
+
+def test_trajectory_writer_appends(tmp_path):
+    """
+    A second writer on the same directory continues the chunk numbering instead of overwriting
+    """
+    env = Gridworld.make("empty-10x10", seed=0)
+    info = env.info
+    for first in (0, 100):
+        with TrajectoryWriter(str(tmp_path), chunk_size=64) as writer:
+            for action in range(first, first + 100):
+                writer.add(encode_observation(env), action % 3, action, False, info)
+    assert sorted(os.listdir(tmp_path)) == [f"chunk_{i:06d}.npz" for i in range(4)]
+    rewards = np.concatenate(
+        [chunk["reward"] for chunk in TrajectoryReader(str(tmp_path))]
+    )
+    assert np.array_equal(rewards, np.arange(200))
+
+
+def test_save_and_load_episodes(tmp_path):
+    """
+    Saved episode logs load back unchanged, also with action ids of more than one digit
+    """
+    path = str(tmp_path / "episodes.jsonl")
+    env = Gridworld.make("hardcore-10x10-random", seed=4)
+    recorder = EpisodeRecorder(env)
+    recorder.reset()
+    for action in (0, 1, 2, 0):
+        recorder.step(action)
+    wide = EpisodeLog(seed=1, config={}, actions=bytearray([10, 0, 255, 12, 3]))
+    save_episodes(path, [recorder.current])
+    save_episodes(path, [wide])
+    assert load_episodes(path) == [recorder.current, wide]
+
+
+def test_recorder_step_before_reset():
+    """
+    Stepping a recorder before its first reset raises instead of recording into no episode
+    """
+    recorder = EpisodeRecorder(Gridworld.make("empty-10x10", seed=0))
+    with pytest.raises(RuntimeError):
+        recorder.step(0)
+    recorder.reset()
+    recorder.step(0)
+    assert list(recorder.current.actions) == [0]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"frame_stack": 4},
+        {"lazy_observations": True},
+        {"minimap": "ids", "fog_of_war": "seen"},
+        {"minimap": "pixels", "fog_of_war": "visited"},
+    ],
+)
+def test_replay_observation_modes(options):
+    """
+    Random access returns the observations of step in every observation mode of the recorded config
+    """
+
+    def materialize(observation):
+        if isinstance(observation, dict):
+            return {name: value.copy() for name, value in observation.items()}
+        return np.array(observation)
+
+    rng = random.Random(1)
+    env = Gridworld.make("hardcore-10x10-random", seed=1, **options)
+    recorder = EpisodeRecorder(env)
+    first = recorder.reset()
+    steps = [(type(first), materialize(first))]
+    done = False
+    while not done:
+        observation, _, done, _ = recorder.step(rng.randint(0, 2))
+        steps.append((type(observation), materialize(observation)))
+
+    engine = ReplayEngine(recorder.current, snapshot_interval=4)
+    for t in rng.sample(range(len(steps)), len(steps)):
+        observation = engine.get(t)[0]
+        assert type(observation) is steps[t][0]
+        if isinstance(observation, dict):
+            for name, value in observation.items():
+                assert np.array_equal(value, steps[t][1][name])
+        else:
+            assert np.array_equal(np.asarray(observation), steps[t][1])
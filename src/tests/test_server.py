@@ -0,0 +1,83 @@
+# @title:    test_server.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import os
+import tempfile
+import threading
+from random import Random
+import numpy as np
+import pytest
+from src.batched import BatchedGridworld
+from src.server import EnvClient, EnvServer
+
+# Code
+
+ENVIRONMENTS = ["empty-10x10", "empty-10x10-random", "hardcore-10x10-random"] * 4
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def server(request):
+    """
+    Runs a server on localhost in a background thread
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        if request.param == "tcp":
+            address = ("127.0.0.1", 0)
+        else:
+            address = os.path.join(directory, "gridworld.sock")
+        server = EnvServer(BatchedGridworld.make(ENVIRONMENTS, seed=0), address)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.stop()
+        thread.join()
+
+
+def test_remote_matches_local(server):
+    """
+    Pipelined remote steps return the same arrays as a local batch
+    """
+    local = BatchedGridworld.make(ENVIRONMENTS, seed=0)
+    rng = Random(0)
+    with EnvClient(server.address) as client:
+        assert client.num_envs == len(ENVIRONMENTS)
+        assert client.config_ids.tolist() == local.config_ids.tolist()
+        assert np.array_equal(client.reset(), local.reset())
+        for _ in range(50):
+            actions = [[rng.randint(0, 2) for _ in ENVIRONMENTS] for _ in range(4)]
+            for step_actions in actions:
+                client.send_step(step_actions)
+            for step_actions in actions:
+                remote = client.receive_step()
+                expected = local.step(step_actions)
+                for a, b in zip(remote[:3], expected[:3]):
+                    assert np.array_equal(a, b)
+                for name, column in expected[3].items():
+                    assert np.array_equal(remote[3][name], column)
+            dones = np.flatnonzero(expected[2])
+            assert np.array_equal(client.reset(dones), local.reset(dones))
+
+
+def test_auto_reset_and_errors(server):
+    """
+    Finished environments are reset in the step request, invalid requests raise without closing the connection
+    """
+    with EnvClient(server.address) as client:
+        client.reset()
+        for _ in range(300):
+            observations, _, dones, info = client.step(
+                np.zeros(client.num_envs), auto_reset=True
+            )
+            if dones.any():
+                break
+        assert dones.any()
+        assert (info["num_steps"][dones] > 0).all()
+        with pytest.raises(RuntimeError):
+            client.step([0, 1])
+        with pytest.raises(RuntimeError):
+            client.reset([client.num_envs])
+        assert client.reset().shape == observations.shape
+    with EnvClient(server.address) as client:
+        assert client.step(np.ones(client.num_envs))[0].shape == observations.shape
@@ -0,0 +1,102 @@
+# @title:    test_solver.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import random
+from src.gridworld import Gridworld
+from src.solver import solve_batch, LevelFilter, UNREACHABLE
+
+# Code
+
+
+def test_solver_reaches_goal():
+    """
+    Plays the solved action sequences and checks that every level ends on the goal without penalties
+    """
+    random.seed(0)
+    envs = [Gridworld.make("hardcore-10x10-random") for _ in range(200)]
+    actions, lengths = solve_batch(envs, avoid_obstacles=True)
+    for env, sequence, length in zip(envs, actions, lengths):
+        if length == UNREACHABLE:
+            continue
+        assert len(sequence) == length
+        for action in sequence:
+            _, _, done, info = env.step(int(action))
+        assert done and info.success
+        assert info.num_steps == length
+        assert info.wall_hit == 0 and info.obstacles_hit == 0
+
+
+def test_solver_walks_over_obstacles():
+    """
+    Obstacles are passable by default, every solved level ends on the goal with at most the solved number
+    of steps and levels are only unsolvable behind walls and lava
+    """
+    random.seed(1)
+    envs = [Gridworld.make("hardcore-20x20-random-maze-o8") for _ in range(100)]
+    actions, lengths = solve_batch(envs)
+    _, avoiding = solve_batch(envs, avoid_obstacles=True)
+    assert (lengths != UNREACHABLE).sum() > (avoiding != UNREACHABLE).sum()
+    assert ((lengths <= avoiding) | (avoiding == UNREACHABLE)).all()
+    for env, sequence, length in zip(envs, actions, lengths):
+        assert length != UNREACHABLE
+        for action in sequence:
+            _, _, done, info = env.step(int(action))
+        assert done and info.success
+        assert info.num_steps == length
+
+
+def test_distance_fields_of_the_initial_level():
+    """
+    Distance fields requested during an episode describe the level as it was generated
+    """
+    random.seed(2)
+    for _ in range(20):
+        env = Gridworld.make("hardcore-10x10-random")
+        reference = Gridworld(**env.get_config(), seed=env.seed)
+        actions, _ = solve_batch([env])
+        for action in actions[0][:-1]:
+            env.step(int(action))
+        fields = env.get_distance_fields()
+        expected = reference.get_distance_fields()
+        assert (fields.goal == expected.goal).all()
+        assert (fields.helper == expected.helper).all()
+
+
+def test_solver_empty_world():
+    """
+    The empty test world is solved by walking over the helper into the teleporter and onto the goal
+    """
+    env = Gridworld.make("empty-10x10")
+    actions, lengths = solve_batch([env])
+    assert lengths[0] == 3
+    assert list(actions[0]) == [0, 0, 0]
+    assert env.get_goal_distance() == 3
+    assert env.get_helper_distance() == 1
+
+
+def test_distance_fields_cached_until_reset():
+    """
+    The distance fields are computed once per level
+    """
+    env = Gridworld.make("hardcore-10x10-random")
+    fields = env.get_distance_fields()
+    assert env.get_distance_fields() is fields
+    env.reset()
+    assert env.get_distance_fields() is not fields
+
+
+def test_level_filter():
+    """
+    Every level generated with a level filter satisfies its distance bounds
+    """
+    level_filter = LevelFilter(min_distance=4, max_distance=12)
+    env = Gridworld.make("hardcore-10x10-random", level_filter=level_filter)
+    for _ in range(50):
+        env.reset()
+        assert 4 <= env.get_goal_distance() <= 12
+    statistics = level_filter.get_statistics()
+    assert statistics["levels"] == 51
+    assert statistics["checked"] == statistics["levels"] + statistics["rejected"]
+    assert 0 <= statistics["rejection_rate"] < 1
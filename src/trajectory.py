@@ -0,0 +1,276 @@
+# @title:    trajectory.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+import os
+import queue
+import threading
+import time
+import numpy as np
+from numpy import uint8
+
+# Code
+
+#   columns of the Info object stored with every step
+INFO_COLUMNS = {
+    "num_steps": np.int32,
+    "reward_penalty": np.float64,
+    "info_reward": np.float64,
+    "success": np.bool_,
+    "helper_found": np.bool_,
+    "obstacles_hit": np.int32,
+    "lava_hit": np.bool_,
+    "wall_hit": np.int32,
+    "teleport": np.bool_,
+}
+
+
+class _Chunk:
+    """
+    Preallocated column buffers of one trajectory chunk
+    """
+
+    def __init__(self, chunk_size: int, observation_shape: tuple):
+        self.size = 0
+        self.columns = {
+            "env_id": np.zeros(chunk_size, dtype=np.int32),
+            "observation": np.zeros((chunk_size,) + observation_shape, dtype=uint8),
+            "action": np.zeros(chunk_size, dtype=np.int8),
+            "reward": np.zeros(chunk_size, dtype=np.float64),
+            "done": np.zeros(chunk_size, dtype=np.bool_),
+        }
+        for name, dtype in INFO_COLUMNS.items():
+            self.columns[name] = np.zeros(chunk_size, dtype=dtype)
+
+
+def next_chunk_index(directory: str):
+    """
+    Returns the index following the highest chunk file in a directory, 0 for a directory without chunks
+    """
+    indices = [
+        int(name[len("chunk_") : -len(".npz")])
+        for name in os.listdir(directory)
+        if name.startswith("chunk_")
+        and name.endswith(".npz")
+        and name[len("chunk_") : -len(".npz")].isdigit()
+    ]
+    return max(indices, default=-1) + 1
+
+
+class TrajectoryWriter:
+    """
+    Buffers gridworld steps in fixed size chunks and writes them as compressed columnar npz files
+    Full chunks are written by a background thread. The writer owns max_pending + 1 chunk buffers,
+    if all of them wait for the disk, add blocks until one is written. A writer on a directory with chunks
+    continues after the highest chunk index, so earlier trajectories are appended to, never overwritten.
+    Only one writer may use a directory at a time.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        observation_shape: tuple = (25,),
+        chunk_size: int = 4096,
+        max_pending: int = 2,
+    ):
+        """
+        Initializes a trajectory writer
+        @params:
+            directory => directory of the chunk files, created if needed, existing chunks are kept
+            observation_shape => shape of a stored observation, (25,) for encoded 5x5 observations
+            chunk_size => number of steps per chunk
+            max_pending => number of full chunks waiting to be written
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.free = queue.Queue()
+        for _ in range(max_pending + 1):
+            self.free.put(_Chunk(chunk_size, tuple(observation_shape)))
+        self.pending = queue.Queue()
+        self.chunk = self.free.get()
+        self.num_chunks = 0
+        self.first_index = next_chunk_index(directory)
+        self.rows = 0
+        self.bytes = 0
+        self.write_time = 0.0
+        self.blocked_time = 0.0
+        self.error = None
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+
+    def add(self, observation, action, reward, done, info, env_id: int = 0):
+        """
+        Appends one step to the current chunk
+        @params:
+            observation => observation or observation codes of the step
+            action => the performed action
+            reward => reward of the step
+            done => True if the state is terminal
+            info => Info object of the step
+            env_id => id of the environment that performed the step
+        """
+        chunk = self.chunk
+        row = chunk.size
+        columns = chunk.columns
+        columns["env_id"][row] = env_id
+        columns["observation"][row] = observation
+        columns["action"][row] = action
+        columns["reward"][row] = reward
+        columns["done"][row] = done
+        columns["num_steps"][row] = info.num_steps
+        columns["reward_penalty"][row] = info.reward_penalty
+        columns["info_reward"][row] = info.reward
+        columns["success"][row] = info.success
+        columns["helper_found"][row] = info.helper_found
+        columns["obstacles_hit"][row] = info.obstacles_hit
+        columns["lava_hit"][row] = info.lava_hit
+        columns["wall_hit"][row] = info.wall_hit
+        columns["teleport"][row] = info.teleport
+        chunk.size = row + 1
+        if chunk.size == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Hands the current chunk to the background thread and continues with a free buffer
+        """
+        if self.error is not None:
+            raise self.error
+        if self.chunk.size == 0:
+            return
+        self.pending.put((self.first_index + self.num_chunks, self.chunk))
+        self.num_chunks += 1
+        start = time.perf_counter()
+        self.chunk = self.free.get()
+        self.blocked_time += time.perf_counter() - start
+
+    def close(self):
+        """
+        Writes all buffered steps and stops the background thread
+        """
+        self.flush()
+        self.pending.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _write_loop(self):
+        """
+        Writes pending chunks until close is called
+        """
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            index, chunk = item
+            try:
+                start = time.perf_counter()
+                path = os.path.join(self.directory, f"chunk_{index:06d}.npz")
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as file:
+                    np.savez_compressed(
+                        file,
+                        **{
+                            name: column[: chunk.size]
+                            for name, column in chunk.columns.items()
+                        },
+                    )
+                os.replace(tmp_path, path)
+                self.bytes += os.path.getsize(path)
+                self.rows += chunk.size
+                self.write_time += time.perf_counter() - start
+            except Exception as error:
+                self.error = error
+            chunk.size = 0
+            self.free.put(chunk)
+
+    def get_statistics(self):
+        """
+        Returns a dict with the write throughput of the background thread
+        """
+        return {
+            "chunks": self.num_chunks,
+            "rows_written": self.rows,
+            "bytes_written": self.bytes,
+            "write_time": self.write_time,
+            "blocked_time": self.blocked_time,
+            "rows_per_second": self.rows / self.write_time if self.write_time else 0.0,
+            "bytes_per_second": (
+                self.bytes / self.write_time if self.write_time else 0.0
+            ),
+        }
+
+
+class TrajectoryReader:
+    """
+    Streams the chunks written by a TrajectoryWriter as dicts of NumPy arrays
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initializes a trajectory reader
+        @params:
+            directory => directory of the chunk files
+        """
+        self.directory = directory
+        self.paths = sorted(
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.startswith("chunk_") and name.endswith(".npz")
+        )
+
+    def __iter__(self):
+        """
+        Yields one dict of column arrays per chunk
+        """
+        for path in self.paths:
+            with np.load(path) as chunk:
+                yield {name: chunk[name] for name in chunk.files}
+
+    def iter_batches(self, batch_size: int):
+        """
+        Yields dicts of column arrays with batch_size rows, the last batch may be smaller
+        Batches inside a chunk are slices of its columns, only the rows of a batch spanning several chunks
+        are copied.
+        @params:
+            batch_size => number of rows per batch
+        """
+        #   rows of past chunks that did not fill a batch, fewer than batch_size in total
+        tail = []
+        tail_size = 0
+        for chunk in self:
+            rows = len(chunk["action"])
+            offset = 0
+            if tail:
+                offset = min(batch_size - tail_size, rows)
+                tail.append({name: column[:offset] for name, column in chunk.items()})
+                tail_size += offset
+                if tail_size < batch_size:
+                    continue
+                yield {
+                    name: np.concatenate([part[name] for part in tail])
+                    for name in chunk
+                }
+                tail = []
+                tail_size = 0
+            while rows - offset >= batch_size:
+                yield {
+                    name: column[offset : offset + batch_size]
+                    for name, column in chunk.items()
+                }
+                offset += batch_size
+            if offset < rows:
+                tail = [{name: column[offset:] for name, column in chunk.items()}]
+                tail_size = rows - offset
+        if tail:
+            yield {
+                name: np.concatenate([part[name] for part in tail]) for name in tail[0]
+            }
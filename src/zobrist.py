@@ -0,0 +1,43 @@
+# @title:    zobrist.py
+# @author:   Jan Frederik Liebig
+# @date:     19.10.2026
+
+# Imports
+from dataclasses import dataclass
+from functools import lru_cache
+from random import Random
+
+# Code
+
+#   fixed seed of the key tables, hashes are comparable across processes and runs
+ZOBRIST_SEED = 0x5EED2021
+
+
+@dataclass(frozen=True)
+class ZobristKeys:
+    """
+    Dataclass of the random 64 bit keys of one map size
+    player and obstacle keys are indexed by (direction * world_size + x) * world_size + y
+    """
+
+    player: tuple
+    obstacle: tuple
+    teleport: int
+    helper: int
+
+
+@lru_cache(maxsize=None)
+def get_keys(world_size: int):
+    """
+    Returns the ZobristKeys of a map size, created once per size
+    @params:
+        world_size => side length of the map including the walls
+    """
+    rng = Random(ZOBRIST_SEED + world_size)
+    size = 4 * world_size * world_size
+    return ZobristKeys(
+        player=tuple(rng.getrandbits(64) for _ in range(size)),
+        obstacle=tuple(rng.getrandbits(64) for _ in range(size)),
+        teleport=rng.getrandbits(64),
+        helper=rng.getrandbits(64),
+    )